@@ -0,0 +1,15 @@
+from GloveProtocol import CSV_HEADER
+from RecordingSink import CsvRecordingSink
+from BinaryRecording import BinaryRecordingSink, isBinaryRecording
+
+# Recorder selection shared by every acquisition front end (SensorRead3.0.py, GloveControlPanel.py,
+# ReplaySource.py, AsyncAcquisition.py). The gloves themselves are read by AsyncAcquisition.runAcquisition
+
+
+# openRecorder(outputFileName)
+# Rows are batched and written by the recorder's own thread, header row included.
+# An output file ending in .glove records to the columnar binary format instead of CSV
+def openRecorder(outputFileName, header=CSV_HEADER):
+    if isBinaryRecording(outputFileName):
+        return BinaryRecordingSink(outputFileName, header)
+    return CsvRecordingSink(outputFileName, header)
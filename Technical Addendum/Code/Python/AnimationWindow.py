@@ -2,17 +2,52 @@ from PySide6.Qt3DCore import Qt3DCore
 from PySide6.Qt3DExtras import Qt3DExtras
 from PySide6.Qt3DRender import Qt3DRender
 from PySide6.QtGui import QColor, QVector3D, QQuaternion
+import math
+from RightHand import RIGHT_HAND_SEGMENTS
+from ForwardKinematics import RIGHT_HAND_BASES
+
+# Joints posed by setPose, in its order: the thumb's J1, then J1 and J2 of the pointer, middle, ring and pinky
+THUMB_J1, POINTER_J1, POINTER_J2, MIDDLE_J1, MIDDLE_J2, RING_J1, RING_J2, PINKY_J1, PINKY_J2 = range(9)
+
+# Joints bend about the window's -X axis (fingers curl down)
+BEND_AXIS = QVector3D(-1, 0, 0)
+
+# Scene units per inch of the hand model's segment lengths and finger bases
+SCENE_SCALE = 4.0
+
+# Palm disc and finger segment radii (scene units), thumb to pinky, base to tip
+PALM_RADIUS = 8.0
+PALM_THICKNESS = 4.0
+SEGMENT_RADII = ((1.5, 1.6, 0.0),
+                 (1.3, 1.1, 0.9),
+                 (1.3, 1.1, 0.9),
+                 (1.3, 1.1, 0.9),
+                 (1.3, 1.1, 0.9))
+
 
 class AnimationWindow(Qt3DExtras.Qt3DWindow):
-    def __init__(self):
+    def __init__(self, mirrored=False, segmentLengths=RIGHT_HAND_SEGMENTS, angleDeadband=0.1, orientationDeadband=0.1):
         super().__init__()
-        self.setTitle("Pointer Finger Display")
+        # mirrored: draw a left hand, the right-hand scene reflected across the window's YZ plane
+        # segmentLengths: (5, 3) finger segment lengths in inches, the hand model's segment table
+        self.mirrored = mirrored
+        # setPose leaves a joint alone until it moves more than angleDeadband degrees, and the palm until
+        # the wrist turns more than orientationDeadband degrees
+        self.angleDeadband = angleDeadband
+        self.orientationDeadband = orientationDeadband
+        self.setTitle("Left Hand Display" if mirrored else "Pointer Finger Display")
 
         # set window size
         self.resize(900, 700)
 
         # Root entity
         self.rootEntity = Qt3DCore.QEntity()
+        if mirrored:
+            mirrorTransform = Qt3DCore.QTransform(self.rootEntity)
+            mirrorTransform.setScale3D(QVector3D(-1, 1, 1))
+            self.rootEntity.addComponent(mirrorTransform)
+        # X of the scene's center, which the mirror moves to the other side
+        center_X = -5 if mirrored else 5
 
         # Camera setup
         camera = self.camera()
@@ -20,9 +55,9 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
         # Field-of-view angle, Aspect ratio, nearest-view (nearplane), furthest view (farplane)
         camera.lens().setPerspectiveProjection(45.0, 16.0 / 9.0, 0.1, 1000.0)
         # sets Camera's position as X, Y, Z
-        camera.setPosition(QVector3D(5, -30, 50))
+        camera.setPosition(QVector3D(center_X, -30, 50))
         # sets position the camera looks towards
-        camera.setViewCenter(QVector3D(5, 0, 0))
+        camera.setViewCenter(QVector3D(center_X, 0, 0))
         # determines Cameras 'up' direction (0, 1, 0) means Y is up
         camera.setUpVector(QVector3D(0, 0, 1))
 
@@ -50,9 +85,16 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
         self.add_light(QVector3D(10, 10, 10), 1.0)
         self.add_light(QVector3D(-10, 10, 10), 0.5)
 
-        # Create finger segments
+        # Create palm and finger segments, collecting every joint's transform in setPose order
         # see related method
-        self.create_finger_segments()
+        self.create_hand(segmentLengths)
+
+        # Dirty tracking for setPose: the angle last applied to each joint (NaN until first set),
+        # and the palm's last quaternion
+        self.joint_angles = [math.nan] * len(self.joint_transforms)
+        self.palm_quaternion = None
+        self.transformsUpdated = 0
+        self.transformsSkipped = 0
 
         # IMPORTANT: Set root entity
         self.setRootEntity(self.rootEntity)
@@ -73,448 +115,141 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
 
         return lightEntity
 
-    def create_finger_segments(self):
-
-        # -------------------------------------------- PALM INITIALIZATION ---------------------------
-
-        self.entity_Palm = Qt3DCore.QEntity(self.rootEntity)
+    def create_hand(self, segmentLengths):
+        """
+        Build the palm and fingers from the hand model's segment table.
 
-        mesh_Palm = Qt3DExtras.QCylinderMesh(self.entity_Palm)
-        palm_radius = 8
+        Every part of the hand is the same unit cylinder mesh, sized by its own transform's
+        scale, with the one shared material. Each finger is a chain of joint entities under
+        the palm: a joint sits at the end of the previous segment and its transform holds
+        only that joint's bend, so posing the hand writes local rotations and everything
+        further along the finger follows.
 
-        # sets radius of cylinder mesh
-        mesh_Palm.setRadius(palm_radius)
-        # sets length of cylinder mesh
-        mesh_Palm.setLength(4)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        mesh_Palm.setRings(10)
+        Args:
+            segmentLengths: (5, 3) segment lengths in inches, thumb to pinky, base to tip (0 = no segment)
+        """
+        # One unit cylinder (radius 1, length 1, along its Y axis) shared by the palm and every segment
+        self.cylinderMesh = Qt3DExtras.QCylinderMesh(self.rootEntity)
+        self.cylinderMesh.setRadius(1.0)
+        self.cylinderMesh.setLength(1.0)
+        # rings subdivide along the length, where the side is straight, so two are enough
+        self.cylinderMesh.setRings(2)
         # sets number of subdivisions around the circumference to make shape more cylindrical
-        mesh_Palm.setSlices(64)
+        self.cylinderMesh.setSlices(48)
 
-        # Transform for proximal - rotation happens here
+        # Python references to every entity and transform created here: PySide does not hand ownership of
+        # Qt3D nodes to their parent, so they would otherwise be deleted with their wrappers
+        self.scene_nodes = []
+
+        # -------------------------------------------- PALM ---------------------------------------------------------
+        # The palm's transform is the wrist orientation; its disc is a child so its scale stays off the fingers
+        self.entity_Palm = Qt3DCore.QEntity(self.rootEntity)
         self.transform_Palm = Qt3DCore.QTransform(self.entity_Palm)
-        # Cylinder is created along Z-axis, positioned so base is at Center of Fingers/thumb
         self.transform_Palm.setTranslation(QVector3D(5, -10, 0))
 
-        # rotate around X-axis to face upward
-        rotation_Palm = QQuaternion.fromAxisAndAngle(QVector3D(1, 0, 0), 90)
-        self.transform_Palm.setRotation(rotation_Palm)
-
-        self.entity_Palm.addComponent(mesh_Palm)
+        # rotate around X-axis to face upward: palm -Z points along the fingers, palm X across them
+        self.rotation_Palm_base = QQuaternion.fromAxisAndAngle(QVector3D(1, 0, 0), 90)
+        self.transform_Palm.setRotation(self.rotation_Palm_base)
         self.entity_Palm.addComponent(self.transform_Palm)
-        self.entity_Palm.addComponent(self.material)
-
-        # -------------------------------------------- END PALM INITIALIZATION ---------------------------
-
-        # -------------------------------------------- POINTER FINGER INITIALIZATION ----------------------------------
-        """Create the three finger segments"""
-        # Segment lengths (pointer Finger)
-        proximal_len_Pointer = 8.0
-        middle_len_Pointer = 5.0
-        distal_len_Pointer = 4.0
-
-        # === PROXIMAL SEGMENT (base segment) For Pointer Finger ===
-        self.proximal_entity_Pointer = Qt3DCore.QEntity(self.entity_Palm)
-
-        proximal_mesh_Pointer = Qt3DExtras.QCylinderMesh(self.proximal_entity_Pointer)
-        # sets radius of cylinder mesh
-        proximal_mesh_Pointer.setRadius(1.3)
-        # sets length of cylinder mesh
-        proximal_mesh_Pointer.setLength(proximal_len_Pointer)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        proximal_mesh_Pointer.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        proximal_mesh_Pointer.setSlices(32)
-
-        # Transform for proximal - rotation happens here
-        self.proximal_transform_Pointer = Qt3DCore.QTransform(self.proximal_entity_Pointer)
-
-        # Cylinder is created along Y-axis, positioned so base is at origin
-        self.proximal_transform_Pointer.setTranslation(QVector3D(-4, 0, -(palm_radius + proximal_len_Pointer / 2)))
-
-        # rotate around X-axis to face forward
-        rotation_Pointer = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), 90)
-        self.proximal_transform_Pointer.setRotation(rotation_Pointer)
-
-        self.proximal_entity_Pointer.addComponent(proximal_mesh_Pointer)
-        self.proximal_entity_Pointer.addComponent(self.proximal_transform_Pointer)
-        self.proximal_entity_Pointer.addComponent(self.material)
-
-        # === MIDDLE SEGMENT For Pointer Finger ===
-        # Parent to proximal entity
-        self.middle_entity_Pointer = Qt3DCore.QEntity(self.proximal_entity_Pointer)
-
-        middle_mesh_Pointer = Qt3DExtras.QCylinderMesh(self.middle_entity_Pointer)
-        # sets radius of cylinder mesh
-        middle_mesh_Pointer.setRadius(1.1)
-        # sets length of cylinder mesh
-        middle_mesh_Pointer.setLength(middle_len_Pointer)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        middle_mesh_Pointer.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        middle_mesh_Pointer.setSlices(32)
-
-        # Transform for middle - this is where rotation happens
-        self.middle_transform_Pointer = Qt3DCore.QTransform(self.middle_entity_Pointer)
-        # Position at the top of proximal segment (in proximal's local space)
-        # The pivot point is at the base of this cylinder (joint between middle and bast segments)
-        self.middle_transform_Pointer.setTranslation(QVector3D(0, proximal_len_Pointer / 2 + middle_len_Pointer / 2, 0))
-
-        self.middle_entity_Pointer.addComponent(middle_mesh_Pointer)
-        self.middle_entity_Pointer.addComponent(self.middle_transform_Pointer)
-        self.middle_entity_Pointer.addComponent(self.material)
-
-        # === DISTAL SEGMENT For Pointer Finger ===
-        # Parent to middle entity
-        self.distal_entity_Pointer = Qt3DCore.QEntity(self.middle_entity_Pointer)
-
-        distal_mesh_Pointer = Qt3DExtras.QCylinderMesh(self.distal_entity_Pointer)
-        # sets radius of cylinder mesh
-        distal_mesh_Pointer.setRadius(0.9)
-        # sets length of cylinder mesh
-        distal_mesh_Pointer.setLength(distal_len_Pointer)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        distal_mesh_Pointer.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        distal_mesh_Pointer.setSlices(32)
-
-        # Transform for distal - this is where rotation happens
-        self.distal_transform_Pointer = Qt3DCore.QTransform(self.distal_entity_Pointer)
-        #  another pivot point, this time between middle and tip segments
-        self.distal_transform_Pointer.setTranslation(QVector3D(0, middle_len_Pointer / 2 + distal_len_Pointer / 2, 0))
-
-        self.distal_entity_Pointer.addComponent(distal_mesh_Pointer)
-        self.distal_entity_Pointer.addComponent(self.distal_transform_Pointer)
-        self.distal_entity_Pointer.addComponent(self.material)
-
-        # Store segment lengths for rotation calculations
-        self.proximal_len_Pointer = proximal_len_Pointer
-        self.middle_len_Pointer = middle_len_Pointer
-        self.distal_len_Pointer = distal_len_Pointer
-
-        # -------------------------------------------- END POINTER FINGER INITIALIZATION -----------------------------
-
-        # -------------------------------------------- MIDDLE FINGER INITIALIZATION ----------------------------------
-        """Create the three finger segments"""
-        # Segment lengths (pointer Finger)
-        proximal_len_Middle = 10.0
-        middle_len_Middle = 5.5
-        distal_len_Middle = 4.0
-
-        # === PROXIMAL SEGMENT (base segment) For Middle Finger ===
-        self.proximal_entity_Middle = Qt3DCore.QEntity(self.entity_Palm)
-
-        proximal_mesh_Middle = Qt3DExtras.QCylinderMesh(self.proximal_entity_Middle)
-        # sets radius of cylinder mesh
-        proximal_mesh_Middle.setRadius(1.3)
-        # sets length of cylinder mesh
-        proximal_mesh_Middle.setLength(proximal_len_Middle)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        proximal_mesh_Middle.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        proximal_mesh_Middle.setSlices(32)
-
-        # Transform for proximal - rotation happens here
-        self.proximal_transform_Middle = Qt3DCore.QTransform(self.proximal_entity_Middle)
-        # Cylinder is created along Y-axis, positioned so base is at origin
-        self.proximal_transform_Middle.setTranslation(QVector3D(0, 0, -(palm_radius + proximal_len_Middle / 2)))
-
-        self.proximal_entity_Middle.addComponent(proximal_mesh_Middle)
-        self.proximal_entity_Middle.addComponent(self.proximal_transform_Middle)
-        self.proximal_entity_Middle.addComponent(self.material)
-
-        # rotate around X-axis to face forward
-        rotation_Middle = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), 90)
-        self.proximal_transform_Middle.setRotation(rotation_Middle)
-
-        # === MIDDLE SEGMENT For Middle Finger ===
-        # Parent to proximal entity
-        self.middle_entity_Middle = Qt3DCore.QEntity(self.proximal_entity_Middle)
-
-        middle_mesh_Middle = Qt3DExtras.QCylinderMesh(self.middle_entity_Middle)
-        # sets radius of cylinder mesh
-        middle_mesh_Middle.setRadius(1.1)
-        # sets length of cylinder mesh
-        middle_mesh_Middle.setLength(middle_len_Middle)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        middle_mesh_Middle.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        middle_mesh_Middle.setSlices(32)
-
-        # Transform for middle - this is where rotation happens
-        self.middle_transform_Middle = Qt3DCore.QTransform(self.middle_entity_Middle)
-        # Position at the top of proximal segment (in proximal's local space)
-        # The pivot point is at the base of this cylinder (joint between middle and bast segments)
-        self.middle_transform_Middle.setTranslation(QVector3D(0, proximal_len_Middle / 2 + middle_len_Middle / 2, 0))
-
-        self.middle_entity_Middle.addComponent(middle_mesh_Middle)
-        self.middle_entity_Middle.addComponent(self.middle_transform_Middle)
-        self.middle_entity_Middle.addComponent(self.material)
-
-        # === DISTAL SEGMENT For Middle Finger ===
-        # Parent to middle entity
-        self.distal_entity_Middle = Qt3DCore.QEntity(self.middle_entity_Middle)
-
-        distal_mesh_Middle = Qt3DExtras.QCylinderMesh(self.distal_entity_Middle)
-        # sets radius of cylinder mesh
-        distal_mesh_Middle.setRadius(0.9)
-        # sets length of cylinder mesh
-        distal_mesh_Middle.setLength(distal_len_Middle)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        distal_mesh_Middle.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        distal_mesh_Middle.setSlices(32)
-
-        # Transform for distal - this is where rotation happens
-        self.distal_transform_Middle = Qt3DCore.QTransform(self.distal_entity_Middle)
-        #  another pivot point, this time between middle and tip segments
-        self.distal_transform_Middle.setTranslation(QVector3D(0, middle_len_Middle / 2 + distal_len_Middle / 2, 0))
-
-        self.distal_entity_Middle.addComponent(distal_mesh_Middle)
-        self.distal_entity_Middle.addComponent(self.distal_transform_Middle)
-        self.distal_entity_Middle.addComponent(self.material)
-
-        # Store segment lengths for rotation calculations
-        self.proximal_len_Middle = proximal_len_Middle
-        self.middle_len_Middle = middle_len_Middle
-        self.distal_len_Middle = distal_len_Middle
-
-        # -------------------------------------------- END Middle FINGER INITIALIZATION -----------------------------
-
-        # -------------------------------------------- Ring FINGER INITIALIZATION ----------------------------------
-        """Create the three finger segments"""
-        # Segment lengths (pointer Finger)
-        proximal_len_Ring = 9.0
-        middle_len_Ring = 5.0
-        distal_len_Ring = 4.0
-
-        # === PROXIMAL SEGMENT (base segment) For Ring Finger ===
-        self.proximal_entity_Ring = Qt3DCore.QEntity(self.entity_Palm)
-
-        proximal_mesh_Ring = Qt3DExtras.QCylinderMesh(self.proximal_entity_Ring)
-        # sets radius of cylinder mesh
-        proximal_mesh_Ring.setRadius(1.3)
-        # sets length of cylinder mesh
-        proximal_mesh_Ring.setLength(proximal_len_Ring)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        proximal_mesh_Ring.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        proximal_mesh_Ring.setSlices(32)
-
-        # Transform for proximal - rotation happens here
-        self.proximal_transform_Ring = Qt3DCore.QTransform(self.proximal_entity_Ring)
-        # Cylinder is created along Y-axis, positioned so base is at origin
-        self.proximal_transform_Ring.setTranslation(QVector3D(4, 0, -(palm_radius + proximal_len_Ring / 2)))
-
-        self.proximal_entity_Ring.addComponent(proximal_mesh_Ring)
-        self.proximal_entity_Ring.addComponent(self.proximal_transform_Ring)
-        self.proximal_entity_Ring.addComponent(self.material)
-
-        # rotate around X-axis to face forward
-        rotation_Ring = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), 90)
-        self.proximal_transform_Ring.setRotation(rotation_Ring)
-
-        # === MIDDLE SEGMENT For Ring Finger ===
-        # Parent to proximal entity
-        self.middle_entity_Ring = Qt3DCore.QEntity(self.proximal_entity_Ring)
-
-        middle_mesh_Ring = Qt3DExtras.QCylinderMesh(self.middle_entity_Ring)
-        # sets radius of cylinder mesh
-        middle_mesh_Ring.setRadius(1.1)
-        # sets length of cylinder mesh
-        middle_mesh_Ring.setLength(middle_len_Ring)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        middle_mesh_Ring.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        middle_mesh_Ring.setSlices(32)
-
-        # Transform for middle - this is where rotation happens
-        self.middle_transform_Ring = Qt3DCore.QTransform(self.middle_entity_Ring)
-        # Position at the top of proximal segment (in proximal's local space)
-        # The pivot point is at the base of this cylinder (joint between middle and bast segments)
-        self.middle_transform_Ring.setTranslation(QVector3D(0, proximal_len_Ring / 2 + middle_len_Ring / 2, 0))
-
-        self.middle_entity_Ring.addComponent(middle_mesh_Ring)
-        self.middle_entity_Ring.addComponent(self.middle_transform_Ring)
-        self.middle_entity_Ring.addComponent(self.material)
-
-        # === DISTAL SEGMENT For Ring Finger ===
-        # Parent to middle entity
-        self.distal_entity_Ring = Qt3DCore.QEntity(self.middle_entity_Ring)
-
-        distal_mesh_Ring = Qt3DExtras.QCylinderMesh(self.distal_entity_Ring)
-        # sets radius of cylinder mesh
-        distal_mesh_Ring.setRadius(0.9)
-        # sets length of cylinder mesh
-        distal_mesh_Ring.setLength(distal_len_Ring)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        distal_mesh_Ring.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        distal_mesh_Ring.setSlices(32)
-
-        # Transform for distal - this is where rotation happens
-        self.distal_transform_Ring = Qt3DCore.QTransform(self.distal_entity_Ring)
-        #  another pivot point, this time between middle and tip segments
-        self.distal_transform_Ring.setTranslation(QVector3D(0, middle_len_Ring / 2 + distal_len_Ring / 2, 0))
-
-        self.distal_entity_Ring.addComponent(distal_mesh_Ring)
-        self.distal_entity_Ring.addComponent(self.distal_transform_Ring)
-        self.distal_entity_Ring.addComponent(self.material)
-
-        # Store segment lengths for rotation calculations
-        self.proximal_len_Ring = proximal_len_Ring
-        self.middle_len_Ring = middle_len_Ring
-        self.distal_len_Ring = distal_len_Ring
-
-        # -------------------------------------------- END Ring FINGER INITIALIZATION -----------------------------
-
-        # -------------------------------------------- PINKY FINGER INITIALIZATION ----------------------------------
-        """Create the three finger segments"""
-        # Segment lengths (pointer Finger)
-        proximal_len_Pinky = 5.0
-        middle_len_Pinky = 4.0
-        distal_len_Pinky = 4.0
-
-        # === PROXIMAL SEGMENT (base segment) For Pinky Finger ===
-        self.proximal_entity_Pinky = Qt3DCore.QEntity(self.entity_Palm)
-
-        proximal_mesh_Pinky = Qt3DExtras.QCylinderMesh(self.proximal_entity_Pinky)
-        # sets radius of cylinder mesh
-        proximal_mesh_Pinky.setRadius(1.3)
-        # sets length of cylinder mesh
-        proximal_mesh_Pinky.setLength(proximal_len_Pinky)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        proximal_mesh_Pinky.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        proximal_mesh_Pinky.setSlices(32)
-
-        # Transform for proximal - rotation happens here
-        self.proximal_transform_Pinky = Qt3DCore.QTransform(self.proximal_entity_Pinky)
-        # Cylinder is created along Y-axis, positioned so base is at origin
-        self.proximal_transform_Pinky.setTranslation(QVector3D(8, 0, -(palm_radius + proximal_len_Pinky / 2)))
-
-        self.proximal_entity_Pinky.addComponent(proximal_mesh_Pinky)
-        self.proximal_entity_Pinky.addComponent(self.proximal_transform_Pinky)
-        self.proximal_entity_Pinky.addComponent(self.material)
-
-        # rotate around X-axis to face forward
-        rotation_Pinky = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), 90)
-        self.proximal_transform_Pinky.setRotation(rotation_Pinky)
-
-        # === MIDDLE SEGMENT For Pinky Finger ===
-        # Parent to proximal entity
-        self.middle_entity_Pinky = Qt3DCore.QEntity(self.proximal_entity_Pinky)
-
-        middle_mesh_Pinky = Qt3DExtras.QCylinderMesh(self.middle_entity_Pinky)
-        # sets radius of cylinder mesh
-        middle_mesh_Pinky.setRadius(1.1)
-        # sets length of cylinder mesh
-        middle_mesh_Pinky.setLength(middle_len_Pinky)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        middle_mesh_Pinky.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        middle_mesh_Pinky.setSlices(32)
-
-        # Transform for middle - this is where rotation happens
-        self.middle_transform_Pinky = Qt3DCore.QTransform(self.middle_entity_Pinky)
-        # Position at the top of proximal segment (in proximal's local space)
-        # The pivot point is at the base of this cylinder (joint between middle and bast segments)
-        self.middle_transform_Pinky.setTranslation(QVector3D(0, proximal_len_Pinky / 2 + middle_len_Pinky / 2, 0))
-
-        self.middle_entity_Pinky.addComponent(middle_mesh_Pinky)
-        self.middle_entity_Pinky.addComponent(self.middle_transform_Pinky)
-        self.middle_entity_Pinky.addComponent(self.material)
-
-        # === DISTAL SEGMENT For Pinky Finger ===
-        # Parent to middle entity
-        self.distal_entity_Pinky = Qt3DCore.QEntity(self.middle_entity_Pinky)
-
-        distal_mesh_Pinky = Qt3DExtras.QCylinderMesh(self.distal_entity_Pinky)
-        # sets radius of cylinder mesh
-        distal_mesh_Pinky.setRadius(0.9)
-        # sets length of cylinder mesh
-        distal_mesh_Pinky.setLength(distal_len_Pinky)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        distal_mesh_Pinky.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        distal_mesh_Pinky.setSlices(32)
-
-        # Transform for distal - this is where rotation happens
-        self.distal_transform_Pinky = Qt3DCore.QTransform(self.distal_entity_Pinky)
-        #  another pivot point, this time between middle and tip segments
-        self.distal_transform_Pinky.setTranslation(QVector3D(0, middle_len_Pinky / 2 + distal_len_Pinky / 2, 0))
-
-        self.distal_entity_Pinky.addComponent(distal_mesh_Pinky)
-        self.distal_entity_Pinky.addComponent(self.distal_transform_Pinky)
-        self.distal_entity_Pinky.addComponent(self.material)
-
-        # Store segment lengths for rotation calculations
-        self.proximal_len_Pinky = proximal_len_Pinky
-        self.middle_len_Pinky = middle_len_Pinky
-        self.distal_len_Pinky = distal_len_Pinky
-
-        # -------------------------------------------- END PINKY FINGER INITIALIZATION -----------------------------
-
-        # -------------------------------------------- THUMB INITIALIZATION ----------------------------------
-        """Create the three finger segments"""
-        # Segment lengths (pointer Finger)
-        proximal_len_Thumb = 6.5
-        distal_len_Thumb = 5.75
-
-        # === PROXIMAL SEGMENT (base segment) For Thumb Finger ===
-        self.proximal_entity_Thumb = Qt3DCore.QEntity(self.entity_Palm)
-
-        proximal_mesh_Thumb = Qt3DExtras.QCylinderMesh(self.proximal_entity_Thumb)
-        # sets radius of cylinder mesh
-        proximal_mesh_Thumb.setRadius(1.5)
-        # sets length of cylinder mesh
-        proximal_mesh_Thumb.setLength(proximal_len_Thumb)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        proximal_mesh_Thumb.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        proximal_mesh_Thumb.setSlices(32)
-
-        # Transform for proximal - rotation happens here
-        self.proximal_transform_Thumb = Qt3DCore.QTransform(self.proximal_entity_Thumb)
-        # Cylinder is created along Y-axis, positioned so base is at origin
-        self.proximal_transform_Thumb.setTranslation(QVector3D(-10, 0, -(palm_radius + proximal_len_Thumb / 2 - 10)))
-
-        self.proximal_entity_Thumb.addComponent(proximal_mesh_Thumb)
-        self.proximal_entity_Thumb.addComponent(self.proximal_transform_Thumb)
-        self.proximal_entity_Thumb.addComponent(self.material)
-
-        # rotate around X-axis to face forward
-        rotation_Thumb = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), 90)
-        self.proximal_transform_Thumb.setRotation(rotation_Thumb)
-
-        # === DISTAL SEGMENT For Thumb Finger ===
-        # Parent to middle entity
-        self.distal_entity_Thumb = Qt3DCore.QEntity(self.proximal_entity_Thumb)
-
-        distal_mesh_Thumb = Qt3DExtras.QCylinderMesh(self.distal_entity_Thumb)
-        # sets radius of cylinder mesh
-        distal_mesh_Thumb.setRadius(1.6)
-        # sets length of cylinder mesh
-        distal_mesh_Thumb.setLength(distal_len_Thumb)
-        # sets number of subdivisions along length (around radius) to smooth rendering
-        distal_mesh_Thumb.setRings(20)
-        # sets number of subdivisions around the circumference to make shape more cylindrical
-        distal_mesh_Thumb.setSlices(32)
 
-        # Transform for distal - this is where rotation happens
-        self.distal_transform_Thumb = Qt3DCore.QTransform(self.distal_entity_Thumb)
-        #  another pivot point, this time between middle and tip segments
-        self.distal_transform_Thumb.setTranslation(QVector3D(0, distal_len_Thumb / 2, 0))
+        self.add_cylinder(self.entity_Palm, PALM_RADIUS, PALM_THICKNESS, QVector3D(0, 0, 0))
+
+        # -------------------------------------------- FINGERS ------------------------------------------------------
+        # Joint transforms in setPose order: J1 (and J2) of each finger, thumb to pinky
+        joint_transforms = []
+        for finger, lengths in enumerate(segmentLengths):
+            # Base joint at the finger's knuckle (ForwardKinematics layout), turned so the finger's +Y runs along
+            # the palm's -Z; it does not bend
+            baseX, baseY, _ = RIGHT_HAND_BASES[finger]
+            joint, _ = self.add_joint(self.entity_Palm, QVector3D(baseX * SCENE_SCALE, 0, -baseY * SCENE_SCALE),
+                                      QQuaternion.fromAxisAndAngle(BEND_AXIS, 90))
+
+            previous_len = 0.0
+            for segment, length in enumerate(lengths):
+                if length <= 0:
+                    break
+                if segment > 0:
+                    # J1, J2: pivot at the end of the previous segment
+                    joint, transform = self.add_joint(joint, QVector3D(0, previous_len, 0))
+                    joint_transforms.append(transform)
+                length *= SCENE_SCALE
+                self.add_cylinder(joint, SEGMENT_RADII[finger][segment], length, QVector3D(0, length / 2, 0))
+                previous_len = length
+
+        self.joint_transforms = tuple(joint_transforms)
+
+    def add_joint(self, parent, translation, rotation=None):
+        """Add a joint entity under parent; returns the entity and the transform its bend is written to"""
+        entity = Qt3DCore.QEntity(parent)
+        transform = Qt3DCore.QTransform(entity)
+        transform.setTranslation(translation)
+        if rotation is not None:
+            transform.setRotation(rotation)
+        entity.addComponent(transform)
+        self.scene_nodes += (entity, transform)
+        return entity, transform
+
+    def add_cylinder(self, parent, radius, length, center):
+        """Add a segment under parent: the shared cylinder scaled to radius and length, centered at center"""
+        entity = Qt3DCore.QEntity(parent)
+        transform = Qt3DCore.QTransform(entity)
+        transform.setTranslation(center)
+        transform.setScale3D(QVector3D(radius, length, radius))
+
+        entity.addComponent(self.cylinderMesh)
+        entity.addComponent(transform)
+        entity.addComponent(self.material)
+        self.scene_nodes += (entity, transform)
+        return entity
+
+    def setPose(self, j1Angles, j2Angles, orientation=None):
+        """
+        Pose the whole hand in one call, touching only the transforms that changed.
 
-        self.distal_entity_Thumb.addComponent(distal_mesh_Thumb)
-        self.distal_entity_Thumb.addComponent(self.distal_transform_Thumb)
-        self.distal_entity_Thumb.addComponent(self.material)
+        A joint's transform is updated only when its angle moved more than angleDeadband
+        since it was last set, and the palm's only when the wrist turned more than
+        orientationDeadband, so a still hand costs no scene-graph updates.
 
-        # Store segment lengths for rotation calculations
-        self.proximal_len_Thumb = proximal_len_Thumb
-        self.distal_len_Thumb = distal_len_Thumb
+        Args:
+            j1Angles: J1 angles in degrees, thumb, pointer, middle, ring, pinky (RightHand.j1Angles)
+            j2Angles: J2 angles in degrees, pointer, middle, ring, pinky (RightHand.j2Angles)
+            orientation: optional wrist quaternion (w, x, y, z), as for setOrientationPalmQuaternion
 
-        # -------------------------------------------- END THUMB FINGER INITIALIZATION -----------------------------
+        Returns:
+            number of transforms updated
+        """
+        angles = (j1Angles[0], j1Angles[1], j2Angles[0], j1Angles[2], j2Angles[1],
+                  j1Angles[3], j2Angles[2], j1Angles[4], j2Angles[3])
+        updated = 0
+        for joint, angle in enumerate(angles):
+            # NaN (never set) compares false, so the first pose always applies
+            if not abs(angle - self.joint_angles[joint]) <= self.angleDeadband:
+                self.setJointAngle(joint, angle)
+                updated += 1
+
+        skipped = len(angles) - updated
+        if orientation is not None:
+            if self.palmTurned(orientation):
+                self.setOrientationPalmQuaternion(*orientation)
+                updated += 1
+            else:
+                skipped += 1
+
+        self.transformsUpdated += updated
+        self.transformsSkipped += skipped
+        return updated
+
+    def setJointAngle(self, joint, angle):
+        # Bend one joint (setPose order) by angle degrees about its base, and remember it for dirty tracking
+        self.joint_transforms[joint].setRotation(QQuaternion.fromAxisAndAngle(BEND_AXIS, angle))
+        self.joint_angles[joint] = angle
+
+    def palmTurned(self, orientation):
+        # Whether the wrist quaternion is more than orientationDeadband degrees from the one last applied
+        if self.palm_quaternion is None:
+            return True
+        dot = abs(sum(a * b for a, b in zip(orientation, self.palm_quaternion)))
+        return math.degrees(2 * math.acos(min(dot, 1.0))) > self.orientationDeadband
 
     def setAnglesPointer(self, middle_angle: float, distal_angle: float):
         """
@@ -524,23 +259,8 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
             middle_angle: Angle in degrees for the middle segment (0 = straight)
             distal_angle: Angle in degrees for the distal segment (0 = straight)
         """
-        # For the middle segment: rotate around negative X-axis at its base (fingers curl down)
-        middle_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), middle_angle)
-
-        # sets rotation angle middle_angle degrees around -x axis
-        self.middle_transform_Pointer.setRotation(middle_rotation)
-
-        # Keep original translation on middle segment
-        #self.middle_transform_Pointer.setTranslation(QVector3D(0, self.proximal_len_Pointer / 2 + self.middle_len_Pointer / 2, 0))
-
-        # For the distal segment: rotate around negative X-axis at its base (fingers curl down)
-        distal_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), distal_angle)
-
-        # sets rotation angle distal_angle degrees around -x axis
-        self.distal_transform_Pointer.setRotation(distal_rotation)
-
-        # Keep original translation
-        #self.distal_transform_Pointer.setTranslation(QVector3D(0, self.middle_len_Pointer / 2 + self.distal_len_Pointer / 2, 0))
+        self.setJointAngle(POINTER_J1, middle_angle)
+        self.setJointAngle(POINTER_J2, distal_angle)
 
     def setAnglesMiddle(self, middle_angle: float, distal_angle: float):
         """
@@ -550,53 +270,10 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
             middle_angle: Angle in degrees for the middle segment (0 = straight)
             distal_angle: Angle in degrees for the distal segment (0 = straight)
         """
-        # For the middle segment: rotate around negative X-axis at its base (fingers curl down)
-        middle_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), middle_angle)
-
-        # sets rotation angle middle_angle degrees around -x axis
-        self.middle_transform_Middle.setRotation(middle_rotation)
-
-        # Keep original translation on middle segment
-        #self.middle_transform_Middle.setTranslation(QVector3D(0, self.proximal_len_Middle / 2 + self.middle_len_Middle / 2, 0))
-
-        # For the distal segment: rotate around negative X-axis at its base (fingers curl down)
-        distal_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), distal_angle)
-
-        # sets rotation angle distal_angle degrees around -x axis
-        self.distal_transform_Middle.setRotation(distal_rotation)
-
-        # Keep original translation
-        #self.distal_transform_Middle.setTranslation(QVector3D(0, self.middle_len_Middle / 2 + self.distal_len_Middle / 2, 0))
+        self.setJointAngle(MIDDLE_J1, middle_angle)
+        self.setJointAngle(MIDDLE_J2, distal_angle)
 
     def setAnglesRing(self, middle_angle: float, distal_angle: float):
-            """
-            Set the bend angles for the finger segments.
-
-            Args:
-                middle_angle: Angle in degrees for the middle segment (0 = straight)
-                distal_angle: Angle in degrees for the distal segment (0 = straight)
-            """
-            # For the middle segment: rotate around negative X-axis at its base (fingers curl down)
-            middle_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), middle_angle)
-
-            # sets rotation angle middle_angle degrees around -x axis
-            self.middle_transform_Ring.setRotation(middle_rotation)
-
-            # Keep original translation on middle segment
-            #self.middle_transform_Ring.setTranslation(
-                #QVector3D(0, self.proximal_len_Ring / 2 + self.middle_len_Ring / 2, 0))
-
-            # For the distal segment: rotate around negative X-axis at its base (fingers curl down)
-            distal_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), distal_angle)
-
-            # sets rotation angle distal_angle degrees around -x axis
-            self.distal_transform_Ring.setRotation(distal_rotation)
-
-            # Keep original translation
-            #self.distal_transform_Ring.setTranslation(
-                #QVector3D(0, self.middle_len_Ring / 2 + self.distal_len_Ring / 2, 0))
-
-    def setAnglesPinky(self, middle_angle: float, distal_angle: float):
         """
         Set the bend angles for the finger segments.
 
@@ -604,27 +281,10 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
             middle_angle: Angle in degrees for the middle segment (0 = straight)
             distal_angle: Angle in degrees for the distal segment (0 = straight)
         """
-        # For the middle segment: rotate around negative X-axis at its base (fingers curl down)
-        middle_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), middle_angle)
-
-        # sets rotation angle middle_angle degrees around -x axis
-        self.middle_transform_Pinky.setRotation(middle_rotation)
-
-        # Keep original translation on middle segment
-        #self.middle_transform_Pinky.setTranslation(
-            #QVector3D(0, self.proximal_len_Pinky / 2 + self.middle_len_Pinky / 2, 0))
-
-        # For the distal segment: rotate around negative X-axis at its base (fingers curl down)
-        distal_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), distal_angle)
-
-        # sets rotation angle distal_angle degrees around -x axis
-        self.distal_transform_Pinky.setRotation(distal_rotation)
-
-        # Keep original translation
-        #self.distal_transform_Pinky.setTranslation(
-            #QVector3D(0, self.middle_len_Pinky / 2 + self.distal_len_Pinky / 2, 0))
+        self.setJointAngle(RING_J1, middle_angle)
+        self.setJointAngle(RING_J2, distal_angle)
 
-    def setAngleThumb(self, distal_angle: float):
+    def setAnglesPinky(self, middle_angle: float, distal_angle: float):
         """
         Set the bend angles for the finger segments.
 
@@ -632,16 +292,17 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
             middle_angle: Angle in degrees for the middle segment (0 = straight)
             distal_angle: Angle in degrees for the distal segment (0 = straight)
         """
+        self.setJointAngle(PINKY_J1, middle_angle)
+        self.setJointAngle(PINKY_J2, distal_angle)
 
-        # For the distal segment: rotate around negative X-axis at its base (fingers curl down)
-        distal_rotation = QQuaternion.fromAxisAndAngle(QVector3D(-1, 0, 0), distal_angle)
-
-        # sets rotation angle distal_angle degrees around -x axis
-        self.distal_transform_Thumb.setRotation(distal_rotation)
+    def setAngleThumb(self, distal_angle: float):
+        """
+        Set the bend angle of the thumb's distal segment.
 
-        # Keep original translation
-        #self.distal_transform_Thumb.setTranslation(
-            #QVector3D(0, self.distal_len_Thumb / 2, 0))
+        Args:
+            distal_angle: Angle in degrees for the distal segment (0 = straight)
+        """
+        self.setJointAngle(THUMB_J1, distal_angle)
 
     def setOrientationPalm(self, X_rotation: float, Y_rotation: float, Z_rotation: float):
         # NOTE: SENSOR X_rotation on wrist is in -X direction in animation window (e.g. 340 degrees sensor => 20 degrees animation).
@@ -659,5 +320,20 @@ class AnimationWindow(Qt3DExtras.Qt3DWindow):
 
         wrist_rotation = wrist_X_rotation * wrist_Y_rotation * wrist_Z_rotation
         self.transform_Palm.setRotation(wrist_rotation)
+        self.palm_quaternion = None  # not comparable with setPose's quaternions, so its next one always applies
+
+        return
+
+    def setOrientationPalmQuaternion(self, w: float, x: float, y: float, z: float):
+        # Wrist orientation as a sensor-frame unit quaternion (w, x, y, z), applied without an Euler round trip.
+        # Same axis mapping as setOrientationPalm: sensor X -> window -X, sensor Y -> window -Z,
+        # sensor Z -> window Y, on top of the palm's 90 degree rotation about window X
+        self.palm_quaternion = (w, x, y, z)
+        if self.mirrored:
+            # Undo the scene's mirror so the left palm turns the way the glove does (the mirror
+            # leaves rotations about window X alone and reverses those about Y and Z)
+            self.transform_Palm.setRotation(self.rotation_Palm_base * QQuaternion(w, -x, -z, y))
+        else:
+            self.transform_Palm.setRotation(self.rotation_Palm_base * QQuaternion(w, -x, z, -y))
 
         return
\ No newline at end of file
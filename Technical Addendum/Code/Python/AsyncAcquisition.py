@@ -0,0 +1,464 @@
+import argparse
+import asyncio
+import math
+import os
+import time
+from collections import namedtuple
+import serial
+from GloveProtocol import (NUM_CHANNELS, START_COMMAND, START_COMMAND_BINARY, STOP_COMMAND, FRAME_SIZE,
+                           BinaryFrameDecoder, parseTextLine)
+from Instrumentation import instrumentation
+from FrameServer import FrameServer, serveFrames
+
+# asyncio acquisition core: every glove is read on one event loop, whatever its transport (serial port,
+# TCP socket fed by a simulator, recording replay), and every frame is published to each subscriber's
+# bounded queue. Consumers (recorder, display, analytics) iterate their subscription:
+#
+#   service = AcquisitionService([GloveSource(SerialTransport('COM8'))])
+#   recording = service.subscribe()                      # waits for the recorder when full (backpressure)
+#   display = service.subscribe(maxsize=64, dropOldest=True)  # only wants recent frames
+#   await asyncio.gather(service.run(), recordFrames(recording, recorder), forwardFrames(display, onFrame))
+#
+# Frames are timestamped as the loop receives them (spread over the bytes of each read), so frames from
+# several gloves come out of the loop in timestamp order, within one read's span, without a merge step.
+
+# One frame as passed to onFrame callbacks: data is the text frame's fields (hand field included) or the
+# binary frame's float array (an owned copy); sequence/deviceTime are -1/NaN for text frames; receivedAt is the
+# perf_counter time the frame's last byte is estimated to have arrived, and timestamp the same from startTime
+Frame = namedtuple('Frame', 'data timestamp hand sequence deviceTime receivedAt')
+
+# Longest time (s) the frames of one read are spread over. After the glove has been idle (paused, resetting) the
+# time since the previous read says nothing about when the new bytes arrived
+MAX_READ_SPAN = 0.1
+
+
+# ------------------------------------------------- TRANSPORTS ---------------------------------------------------------
+# Transports move bytes only: open(), read() -> bytes (b'' when nothing arrived), write(data), isOpen(), close()
+
+class SerialTransport:
+    """
+    Glove on a serial port, read without a thread.
+
+    On POSIX the event loop watches the port's file descriptor; elsewhere (Windows COM ports)
+    the port is polled every pollInterval seconds. Either way read() returns everything
+    waiting at once.
+
+    Args:
+        port: port name, e.g. 'COM8' or '/dev/ttyACM0'
+        baudRate: serial baud rate
+        serialPort: an already open serial.Serial to use instead of opening port
+        resetDelay: seconds to wait after opening, while the glove resets
+        pollInterval: seconds between polls where the port cannot be watched
+    """
+
+    def __init__(self, port=None, baudRate=2000000, serialPort=None, resetDelay=3.0, pollInterval=0.001):
+        self.port = port
+        self.baudRate = baudRate
+        self.serial = serialPort
+        self.resetDelay = resetDelay
+        self.pollInterval = pollInterval
+
+    async def open(self):
+        if self.serial is None:
+            self.serial = serial.Serial(self.port, self.baudRate, timeout=0)
+            await asyncio.sleep(self.resetDelay)
+
+    async def read(self):
+        waiting = self.serial.in_waiting
+        if not waiting:
+            await self.readable()
+            waiting = self.serial.in_waiting
+        return self.serial.read(waiting) if waiting else b''
+
+    async def readable(self):
+        if os.name != 'posix':
+            await asyncio.sleep(self.pollInterval)
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fileno = self.serial.fileno()
+        loop.add_reader(fileno, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fileno)
+
+    async def write(self, data):
+        self.serial.write(data)
+
+    def isOpen(self):
+        return self.serial is not None and self.serial.is_open
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+
+
+class TcpTransport:
+    """
+    Glove stream over a local TCP socket, e.g. from a simulator.
+
+    Args:
+        host, port: address to connect to
+    """
+
+    def __init__(self, host='localhost', port=5000):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.connected = False
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.connected = True
+
+    async def read(self):
+        data = await self.reader.read(65536)
+        if not data:
+            self.connected = False
+        return data
+
+    async def write(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    def isOpen(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ReplayTransport:
+    """
+    Recording played back as a glove would send it (see ReplaySerial), paced with asyncio.sleep.
+
+    Args:
+        recordingPath: GloveData.csv style or .glove recording
+        speed: multiple of real time; None sends as fast as the loop reads
+        loop: restart the recording when it ends
+        hand: 'R'/'L' to replace the recorded Hand column
+        replay: an existing ReplaySerial to play instead
+    """
+
+    def __init__(self, recordingPath=None, speed=1.0, loop=False, hand=None, replay=None):
+        if replay is None:
+            from ReplaySource import ReplaySerial
+            replay = ReplaySerial(recordingPath, speed, loop, hand)
+        self.replay = replay
+
+    async def open(self):
+        pass
+
+    async def read(self):
+        replay = self.replay
+        if not replay.streaming or replay.finished:
+            await asyncio.sleep(0.01)
+            return b''
+        row = replay.nextRow()
+        if row is None:
+            return b''
+        # Yield to the loop even when the row is already due, so as-fast-as-possible replay shares it
+        await asyncio.sleep(max(replay.delayUntilDue(row[0]), 0))
+        return replay.encodeRow(row[1])
+
+    async def write(self, data):
+        self.replay.write(data)
+
+    def isOpen(self):
+        return self.replay.isOpen()
+
+    def close(self):
+        self.replay.close()
+
+
+# ---------------------------------------------- SOURCES AND SERVICE ---------------------------------------------------
+class GloveSource:
+    """
+    Decodes one glove's frames from its transport.
+
+    Args:
+        transport: SerialTransport, TcpTransport, ReplayTransport or anything with the same methods
+        hand: 'R'/'L' to tag every frame with, when several gloves are read (None keeps the glove's own)
+        binaryMode: request and decode binary frames instead of text lines
+    """
+
+    def __init__(self, transport, hand=None, binaryMode=False):
+        self.transport = transport
+        self.hand = hand
+        self.binaryMode = binaryMode
+        self.framesRead = 0
+
+    async def start(self):
+        await self.transport.open()
+        await self.transport.write(START_COMMAND_BINARY if self.binaryMode else START_COMMAND)
+
+    async def stop(self):
+        if self.transport.isOpen():
+            await self.transport.write(STOP_COMMAND)
+
+    async def frames(self, startTime):
+        # Async iterator over the glove's frames until its transport closes.
+        # One read can return many frames. They arrived between the previous read and this one, so each frame is
+        # stamped by where its last byte lies in the chunk, spread evenly over that interval (the last frame at
+        # the read's return time), rather than every frame of the chunk sharing one timestamp
+        transport = self.transport
+        decoder = BinaryFrameDecoder() if self.binaryMode else None
+        chunk = len(decoder.buffer) - FRAME_SIZE if decoder else 0
+        pending = b''
+        previousRead = None
+        while transport.isOpen():
+            data = await transport.read()
+            receivedAt = time.perf_counter()
+            if not data:
+                continue
+            readSpan = min(receivedAt - previousRead, MAX_READ_SPAN) if previousRead is not None else 0.0
+            secondsPerByte = readSpan / len(data)
+            previousRead = receivedAt
+
+            if decoder:
+                # Feed at most what fits beside a partial frame, decoding in between
+                for offset in range(0, len(data), chunk):
+                    decoder.feed(data[offset:offset + chunk])
+                    unfed = max(len(data) - offset - chunk, 0)
+                    frame = decoder.nextFrame()
+                    while frame is not None:
+                        sequence, deviceTime, values, hand = frame
+                        arrivedAt = receivedAt - (decoder.end - decoder.start + unfed) * secondsPerByte
+                        self.framesRead += 1
+                        yield Frame(values.copy(), round(arrivedAt - startTime, 3), self.hand or hand,
+                                    sequence, deviceTime, arrivedAt)
+                        frame = decoder.nextFrame()
+            else:
+                received = pending + data
+                lines = received.split(b'\n')
+                pending = lines.pop()
+                bytesAfter = len(received)
+                for line in lines:
+                    bytesAfter -= len(line) + 1
+                    fields = parseTextLine(line)
+                    if fields:
+                        if self.hand:
+                            fields = fields[:NUM_CHANNELS] + [self.hand]
+                        arrivedAt = receivedAt - bytesAfter * secondsPerByte
+                        self.framesRead += 1
+                        yield Frame(fields, round(arrivedAt - startTime, 3), self.hand, -1, math.nan, arrivedAt)
+
+
+class Subscription:
+    """
+    One consumer's bounded queue of frames; iterate it with async for until the stream ends.
+
+    When the queue is full the publisher either waits for the consumer (counted in
+    framesBackpressured), which in turn stops the gloves being read until it catches up, or,
+    with dropOldest, discards the oldest queued frame (counted in framesDropped). Recorders
+    should wait; displays only need recent frames.
+
+    Args:
+        maxsize: frames queued at most
+        dropOldest: discard the oldest frame instead of waiting when full
+    """
+
+    def __init__(self, maxsize=1024, dropOldest=False):
+        self.queue = asyncio.Queue(maxsize)
+        self.dropOldest = dropOldest
+        self.framesDropped = 0
+        self.framesBackpressured = 0
+
+    async def put(self, frame):
+        queue = self.queue
+        if queue.full():
+            if not self.dropOldest:
+                self.framesBackpressured += 1
+                await queue.put(frame)
+                return
+            queue.get_nowait()
+            self.framesDropped += 1
+        queue.put_nowait(frame)
+
+    async def end(self):
+        # End of stream marker; a dropping subscription makes room for it
+        if self.dropOldest and self.queue.full():
+            self.queue.get_nowait()
+            self.framesDropped += 1
+        await self.queue.put(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.queue.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    def stats(self):
+        return {"queueDepth": self.queue.qsize(), "framesDropped": self.framesDropped,
+                "framesBackpressured": self.framesBackpressured}
+
+
+class AcquisitionService:
+    """
+    Reads every glove source on one event loop and publishes each frame to every subscriber.
+
+    run() starts the gloves, reads them concurrently until every transport has closed, stop()
+    is called, or isRunning returns False, then stops the gloves and ends every subscription.
+
+    Args:
+        sources: one GloveSource per glove
+        startTime: time.perf_counter() value timestamps are measured from (default: when run starts)
+    """
+
+    def __init__(self, sources, startTime=None):
+        self.sources = list(sources)
+        self.startTime = startTime
+        self.subscriptions = []
+        self.tasks = []
+        self.frameServer = None  # FrameServer streaming the frames to local clients, if any (runAcquisition)
+
+    def subscribe(self, maxsize=1024, dropOldest=False):
+        # Subscribe before run() to see every frame
+        subscription = Subscription(maxsize, dropOldest)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        # A new list, so a publish already iterating the old one still reaches every other subscriber
+        self.subscriptions = [other for other in self.subscriptions if other is not subscription]
+
+    async def frames(self, maxsize=1024):
+        # Async iterator over every glove's frames, on a subscription of its own
+        async for frame in self.subscribe(maxsize):
+            yield frame
+
+    async def run(self, isRunning=None):
+        if self.startTime is None:
+            self.startTime = time.perf_counter()
+        try:
+            for source in self.sources:
+                await source.start()
+            self.tasks = [asyncio.ensure_future(self.readSource(source)) for source in self.sources]
+            if isRunning:
+                self.tasks.append(asyncio.ensure_future(self.watch(isRunning)))
+            done, _ = await asyncio.wait(self.tasks[:len(self.sources)])
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        finally:
+            self.stop()
+            for source in self.sources:
+                await source.stop()
+            for subscription in list(self.subscriptions):
+                await subscription.end()
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+
+    async def watch(self, isRunning, interval=0.1):
+        # Stop when isRunning() turns False (e.g. the GUI's Stop button, set from another thread)
+        while isRunning():
+            await asyncio.sleep(interval)
+        self.stop()
+
+    async def readSource(self, source):
+        async for frame in source.frames(self.startTime):
+            t0 = instrumentation.start()
+            for subscription in self.subscriptions:
+                await subscription.put(frame)
+            instrumentation.stop('acquire', t0)
+
+    def stats(self):
+        stats = {"framesRead": [source.framesRead for source in self.sources],
+                 "subscriptions": [subscription.stats() for subscription in self.subscriptions]}
+        if self.frameServer is not None:
+            stats["stream"] = self.frameServer.stats()
+        return stats
+
+
+# ------------------------------------------------- CONSUMERS ----------------------------------------------------------
+
+# recordFrames(subscription, recorder)
+# Write every frame to a CsvRecordingSink / BinaryRecordingSink
+async def recordFrames(subscription, recorder):
+    async for frame in subscription:
+        if isinstance(frame.data, list):
+            recorder.writeRow([frame.timestamp] + frame.data)
+        else:
+            recorder.writeValues(frame.timestamp, frame.data, frame.hand or 'R')
+
+
+# forwardFrames(subscription, onFrame)
+# Call onFrame(data, timestamp, hand, sequence, deviceTime, receivedAt) for every frame (GloveMonitorWindow.updateData)
+async def forwardFrames(subscription, onFrame):
+    async for frame in subscription:
+        onFrame(*frame)
+
+
+# runAcquisition(sources, recorder, onFrame, startTime, isRunning, streamPort)
+# Blocking entry point for a data thread: one event loop reads every glove while the recorder and onFrame
+# consume their own subscriptions (the recorder's waits, it must not lose frames). With streamPort, a FrameServer on
+# that localhost port streams the same live frames to WebSocket clients from a dropping subscription, so acquisition
+# never waits for them, and a port that cannot be bound only disables streaming. Returns the service, for its stats
+def runAcquisition(sources, recorder=None, onFrame=None, startTime=None, isRunning=None, streamPort=None):
+    service = AcquisitionService(sources, startTime)
+
+    async def main():
+        consumers = []
+        if recorder:
+            consumers.append(recordFrames(service.subscribe(), recorder))
+        if onFrame:
+            consumers.append(forwardFrames(service.subscribe(), onFrame))
+        if streamPort is not None:
+            service.frameServer = FrameServer(port=streamPort)
+            consumers.append(serveFrames(service.subscribe(maxsize=64, dropOldest=True), service.frameServer, service))
+        await asyncio.gather(service.run(isRunning), *consumers)
+
+    asyncio.run(main())
+    return service
+
+
+# parseSource(spec, binaryMode, speed)
+# GloveSource from a command line spec KIND:TARGET[@HAND]: serial:COM8, tcp:localhost:5000@L, replay:GloveData.csv
+def parseSource(spec, binaryMode=False, speed=1.0):
+    spec, _, hand = spec.partition('@')
+    kind, _, target = spec.partition(':')
+    if kind == 'serial':
+        transport = SerialTransport(target)
+    elif kind == 'tcp':
+        host, _, port = target.rpartition(':')
+        transport = TcpTransport(host or 'localhost', int(port))
+    elif kind == 'replay':
+        transport = ReplayTransport(target, speed, hand=hand or None)
+    else:
+        raise ValueError(f"Unknown source {spec!r}, expected serial:, tcp: or replay:")
+    return GloveSource(transport, hand or None, binaryMode)
+
+
+if __name__ == '__main__':
+    from Acquisition import openRecorder
+
+    parser = argparse.ArgumentParser(description="Acquire one or more gloves on a single event loop and record them")
+    parser.add_argument("sources", nargs="+",
+                        help="gloves as serial:PORT, tcp:HOST:PORT or replay:RECORDING, each optionally @R or @L")
+    parser.add_argument("--output", default="GloveData.csv", help="recording file (.csv or .glove)")
+    parser.add_argument("--binary", action="store_true", help="use the binary frame protocol")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed; 0 plays as fast as possible")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--stream", type=int, metavar="PORT",
+                        help="also stream the live frames to WebSocket clients on this localhost port (FrameServer)")
+    args = parser.parse_args()
+
+    sources = [parseSource(spec, args.binary, args.speed or None) for spec in args.sources]
+    recorder = openRecorder(args.output)
+    deadline = time.perf_counter() + args.duration if args.duration else math.inf
+    try:
+        service = runAcquisition(sources, recorder, isRunning=lambda: time.perf_counter() < deadline,
+                                 streamPort=args.stream)
+    finally:
+        recorder.close()
+    print(f"Acquisition stats: {service.stats()}")
+    print(f"Recording stats: {recorder.stats()}")
@@ -0,0 +1,212 @@
+import argparse
+import csv
+import glob
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from GloveProtocol import NUM_CHANNELS, fieldsToValues
+from BinaryRecording import BinaryRecording, isBinaryRecording, BINARY_RECORDING_EXTENSION
+from FilterBank import FilterBank
+from FlexCalibration import FlexCalibration
+from RightHand import RightHand, FINGERS
+from LeftHand import LeftHand
+from Orientation import IMUS, WRIST, ACC_INDEX, GYRO_INDEX, quatToEulerDegrees
+from ForwardKinematics import fingertipPositions, RIGHT_HAND_BASES, LEFT_HAND_BASES
+
+# Headless batch processing of recordings: the live display's filter -> flex-to-angle -> wrist
+# orientation pipeline, run over whole files at once and fanned out across processes.
+#
+#   python BatchProcess.py sessions/ more/GloveData.csv [--output-dir processed] [--workers 8]
+#
+# Each input gets a <name>_processed.csv next to it (or in --output-dir) with the joint angles, IMU
+# orientations and fingertip positions (hand frame, see ForwardKinematics.py) for every sample.
+# Dual-glove recordings are split by hand, each glove filtered and fused on its own, and the output
+# keeps the recording's row order with a Hand column. Directories are searched for .csv and .glove recordings.
+
+PROCESSED_SUFFIX = "_processed.csv"
+
+PROCESSED_HEADER = ["Timestamp", "Hand",
+                    "Thumb J1 (deg)", "Pointer J1 (deg)", "Middle J1 (deg)", "Ring J1 (deg)", "Pinky J1 (deg)",
+                    "Pointer J2 (deg)", "Middle J2 (deg)", "Ring J2 (deg)", "Pinky J2 (deg)",
+                    "Wrist X (deg)", "Wrist Y (deg)", "Wrist Z (deg)"] + \
+                   [f"{imu.capitalize()} q{axis}" for imu in IMUS for axis in "WXYZ"] + \
+                   [f"{finger.capitalize()} tip {axis} (in)" for finger in FINGERS for axis in "XYZ"]
+
+
+# loadRecording(path)
+# Whole recording as (timestamps, values, hands): values is (N, 41) float with NaN for unreadable fields
+def loadRecording(path):
+    if isBinaryRecording(path):
+        recording = BinaryRecording(path)
+        return (np.array(recording.timestamps, dtype=float), np.array(recording.channels, dtype=float),
+                np.array(recording.hands).view('S1').astype('U1'))
+
+    with open(path, newline='') as csvFile:
+        reader = csv.reader(csvFile)
+        next(reader)  # header
+        rows = [row for row in reader if row]
+
+    timestamps = np.array([row[0] for row in rows], dtype=float)
+    hands = np.array([row[NUM_CHANNELS + 1] if len(row) > NUM_CHANNELS + 1 else 'R' for row in rows], dtype='U1')
+    try:
+        values = np.array([row[1:NUM_CHANNELS + 1] for row in rows], dtype=float)
+    except ValueError:
+        # Some fields are unreadable ('E' from a failed IMU read): convert row by row
+        values = np.empty((len(rows), NUM_CHANNELS))
+        for i, row in enumerate(rows):
+            fieldsToValues(row[1:], values[i])
+    return timestamps, values, hands
+
+
+# estimateSampleRate(timestamps)
+# Sample rate from the median interval between timestamps, as the live display would settle on
+def estimateSampleRate(timestamps, default=10):
+    intervals = np.diff(timestamps)
+    intervals = intervals[intervals > 0]
+    if len(intervals) == 0:
+        return default
+    return 1.0 / float(np.median(intervals))
+
+
+# handModel(hand)
+# (hand state class, fingertip base positions) of the glove on hand 'R' or 'L'
+def handModel(hand):
+    return (LeftHand, LEFT_HAND_BASES) if hand == 'L' else (RightHand, RIGHT_HAND_BASES)
+
+
+# processValues(values, timestamps, sampleRate, cutoff_freq, calibration, hands)
+# The display pipeline over a whole block: filtered channels, J1 (5) and J2 (4) angles, and the (N, 6, 4)
+# quaternions of every IMU (IMUS order) after each sample, starting from identity. With hands, the rows of each
+# hand are processed on their own (own filter and fusion state, sampleRate a rate or {hand: rate}) and the
+# results returned in the original row order
+def processValues(values, timestamps, sampleRate, cutoff_freq=5, calibration=None, hands=None):
+    calibration = calibration or FlexCalibration.load()
+    if hands is None:
+        return processHand(values, timestamps, sampleRate, cutoff_freq, calibration)
+
+    outputs = (np.empty(values.shape), np.empty((len(values), 5)), np.empty((len(values), 4)),
+               np.empty((len(values), len(IMUS), 4)))
+    for hand in np.unique(hands):
+        rows = hands == hand
+        rate = sampleRate[hand] if isinstance(sampleRate, dict) else sampleRate
+        results = processHand(values[rows], timestamps[rows], rate, cutoff_freq, calibration, handModel(hand)[0])
+        for output, result in zip(outputs, results):
+            output[rows] = result
+    return outputs
+
+
+# processHand(values, timestamps, sampleRate, cutoff_freq, calibration, handClass)
+# processValues for the rows of one glove
+def processHand(values, timestamps, sampleRate, cutoff_freq, calibration, handClass=RightHand):
+    values = values.copy()
+
+    # Wrist Gyro X, Y, Z (dps -> rad/s) so filtered output is always rad/s
+    values[:, 38:41] *= math.pi / 180.0
+    filtered = FilterBank(NUM_CHANNELS, cutoff_freq, sampleRate, order=2).updateBlock(values)
+
+    # Same joint split as updateDisplay: thumb is all J1, fingers 75% J1 / 25% J2
+    flexAngles = calibration.angles(filtered[:, :5])
+    j1Angles = flexAngles.copy()
+    j1Angles[:, 1:] *= 0.75
+    j2Angles = flexAngles[:, 1:] * 0.25
+
+    # Accelerometer/gyro fusion of every IMU over the measured intervals, as in processFrames
+    hand = handClass()
+    hand.updateSampleRate(sampleRate)
+    dts = np.diff(timestamps, prepend=timestamps[:1])
+    orientation = np.empty((len(values), len(IMUS), 4))
+    hand.updateImuOrientations(filtered[:, GYRO_INDEX], dts, filtered[:, ACC_INDEX], orientation)
+    return filtered, j1Angles, j2Angles, orientation
+
+
+# processedPath(inputPath, outputDir)
+def processedPath(inputPath, outputDir=None):
+    base = os.path.splitext(os.path.basename(inputPath))[0] + PROCESSED_SUFFIX
+    return os.path.join(outputDir or os.path.dirname(os.path.abspath(inputPath)), base)
+
+
+# processRecording(inputPath, outputPath, cutoff_freq, sampleRate)
+# Process one recording and write its derived columns. Runs in a worker process
+def processRecording(inputPath, outputPath, cutoff_freq=5, sampleRate=None):
+    start = time.perf_counter()
+    timestamps, values, hands = loadRecording(inputPath)
+    # Each glove of a dual-glove recording runs at its own rate
+    rates = {hand: sampleRate or estimateSampleRate(timestamps[hands == hand]) for hand in np.unique(hands)}
+    _, j1Angles, j2Angles, orientation = processValues(values, timestamps, rates, cutoff_freq, hands=hands)
+
+    jointAngles = np.zeros((len(j1Angles), len(FINGERS), 2))
+    jointAngles[:, :, 0] = j1Angles
+    jointAngles[:, 1:, 1] = j2Angles
+    tips = np.empty((len(jointAngles), len(FINGERS), 3))
+    for hand in rates:
+        rows = hands == hand
+        handClass, bases = handModel(hand)
+        tips[rows] = fingertipPositions(jointAngles[rows], handClass.SEGMENT_LENGTHS, bases)
+
+    table = np.column_stack((timestamps, j1Angles, j2Angles, quatToEulerDegrees(orientation[:, WRIST]),
+                             orientation.reshape(len(orientation), -1), tips.reshape(len(tips), -1))).astype(object)
+    table = np.insert(table, 1, hands, axis=1)
+    np.savetxt(outputPath, table,
+               fmt=['%.3f', '%s'] + ['%.2f'] * 12 + ['%.6f'] * (4 * len(IMUS)) + ['%.3f'] * (3 * len(FINGERS)),
+               delimiter=',', header=','.join(PROCESSED_HEADER), comments='')
+
+    duration = float(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else 0.0
+    return {"input": inputPath, "output": outputPath, "rows": len(timestamps), "sampleRates": rates,
+            "recordedSeconds": duration, "processSeconds": time.perf_counter() - start}
+
+
+# findRecordings(paths)
+# Expand directories into the .csv and .glove recordings they contain, skipping earlier outputs
+def findRecordings(paths):
+    recordings = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ("*.csv", "*" + BINARY_RECORDING_EXTENSION):
+                recordings.extend(sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)))
+        else:
+            recordings.append(path)
+    return [path for path in recordings if not path.endswith(PROCESSED_SUFFIX)]
+
+
+# processAll(paths, outputDir, workers, cutoff_freq, sampleRate)
+# Fan recordings out across a process pool; returns the per-file results in completion order
+def processAll(paths, outputDir=None, workers=None, cutoff_freq=5, sampleRate=None):
+    if outputDir:
+        os.makedirs(outputDir, exist_ok=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(processRecording, path, processedPath(path, outputDir), cutoff_freq, sampleRate): path
+                   for path in findRecordings(paths)}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"{futures[future]}: failed: {e}")
+                continue
+            results.append(result)
+            rates = ", ".join(f"{hand} {rate:.1f} Hz" for hand, rate in result['sampleRates'].items())
+            print(f"{result['input']}: {result['rows']} rows at {rates} "
+                  f"in {result['processSeconds']:.2f}s -> {result['output']}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Filter glove recordings and compute joint angles and wrist orientation")
+    parser.add_argument("paths", nargs="+", help="recordings (.csv or .glove) or directories containing them")
+    parser.add_argument("--output-dir", help="write outputs here instead of next to each recording")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cutoff", type=float, default=5, help="low-pass cutoff frequency in Hz")
+    parser.add_argument("--sample-rate", type=float,
+                        help="sample rate in Hz (default: estimated from each recording's timestamps)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = processAll(args.paths, args.output_dir, args.workers, args.cutoff, args.sample_rate)
+    elapsed = time.perf_counter() - start
+
+    rows = sum(r["rows"] for r in results)
+    recorded = sum(r["recordedSeconds"] for r in results)
+    print(f"Processed {len(results)} recordings, {rows} rows in {elapsed:.2f}s "
+          f"({rows / elapsed:.0f} rows/s, {recorded / elapsed:.0f}x real time)")
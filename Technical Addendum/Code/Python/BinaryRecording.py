@@ -0,0 +1,281 @@
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import numpy as np
+from GloveProtocol import CSV_HEADER, NUM_CHANNELS, fieldsToValues
+from RecordingSink import CsvRecordingSink
+
+# A columnar recording is a small JSON sidecar (the file the user names, e.g. GloveData.glove)
+# next to one raw little-endian file per column group:
+#   <base>.timestamp.f8   float64 host timestamps (s)
+#   <base>.channels.f4    float32, NUM_CHANNELS per row, same order as the CSV columns (NaN = unreadable)
+#   <base>.hand.u1        uint8 ASCII hand code ('R' / 'L')
+# Every file is a plain array, so readers open them with numpy.memmap and load any row range without parsing.
+BINARY_RECORDING_EXTENSION = '.glove'
+FORMAT_NAME = 'glove-columnar'
+FORMAT_VERSION = 1
+
+TIMESTAMP_DTYPE = np.dtype('<f8')
+CHANNEL_DTYPE = np.dtype('<f4')
+HAND_DTYPE = np.dtype('u1')
+
+
+def isBinaryRecording(fileName):
+    return fileName.lower().endswith(BINARY_RECORDING_EXTENSION)
+
+
+def columnPaths(sidecarPath):
+    base = os.path.splitext(sidecarPath)[0]
+    return {"timestamp": base + ".timestamp.f8", "channels": base + ".channels.f4", "hand": base + ".hand.u1"}
+
+
+class BinaryRecordingSink:
+    """
+    Records frames to the columnar binary format from a dedicated writer thread.
+
+    Has the same interface as CsvRecordingSink (writeRow, writeValues, stats, close).
+    Rows are packed into preallocated column blocks; full blocks go to the writer
+    thread over a bounded queue and are appended to the column files with tofile.
+    Write errors and repeated or concurrent close() calls are handled as in CsvRecordingSink.
+    """
+
+    def __init__(self, sidecarPath, header=CSV_HEADER, blockRows=1024, maxQueuedBlocks=16, blockOnFull=True):
+        self.sidecarPath = sidecarPath
+        self.header = list(header)
+        self.paths = columnPaths(sidecarPath)
+        self.blockRows = blockRows
+        self.blockOnFull = blockOnFull
+
+        self.files = {name: open(path, 'wb') for name, path in self.paths.items()}
+        self.writeSidecar(0)
+
+        self.queue = queue.Queue(maxsize=maxQueuedBlocks)
+        self.closeLock = threading.Lock()
+        self.closed = False
+        self.writeError = None  # exception that stopped the writer, if any
+        self.newBlock()
+
+        # Counters, updated from both the caller's and the writer's thread under countersLock
+        self.countersLock = threading.Lock()
+        self.rowsQueued = 0
+        self.rowsWritten = 0
+        self.rowsDropped = 0
+        self.rowsBackpressured = 0
+
+        self.writerThread = threading.Thread(target=self.writerLoop, daemon=True)
+        self.writerThread.start()
+
+    def newBlock(self):
+        self.timestamps = np.empty(self.blockRows, dtype=TIMESTAMP_DTYPE)
+        self.channels = np.empty((self.blockRows, NUM_CHANNELS), dtype=CHANNEL_DTYPE)
+        self.hands = np.empty(self.blockRows, dtype=HAND_DTYPE)
+        self.rowsInBlock = 0
+
+    @property
+    def queueDepth(self):
+        return self.queue.qsize()
+
+    def writeRow(self, row):
+        # row: [timestamp, 41 channel fields, hand] as written to the CSV
+        i = self.rowsInBlock
+        self.timestamps[i] = row[0]
+        fieldsToValues(row[1:], self.channels[i])
+        self.hands[i] = ord(row[NUM_CHANNELS + 1][:1] or '0') if len(row) > NUM_CHANNELS + 1 else ord('0')
+        self.advance()
+
+    def writeValues(self, timestamp, values, hand):
+        i = self.rowsInBlock
+        self.timestamps[i] = timestamp
+        self.channels[i] = values[:NUM_CHANNELS]
+        self.hands[i] = ord(hand)
+        self.advance()
+
+    def advance(self):
+        self.rowsInBlock += 1
+        if self.rowsInBlock == self.blockRows:
+            self.flushBlock()
+
+    def flushBlock(self):
+        count = self.rowsInBlock
+        if not count:
+            return
+        block = (self.timestamps[:count], self.channels[:count], self.hands[:count])
+        self.newBlock()
+        if self.closed or self.writeError is not None:
+            with self.countersLock:
+                self.rowsDropped += count
+            return
+        try:
+            self.queue.put_nowait(block)
+        except queue.Full:
+            if self.blockOnFull:
+                with self.countersLock:
+                    self.rowsBackpressured += count
+                self.queue.put(block)
+            else:
+                with self.countersLock:
+                    self.rowsDropped += count
+                return
+        with self.countersLock:
+            self.rowsQueued += count
+
+    def writerLoop(self):
+        while True:
+            block = self.queue.get()
+            if block is None:
+                break
+            timestamps, channels, hands = block
+            if self.writeError is not None:
+                with self.countersLock:
+                    self.rowsDropped += len(timestamps)
+                continue
+            try:
+                timestamps.tofile(self.files["timestamp"])
+                channels.tofile(self.files["channels"])
+                hands.tofile(self.files["hand"])
+            except (OSError, ValueError) as e:
+                print(f"Error writing {self.sidecarPath}: {e}")
+                self.writeError = e
+                with self.countersLock:
+                    self.rowsDropped += len(timestamps)
+                continue
+            with self.countersLock:
+                self.rowsWritten += len(timestamps)
+
+    def writeSidecar(self, rows):
+        sidecar = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "rows": rows,
+            "header": self.header,
+            "files": {name: os.path.basename(path) for name, path in self.paths.items()},
+            "dtypes": {"timestamp": TIMESTAMP_DTYPE.str, "channels": CHANNEL_DTYPE.str, "hand": HAND_DTYPE.str},
+            "numChannels": NUM_CHANNELS,
+            # decimal places of each channel when converting back to CSV (binaryToCsv; flex readings are integers)
+            "decimals": [0] * 5 + [2] * (NUM_CHANNELS - 5),
+        }
+        with open(self.sidecarPath, 'w') as sidecarFile:
+            json.dump(sidecar, sidecarFile, indent=2)
+
+    def stats(self):
+        with self.countersLock:
+            return {"queueDepth": self.queueDepth, "rowsQueued": self.rowsQueued, "rowsWritten": self.rowsWritten,
+                    "rowsDropped": self.rowsDropped, "rowsBackpressured": self.rowsBackpressured,
+                    "writeError": None if self.writeError is None else str(self.writeError)}
+
+    def close(self):
+        with self.closeLock:
+            if self.closed:
+                return
+            self.flushBlock()
+            self.closed = True
+            self.queue.put(None)
+            self.writerThread.join()
+            while not self.queue.empty():
+                block = self.queue.get_nowait()
+                if block is not None:
+                    with self.countersLock:
+                        self.rowsDropped += len(block[0])
+            for f in self.files.values():
+                f.close()
+            # The sidecar's row count is what reached the column files, so a failed write still leaves a readable file
+            self.writeSidecar(self.rowsWritten)
+
+
+class BinaryRecording:
+    """
+    Read-only, memory-mapped view of a columnar recording.
+
+    Nothing is parsed or loaded up front; slicing timestamps/channels/hands only
+    touches the pages that are read.
+    """
+
+    def __init__(self, sidecarPath):
+        with open(sidecarPath) as sidecarFile:
+            self.sidecar = json.load(sidecarFile)
+        if self.sidecar.get("format") != FORMAT_NAME:
+            raise ValueError(f"{sidecarPath} is not a {FORMAT_NAME} recording")
+
+        directory = os.path.dirname(os.path.abspath(sidecarPath))
+        paths = {name: os.path.join(directory, fileName) for name, fileName in self.sidecar["files"].items()}
+        dtypes = {name: np.dtype(dtype) for name, dtype in self.sidecar["dtypes"].items()}
+        numChannels = self.sidecar["numChannels"]
+
+        # Row count comes from the file sizes, so a recording cut short by a crash is still readable
+        rows = min(os.path.getsize(paths["timestamp"]) // dtypes["timestamp"].itemsize,
+                   os.path.getsize(paths["channels"]) // (dtypes["channels"].itemsize * numChannels),
+                   os.path.getsize(paths["hand"]) // dtypes["hand"].itemsize)
+        self.rows = rows
+        self.header = self.sidecar["header"]
+        self.decimals = self.sidecar["decimals"]
+        self.timestamps = self.openColumn(paths["timestamp"], dtypes["timestamp"], (rows,))
+        self.channels = self.openColumn(paths["channels"], dtypes["channels"], (rows, numChannels))
+        self.hands = self.openColumn(paths["hand"], dtypes["hand"], (rows,))
+
+    @staticmethod
+    def openColumn(path, dtype, shape):
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+    def __len__(self):
+        return self.rows
+
+    def rowRange(self, startTime, endTime):
+        # Row slice covering startTime <= timestamp < endTime (timestamps are increasing)
+        start = int(np.searchsorted(self.timestamps, startTime, side='left'))
+        end = int(np.searchsorted(self.timestamps, endTime, side='left'))
+        return slice(start, end)
+
+    def timeRange(self, startTime, endTime):
+        """
+        Returns:
+            (timestamps, channels, hands) memmap views of the rows in [startTime, endTime)
+        """
+        rows = self.rowRange(startTime, endTime)
+        return self.timestamps[rows], self.channels[rows], self.hands[rows]
+
+
+# csvToBinary(csvPath, sidecarPath)
+# Convert a GloveData.csv style recording to the columnar format
+def csvToBinary(csvPath, sidecarPath):
+    with open(csvPath, newline='') as csvFile:
+        reader = csv.reader(csvFile)
+        header = next(reader)
+        sink = BinaryRecordingSink(sidecarPath, header)
+        for row in reader:
+            if row:
+                row[0] = float(row[0])
+                sink.writeRow(row)
+        sink.close()
+    return sink.rowsWritten
+
+
+# binaryToCsv(sidecarPath, csvPath)
+# Convert a columnar recording back to the GloveData.csv layout, each channel printed to the sidecar's decimal places
+def binaryToCsv(sidecarPath, csvPath):
+    recording = BinaryRecording(sidecarPath)
+    sink = CsvRecordingSink(csvPath, recording.header)
+    formats = ['%d' if places == 0 else '%%.%df' % places for places in recording.decimals]
+    channels = recording.channels
+    for i in range(len(recording)):
+        fields = [form % v if v == v else 'E' for form, v in zip(formats, channels[i].astype(float).tolist())]
+        sink.writeRow([float(recording.timestamps[i])] + fields + [chr(recording.hands[i])])
+    sink.close()
+    return sink.rowsWritten
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert glove recordings between CSV and the columnar binary format")
+    parser.add_argument("source", help="GloveData.csv or recording" + BINARY_RECORDING_EXTENSION)
+    parser.add_argument("destination", help="output file; the conversion direction follows the source type")
+    args = parser.parse_args()
+
+    if isBinaryRecording(args.source):
+        count = binaryToCsv(args.source, args.destination)
+    else:
+        count = csvToBinary(args.source, args.destination)
+    print(f"Converted {count} rows to {args.destination}")
@@ -0,0 +1,122 @@
+import math
+from functools import lru_cache
+import numpy as np
+from scipy import signal
+
+RATE_BUCKET_STEP = 0.05  # relative width of a sample-rate bucket; rates within one bucket share a design
+
+
+# designLowPass(cutoff_freq, sample_rate, order)
+# Butterworth low-pass design shared by LowPassFilter and FilterBank, including the
+# same guards against bad sample rates and cutoffs at or above Nyquist
+def designLowPass(cutoff_freq=5, sample_rate=100, order=2):
+    if sample_rate < 1:
+        sample_rate = 100
+    nyquist = sample_rate / 2
+    if cutoff_freq >= nyquist:
+        cutoff_freq = nyquist * 0.9
+    normal_cutoff = cutoff_freq / nyquist
+    if not (0 < normal_cutoff < 1):
+        normal_cutoff = 0.1
+    return signal.butter(order, normal_cutoff, btype='low')
+
+
+# rateBucket(sample_rate)
+# The bucket a sample rate falls in: buckets are RATE_BUCKET_STEP wide on a log scale, so one bucket is
+# 5% wide at 10 Hz as at 5 kHz. Returns (bucket index, the bucket's centre rate in Hz)
+def rateBucket(sample_rate):
+    index = round(math.log(max(sample_rate, 1.0)) / math.log1p(RATE_BUCKET_STEP))
+    return index, math.exp(index * math.log1p(RATE_BUCKET_STEP))
+
+
+# cachedLowPass(cutoff_freq, bucket, order)
+# designLowPass at a rate bucket's centre rate, with the design's unit-step steady state (lfilter_zi).
+# Each bucket is designed once; later retunes to it are a dictionary lookup
+@lru_cache(maxsize=256)
+def cachedLowPass(cutoff_freq, bucket, order):
+    b, a = designLowPass(cutoff_freq, math.exp(bucket * math.log1p(RATE_BUCKET_STEP)), order)
+    b.flags.writeable = False
+    a.flags.writeable = False
+    zi = signal.lfilter_zi(b, a)
+    zi.flags.writeable = False
+    return b, a, zi
+
+
+class FilterBank:
+    """
+    Low-pass filters a whole frame of channels in one vectorized lfilter call.
+
+    Every channel uses the same Butterworth design and starts from the same initial
+    state as a standalone LowPassFilter, so the output matches running one
+    LowPassFilter per channel. Channel states live in one (order, channels) array.
+
+    setSampleRate retunes the bank to a new sample rate without resetting it: the
+    coefficients are swapped and the state carried over, so the output continues
+    from where it was instead of restarting from the initial step.
+    """
+
+    def __init__(self, num_channels, cutoff_freq=5, sample_rate=100, order=2):
+        self.num_channels = num_channels
+        self.cutoff_freq = cutoff_freq
+        self.order = order
+        self.sample_rate = sample_rate
+        self.b, self.a = designLowPass(cutoff_freq, sample_rate, order)
+        self.steady_zi = signal.lfilter_zi(self.b, self.a)
+        self.zi = np.repeat(self.steady_zi[:, np.newaxis], num_channels, axis=1)
+
+    def setSampleRate(self, sample_rate):
+        """
+        Retune to a new sample rate, keeping every channel's state.
+
+        The design comes from the rate bucket's cache (cachedLowPass), so only the first
+        retune to a bucket designs a filter. Each channel's state is rescaled from the old
+        design's steady state to the new one's: a channel settled at a level stays settled
+        at that level, so the swap causes no step or ringing in the output.
+
+        Args:
+            sample_rate: new sample rate in Hz
+        """
+        bucket, self.sample_rate = rateBucket(sample_rate)
+        b, a, steady_zi = cachedLowPass(self.cutoff_freq, bucket, self.order)
+        # Level each channel's state corresponds to, from the first state row (never zero for a low-pass)
+        level = self.zi[0] / self.steady_zi[0]
+        self.zi = np.outer(steady_zi, level)
+        self.b, self.a, self.steady_zi = b, a, steady_zi
+
+    def update(self, frame):
+        """
+        Filter a single frame.
+
+        Args:
+            frame: sequence of num_channels floats. NaN marks an unreadable value; that
+                   channel's state is left untouched and NaN is returned in its place.
+        Returns:
+            ndarray of num_channels filtered values
+        """
+        return self.updateBlock(np.asarray(frame, dtype=float).reshape(1, self.num_channels))[0]
+
+    def updateBlock(self, frames):
+        """
+        Filter a block of frames, oldest first.
+
+        Args:
+            frames: (N, num_channels) array. NaN marks an unreadable value.
+        Returns:
+            (N, num_channels) ndarray of filtered values
+        """
+        frames = np.asarray(frames, dtype=float)
+        invalid = np.isnan(frames)
+        if not invalid.any():
+            filtered, self.zi = signal.lfilter(self.b, self.a, frames, axis=0, zi=self.zi)
+            return filtered
+
+        # Unreadable samples are skipped per channel, exactly as LowPassFilter.update
+        # skips values it cannot convert to float
+        if frames.shape[0] == 1:
+            valid = ~invalid[0]
+            filtered = np.full(frames.shape, np.nan)
+            filtered[:, valid], self.zi[:, valid] = signal.lfilter(
+                self.b, self.a, frames[:, valid], axis=0, zi=self.zi[:, valid])
+            return filtered
+
+        return np.vstack([self.update(frame) for frame in frames])
@@ -0,0 +1,65 @@
+import json
+import os
+import numpy as np
+
+# Flex channels in frame order (channels 0-4)
+FINGERS = ('thumb', 'pointer', 'middle', 'ring', 'pinky')
+
+# Flex readings are 8-bit ADC values
+FLEX_LEVELS = 256
+
+DEFAULT_CALIBRATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FlexCalibration.json")
+
+
+class FlexCalibration:
+    """
+    Flex reading to joint angle (deg) conversion by table lookup.
+
+    Each finger's fitted polynomial is evaluated once at every reading 0-255 into a
+    (5, 256) table. Integer readings index the table directly; filtered (non-integer)
+    readings interpolate linearly between neighbouring entries, and readings outside
+    0-255 are clamped to the ends. NaN readings convert to NaN.
+
+    Args:
+        coefficients: dict of finger name -> polynomial coefficients, highest degree first
+    """
+
+    def __init__(self, coefficients):
+        levels = np.arange(FLEX_LEVELS, dtype=float)
+        self.coefficients = {finger: list(coefficients[finger]) for finger in FINGERS}
+        self.tables = np.array([np.polyval(self.coefficients[finger], levels) for finger in FINGERS])
+        # Slope from each entry to the next, for interpolation (last entry repeats the previous slope)
+        self.slopes = np.diff(self.tables, axis=1, append=2 * self.tables[:, -1:] - self.tables[:, -2:-1])
+
+    @classmethod
+    def load(cls, path=DEFAULT_CALIBRATION):
+        with open(path) as calibrationFile:
+            calibration = json.load(calibrationFile)
+        return cls(calibration["fingers"])
+
+    def save(self, path):
+        with open(path, 'w') as calibrationFile:
+            json.dump({"format": "flex-calibration", "version": 1, "fingers": self.coefficients},
+                      calibrationFile, indent=2)
+
+    def angles(self, flex):
+        """
+        Convert flex readings to joint angles.
+
+        Args:
+            flex: array of shape (..., 5), one reading per finger in FINGERS order
+                  (a single frame's flex channels, or a whole recording's)
+
+        Returns:
+            float array of the same shape, angles in degrees
+        """
+        flex = np.asarray(flex, dtype=float)
+        position = np.clip(flex, 0, FLEX_LEVELS - 1)
+        unreadable = np.isnan(position)
+        position[unreadable] = 0
+
+        index = position.astype(np.intp)
+        finger = np.arange(len(FINGERS))
+        result = self.tables[finger, index] + (position - index) * self.slopes[finger, index]
+        result[unreadable] = np.nan
+        return result
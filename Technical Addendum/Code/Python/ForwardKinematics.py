@@ -0,0 +1,78 @@
+import numpy as np
+from RightHand import FINGERS, RIGHT_HAND_SEGMENTS, JOINTS, HAND_STATE_SIZE
+from Orientation import quatRotate
+
+# Forward kinematics of the hand model: joint angles -> 3D joint and fingertip positions, for whole
+# batches of frames in one call.
+#
+# Hand frame (inches, origin at the palm center):
+#   +x across the palm from thumb side to pinky side, +y along the straight fingers, +z out of the back of the hand.
+# Segment 1 of each finger leaves its base along +y; J1 and J2 curl the following segments toward the palm
+# (rotation about -x), as the animation window bends them.
+
+# Finger base (knuckle) positions in the hand frame, matching the animation window layout
+# (fingers 1 in apart across the front of the palm, thumb set back on the -x side)
+RIGHT_HAND_BASES = ((-2.5, -0.5, 0.0),
+                    (-1.0, 2.0, 0.0),
+                    (0.0, 2.0, 0.0),
+                    (1.0, 2.0, 0.0),
+                    (2.0, 2.0, 0.0))
+
+# The left hand is the mirror image: thumb on the +x side, pinky on the -x side
+LEFT_HAND_BASES = tuple((-x, y, z) for x, y, z in RIGHT_HAND_BASES)
+
+# Points per finger in the output, base to tip. The thumb has no third segment, so its J2 and tip coincide
+POINTS = ('base', 'J1', 'J2', 'tip')
+TIP = POINTS.index('tip')
+
+
+# jointAnglesFromStates(states)
+# (N, 5, 2) J1/J2 angles from (N, HAND_STATE_SIZE) RightHand state snapshots (e.g. HandHistory.states)
+def jointAnglesFromStates(states):
+    states = np.asarray(states, dtype=float).reshape(-1, HAND_STATE_SIZE)
+    return states[:, JOINTS].reshape(-1, len(FINGERS), 2)
+
+
+# fingerPositions(jointAngles, segmentLengths, bases, orientation)
+def fingerPositions(jointAngles, segmentLengths=RIGHT_HAND_SEGMENTS, bases=RIGHT_HAND_BASES, orientation=None):
+    """
+    Joint and fingertip positions for every frame.
+
+    Args:
+        jointAngles: (N, 5, 2) or (N, 10) J1, J2 angles in degrees per finger, thumb to pinky
+                     (the RightHand.jointAngles layout; the thumb's J2 is ignored)
+        segmentLengths: (5, 3) segment lengths in inches, base to tip
+        bases: (5, 3) finger base positions in the hand frame
+        orientation: optional (N, 4) wrist quaternions (w, x, y, z); positions are then rotated out of
+                     the hand frame, taking the hand frame to be the wrist IMU's frame
+
+    Returns:
+        (N, 5, 4, 3) positions of each finger's base, J1, J2 and tip (POINTS order)
+    """
+    angles = np.radians(np.asarray(jointAngles, dtype=float).reshape(-1, len(FINGERS), 2))
+    lengths = np.asarray(segmentLengths, dtype=float)
+
+    # Pitch of each segment below the finger's base direction: 0, J1, J1 + J2 (the thumb's third segment has no length)
+    pitch = np.zeros(angles.shape[:2] + (3,))
+    pitch[:, :, 1] = angles[:, :, 0]
+    pitch[:, :, 2] = angles[:, :, 0] + angles[:, :, 1]
+
+    # Segment vectors in the finger's plane, then cumulative sums from the base give every joint
+    segments = np.zeros(pitch.shape + (3,))
+    segments[..., 1] = lengths * np.cos(pitch)
+    segments[..., 2] = -lengths * np.sin(pitch)
+
+    positions = np.empty(angles.shape[:2] + (len(POINTS), 3))
+    positions[:, :, 0] = bases
+    positions[:, :, 1:] = np.asarray(bases, dtype=float)[:, np.newaxis] + np.cumsum(segments, axis=2)
+
+    if orientation is not None:
+        q = np.asarray(orientation, dtype=float).reshape(-1, 1, 1, 4)
+        positions = quatRotate(q, positions)
+    return positions
+
+
+# fingertipPositions(jointAngles, ...)
+# (N, 5, 3) fingertip positions only, same arguments as fingerPositions
+def fingertipPositions(jointAngles, segmentLengths=RIGHT_HAND_SEGMENTS, bases=RIGHT_HAND_BASES, orientation=None):
+    return fingerPositions(jointAngles, segmentLengths, bases, orientation)[:, :, TIP]
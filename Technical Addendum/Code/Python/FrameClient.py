@@ -0,0 +1,134 @@
+import argparse
+import base64
+import os
+import socket
+import struct
+import time
+from FrameServer import (DEFAULT_STREAM_PORT, SOCKET_BUFFER_BYTES, OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG,
+                         decodeStreamRecord, websocketAccept)
+
+# Reference client for FrameServer: connects to the WebSocket stream and yields decoded frames.
+# Plain blocking sockets, no dependencies beyond numpy, so it can be copied into other tools.
+#
+#   client = FrameClient()
+#   for sequence, timestamp, hand, deviceSequence, deviceTime, values in client.frames():
+#       ...
+
+
+class FrameClient:
+    """
+    Blocking WebSocket client for the glove frame stream.
+
+    Args:
+        host, port: FrameServer address
+        timeout: seconds a connect or read may take before socket.timeout is raised (None waits forever)
+    """
+
+    def __init__(self, host='localhost', port=DEFAULT_STREAM_PORT, timeout=5.0):
+        self.socket = socket.create_connection((host, port), timeout)
+        # Keep the backlog of a slow reader small; the server drops its oldest frames instead
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+        self.buffer = bytearray()
+        self.framesReceived = 0
+        self.framesMissed = 0  # gaps in the server's sequence numbers (dropped for this client)
+        self.lastSequence = None
+
+        key = base64.b64encode(os.urandom(16))
+        self.socket.sendall(b"GET / HTTP/1.1\r\nHost: %s:%d\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                            b"Sec-WebSocket-Key: %s\r\nSec-WebSocket-Version: 13\r\n\r\n" % (host.encode(), port, key))
+        response = self.readUntil(b'\r\n\r\n')
+        if not response.startswith(b"HTTP/1.1 101") or websocketAccept(key).encode() not in response:
+            raise ConnectionError(f"WebSocket handshake failed: {response[:80]!r}")
+
+    def readUntil(self, marker):
+        while marker not in self.buffer:
+            self.receive()
+        end = self.buffer.index(marker) + len(marker)
+        data = bytes(self.buffer[:end])
+        del self.buffer[:end]
+        return data
+
+    def readExactly(self, count):
+        while len(self.buffer) < count:
+            self.receive()
+        data = bytes(self.buffer[:count])
+        del self.buffer[:count]
+        return data
+
+    def receive(self):
+        data = self.socket.recv(65536)
+        if not data:
+            raise ConnectionError("Stream closed by server")
+        self.buffer += data
+
+    def sendFrame(self, opcode, payload=b''):
+        # Client frames must be masked
+        mask = os.urandom(4)
+        self.socket.sendall(struct.pack('!BB', 0x80 | opcode, 0x80 | len(payload)) + mask +
+                            bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+
+    def readMessage(self):
+        # (opcode, payload) of the next server message
+        first, second = self.readExactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self.readExactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self.readExactly(8))[0]
+        return first & 0x0F, self.readExactly(length)
+
+    def frames(self):
+        """
+        Yield every frame until the server closes the stream.
+
+        Yields:
+            (sequence, timestamp, hand, deviceSequence, deviceTime, values), values a float array of the 41 channels
+        """
+        while True:
+            try:
+                opcode, payload = self.readMessage()
+            except ConnectionError:
+                return
+            if opcode == OPCODE_BINARY:
+                record = decodeStreamRecord(payload)
+                if self.lastSequence is not None and record[0] > self.lastSequence + 1:
+                    self.framesMissed += record[0] - self.lastSequence - 1
+                self.lastSequence = record[0]
+                self.framesReceived += 1
+                yield record
+            elif opcode == OPCODE_PING:
+                self.sendFrame(OPCODE_PONG, payload)
+            elif opcode == OPCODE_CLOSE:
+                return
+
+    def close(self):
+        try:
+            self.sendFrame(OPCODE_CLOSE, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        self.socket.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Print the live glove frame stream")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=DEFAULT_STREAM_PORT)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to sleep per frame, to act as a slow client")
+    args = parser.parse_args()
+
+    client = FrameClient(args.host, args.port, timeout=None)
+    lastReport = time.perf_counter()
+    try:
+        for sequence, timestamp, hand, deviceSequence, deviceTime, values in client.frames():
+            now = time.perf_counter()
+            if now - lastReport >= 1.0:
+                lastReport = now
+                print(f"#{sequence} t={timestamp:.3f}s hand={hand} flex={values[:5].tolist()} "
+                      f"received={client.framesReceived} missed={client.framesMissed}")
+            if args.delay:
+                time.sleep(args.delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    print(f"Received {client.framesReceived} frames, missed {client.framesMissed}")
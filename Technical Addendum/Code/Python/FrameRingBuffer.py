@@ -0,0 +1,72 @@
+from collections import namedtuple
+import numpy as np
+
+# One drained block of frames, one row per frame, oldest first. sequence and deviceTime come from
+# the binary frame header (-1 / NaN for text frames), receivedAt is the host perf_counter receive time
+FrameBlock = namedtuple('FrameBlock', 'values timestamps hands sequences deviceTimes receivedAt')
+
+
+class FrameRingBuffer:
+    """
+    Preallocated single-producer / single-consumer ring of parsed frames.
+
+    The acquisition thread pushes frames, the GUI thread drains them. No lock is taken:
+    the producer fills a slot completely before advancing writeIndex, and the consumer
+    checks writeIndex again after copying so it can discard any slot the producer
+    overwrote while it was being read. If the consumer falls more than a full ring
+    behind, the oldest frames are dropped and counted in overruns.
+    """
+
+    def __init__(self, capacity=4096, num_channels=41):
+        self.capacity = capacity
+        self.values = np.zeros((capacity, num_channels))
+        self.timestamps = np.zeros(capacity)
+        self.hands = np.full(capacity, 'R', dtype='U1')
+        self.sequences = np.full(capacity, -1, dtype=np.int64)
+        self.deviceTimes = np.full(capacity, np.nan)
+        self.receivedAt = np.zeros(capacity)
+
+        # Total frames written / read since creation; slot = index % capacity
+        self.writeIndex = 0
+        self.readIndex = 0
+        self.overruns = 0
+
+    def push(self, values, timestamp, hand='R', sequence=-1, deviceTime=np.nan, receivedAt=0.0):
+        # Called from the acquisition thread only
+        slot = self.writeIndex % self.capacity
+        self.values[slot] = values
+        self.timestamps[slot] = timestamp
+        self.hands[slot] = hand
+        self.sequences[slot] = sequence
+        self.deviceTimes[slot] = deviceTime
+        self.receivedAt[slot] = receivedAt
+        self.writeIndex += 1
+
+    def pending(self):
+        return self.writeIndex - self.readIndex
+
+    def drain(self):
+        """
+        Copy out every frame written since the last drain, oldest first.
+
+        Returns:
+            FrameBlock of arrays with one row per frame, possibly empty
+        """
+        end = self.writeIndex
+        # the slot at writeIndex may be mid-write, so at most capacity - 1 frames are readable
+        start = max(self.readIndex, end - (self.capacity - 1))
+
+        slots = np.arange(start, end) % self.capacity
+        block = FrameBlock(self.values[slots], self.timestamps[slots], self.hands[slots],
+                           self.sequences[slots], self.deviceTimes[slots], self.receivedAt[slots])
+
+        # Drop anything the producer lapped while we were copying. Frames past end are left for the next
+        # drain to count, even if the producer has already lapped those too
+        overwritten = min(self.writeIndex - (self.capacity - 1), end) - start
+        if overwritten > 0:
+            block = FrameBlock(*(column[overwritten:] for column in block))
+            start += overwritten
+
+        self.overruns += start - self.readIndex
+        self.readIndex = end
+        return block
@@ -0,0 +1,353 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import socket
+import struct
+from collections import deque
+import numpy as np
+from GloveProtocol import NUM_CHANNELS, fieldsToValues
+
+# Live frame streaming to local clients (game engine, logger, dashboard) over WebSocket.
+# The acquisition front ends start one alongside the recorder and display (runAcquisition's streamPort:
+# SensorRead3.0's streamPort, GloveControlPanel --stream, AsyncAcquisition.py --stream), so clients share the
+# live gloves with the GUI; run on its own (python FrameServer.py SOURCE...) it acquires the gloves itself.
+#
+# Every client connects to ws://localhost:PORT/ and receives one binary WebSocket message per frame.
+# Each frame is encoded once and the same bytes are queued to every client. Each client has its own
+# bounded queue: a client that reads slowly only loses its own oldest frames, acquisition never waits.
+#
+# Stream record (little-endian, STREAM_RECORD_SIZE = 191 bytes):
+#   magic           uint16      0x4647 ('GF')
+#   sequence        uint32      server frame counter; gaps are frames this client missed
+#   timestamp       float64     host timestamp (s since acquisition started)
+#   deviceSequence  int32       glove's own frame sequence number, -1 for text frames
+#   deviceTime      float64     glove clock in microseconds, NaN for text frames
+#   values          float32[41] the frame's channels in CSV order, NaN where unreadable (wrist gyro in dps)
+#   hand            char        'R' or 'L'
+
+STREAM_MAGIC = 0x4647
+STREAM_STRUCT = struct.Struct('<HIdid41fc')
+STREAM_RECORD_SIZE = STREAM_STRUCT.size
+DEFAULT_STREAM_PORT = 8765
+
+# Socket buffer per connection: small, so a slow client's backlog stays in its drop-oldest queue
+# instead of piling up stale frames in the kernel
+SOCKET_BUFFER_BYTES = 16384
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455 section 1.3
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+# encodeStreamRecord(sequence, frame)
+# One stream record from an AsyncAcquisition.Frame (text fields or binary values)
+def encodeStreamRecord(sequence, frame):
+    data = frame.data
+    if isinstance(data, list):
+        values = fieldsToValues(data, np.empty(NUM_CHANNELS))
+        hand = frame.hand or (data[NUM_CHANNELS] if len(data) > NUM_CHANNELS else 'R')
+    else:
+        values, hand = data, frame.hand or 'R'
+    return STREAM_STRUCT.pack(STREAM_MAGIC, sequence & 0xFFFFFFFF, frame.timestamp, frame.sequence,
+                              frame.deviceTime, *values[:NUM_CHANNELS].tolist(), hand.encode()[:1])
+
+
+# decodeStreamRecord(record)
+# (sequence, timestamp, hand, deviceSequence, deviceTime, values) from one stream record; values is a float array
+def decodeStreamRecord(record):
+    fields = STREAM_STRUCT.unpack(record)
+    if fields[0] != STREAM_MAGIC:
+        raise ValueError("Not a glove stream record")
+    return fields[1], fields[2], fields[-1].decode(), fields[3], fields[4], np.array(fields[5:-1])
+
+
+# websocketFrame(opcode, payload)
+# Unmasked server-to-client WebSocket frame (final fragment)
+def websocketFrame(opcode, payload):
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+# websocketAccept(key)
+# Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key
+def websocketAccept(key):
+    return base64.b64encode(hashlib.sha1(key.strip() + WEBSOCKET_GUID).digest()).decode()
+
+
+class StreamClient:
+    """
+    One connected client: a bounded queue of encoded messages and the task that writes them.
+
+    Args:
+        writer: asyncio.StreamWriter of the client's connection (or a stand-in with write/drain/close)
+        name: label for stats, e.g. the peer address
+        maxQueued: messages queued at most; the oldest is dropped to make room
+    """
+
+    def __init__(self, writer, name, maxQueued=256):
+        self.writer = writer
+        self.name = name
+        self.queue = deque(maxlen=maxQueued)
+        self.ready = asyncio.Event()
+        self.connected = True
+        self.task = None
+        self.messagesSent = 0
+        self.messagesDropped = 0
+
+    def send(self, message):
+        # Never waits: a full queue drops its oldest message
+        if len(self.queue) == self.queue.maxlen:
+            self.messagesDropped += 1
+        self.queue.append(message)
+        self.ready.set()
+
+    async def writeLoop(self):
+        # Write whatever is queued, then wait for the socket to drain; a slow client only slows this task
+        queue = self.queue
+        try:
+            while self.connected:
+                await self.ready.wait()
+                self.ready.clear()
+                while queue:
+                    messages = list(queue)
+                    queue.clear()
+                    self.writer.write(b''.join(messages))
+                    self.messagesSent += len(messages)
+                    await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connected = False
+
+    def close(self):
+        self.connected = False
+        self.ready.set()
+        self.writer.close()
+
+    async def finish(self, timeout=1.0):
+        # Write whatever is still queued (e.g. the close reply), then close; a client that stopped reading is cut off
+        self.connected = False
+        self.ready.set()
+        if self.task is not None:
+            await asyncio.wait([self.task], timeout=timeout)
+            self.task.cancel()
+        self.writer.close()
+
+    def stats(self):
+        return {"client": self.name, "sent": self.messagesSent, "dropped": self.messagesDropped,
+                "queued": len(self.queue)}
+
+
+class FrameServer:
+    """
+    WebSocket server broadcasting every acquired frame to all connected clients on localhost.
+
+    publish() encodes a frame once and hands the same message to every client's
+    StreamClient queue, so its cost does not depend on how fast clients read. Clients
+    only receive; anything they send besides ping and close is ignored.
+
+    Args:
+        host: interface to listen on (localhost only by default)
+        port: TCP port of the ws:// endpoint
+        maxQueued: messages queued per client before its oldest are dropped
+    """
+
+    def __init__(self, host='localhost', port=DEFAULT_STREAM_PORT, maxQueued=256):
+        self.host = host
+        self.port = port
+        self.maxQueued = maxQueued
+        self.server = None
+        self.clients = []
+        self.sequence = 0
+        self.closedStats = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handleConnection, self.host, self.port)
+        if not self.port:
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for client in list(self.clients):
+            client.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def publish(self, frame):
+        message = websocketFrame(OPCODE_BINARY, encodeStreamRecord(self.sequence, frame))
+        self.sequence += 1
+        for client in self.clients:
+            client.send(message)
+
+    def addClient(self, writer, name):
+        # Start streaming to a connection that has completed the handshake; returns its StreamClient
+        client = StreamClient(writer, name, self.maxQueued)
+        client.task = asyncio.ensure_future(client.writeLoop())
+        self.clients.append(client)
+        return client
+
+    def removeClient(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+            self.closedStats.append(client.stats())
+        client.close()
+
+    async def handleConnection(self, reader, writer):
+        name = "%s:%s" % writer.get_extra_info('peername')[:2]
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        key = None
+        for line in request.split(b'\r\n')[1:]:
+            header, _, value = line.partition(b':')
+            if header.strip().lower() == b'sec-websocket-key':
+                key = value
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
+        writer.transport.set_write_buffer_limits(high=SOCKET_BUFFER_BYTES)
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {websocketAccept(key)}\r\n\r\n").encode())
+
+        client = self.addClient(writer, name)
+        try:
+            await self.readClient(reader, client)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.removeClient(client)
+
+    async def readClient(self, reader, client):
+        # Client messages are masked; only ping and close mean anything here
+        while client.connected:
+            first, second = await reader.readexactly(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', await reader.readexactly(8))[0]
+            mask = await reader.readexactly(4) if second & 0x80 else b'\0\0\0\0'
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+            if opcode == OPCODE_CLOSE:
+                client.send(websocketFrame(OPCODE_CLOSE, payload[:2]))
+                await client.finish()
+                return
+            if opcode == OPCODE_PING:
+                client.send(websocketFrame(OPCODE_PONG, payload))
+
+    def stats(self):
+        return {"framesPublished": self.sequence,
+                "clients": [client.stats() for client in self.clients] + self.closedStats}
+
+
+# serveFrames(subscription, server, service)
+# Publish every frame of an AcquisitionService subscription (subscribe with dropOldest=True, the server never waits).
+# If the server cannot listen (e.g. the port is taken) streaming is given up, unsubscribing from service, and
+# acquisition and recording carry on without it
+async def serveFrames(subscription, server, service=None):
+    try:
+        await server.start()
+    except OSError as e:
+        print(f"Frame streaming disabled, cannot listen on {server.host}:{server.port}: {e}")
+        if service is not None:
+            service.unsubscribe(subscription)
+        return
+    try:
+        async for frame in subscription:
+            server.publish(frame)
+    finally:
+        await server.close()
+
+
+class LoopbackWriter:
+    """
+    In-process stand-in for a client connection's StreamWriter, for exercising FrameServer without sockets.
+
+    Collects everything written. drainDelay makes every drain() take that long, like a
+    client that reads slowly.
+    """
+
+    def __init__(self, drainDelay=0.0):
+        self.drainDelay = drainDelay
+        self.received = bytearray()
+
+    def write(self, data):
+        self.received += data
+
+    async def drain(self):
+        if self.drainDelay:
+            await asyncio.sleep(self.drainDelay)
+
+    def close(self):
+        pass
+
+    def records(self):
+        # Stream records in what was written (every message is an unmasked binary frame of one record)
+        messageSize = len(websocketFrame(OPCODE_BINARY, bytes(STREAM_RECORD_SIZE)))
+        headerSize = messageSize - STREAM_RECORD_SIZE
+        return [decodeStreamRecord(bytes(self.received[i + headerSize:i + messageSize]))
+                for i in range(0, len(self.received), messageSize)]
+
+
+# loopbackCheck(recordingPath, speed)
+# Replay a recording into a FrameServer with a fast and a slow loopback client and report what each received
+async def loopbackCheck(recordingPath, speed=None):
+    from AsyncAcquisition import AcquisitionService, GloveSource, ReplayTransport
+    service = AcquisitionService([GloveSource(ReplayTransport(recordingPath, speed))])
+    server = FrameServer(maxQueued=16)
+    subscription = service.subscribe(maxsize=64, dropOldest=True)
+
+    fast, slow = LoopbackWriter(), LoopbackWriter(drainDelay=0.05)
+    server.addClient(fast, "fast")
+    server.addClient(slow, "slow")
+
+    async def publish():
+        async for frame in subscription:
+            server.publish(frame)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(service.run(), publish())
+    await asyncio.sleep(0.2)
+    for writer in (fast, slow):
+        records = writer.records()
+        sequences = [record[0] for record in records]
+        print(f"{len(records)} records, sequence {sequences[0]}..{sequences[-1]}, "
+              f"in order: {sequences == sorted(sequences)}")
+    print(server.stats())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stream glove frames to local WebSocket clients")
+    parser.add_argument("sources", nargs="*", default=["replay:GloveData.csv"],
+                        help="gloves as serial:PORT, tcp:HOST:PORT or replay:RECORDING, each optionally @R or @L")
+    parser.add_argument("--port", type=int, default=DEFAULT_STREAM_PORT, help="WebSocket port on localhost")
+    parser.add_argument("--binary", action="store_true", help="use the binary frame protocol")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed; 0 plays as fast as possible")
+    parser.add_argument("--loopback", action="store_true",
+                        help="check the server against in-process loopback clients instead of listening")
+    args = parser.parse_args()
+
+    if args.loopback:
+        asyncio.run(loopbackCheck(args.sources[0].partition(':')[2], args.speed or None))
+    else:
+        from AsyncAcquisition import parseSource, runAcquisition
+
+        print(f"Streaming on ws://localhost:{args.port}/")
+        service = runAcquisition([parseSource(spec, args.binary, args.speed or None) for spec in args.sources],
+                                 streamPort=args.port)
+        print(service.frameServer.stats())
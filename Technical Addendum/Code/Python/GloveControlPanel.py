@@ -0,0 +1,299 @@
+import argparse
+import os
+import sys
+import time
+import serial
+from PySide6.QtCore import QThread, QTimer, Signal
+from PySide6.QtWidgets import (QGridLayout, QLabel, QLineEdit, QMainWindow, QMessageBox, QPushButton,
+                               QStackedWidget, QWidget)
+from PySideGraphicalDisplay import GloveMonitorWindow, app
+from GloveProtocol import CSV_HEADER
+from Acquisition import openRecorder
+from AsyncAcquisition import GloveSource, SerialTransport, runAcquisition
+from Instrumentation import instrumentation
+
+# Qt-only version of SensorRead3.0's control panel: the panel, the acquisition window and the serial
+# worker all run on Qt's event loop, so no Tk mainloop and no 10 ms processEvents timer.
+#
+#   python GloveControlPanel.py [--binary] [--stream 8765]
+#
+# The worker thread acquires every glove (AsyncAcquisition) and queues frames into the acquisition window's
+# ring buffer; the window's render tick draws them. Status and errors come back to the panel as signals.
+# With --stream, the same live frames also go to local WebSocket clients (FrameServer).
+
+BAUD_RATE = 2000000
+RESET_DELAY = 3.0  # seconds the gloves take to reset after their port is opened
+CALIBRATION_RESET_DELAY = 1.0
+
+
+class AcquisitionWorker(QThread):
+    """
+    Reads the open gloves on its own thread until stopped, recording every frame and passing
+    it to onFrame (GloveMonitorWindow.updateData, which only queues it).
+
+    Args:
+        ports: dict of hand ('R'/'L') -> open serial.Serial
+        outputFileName: recording file (.csv or .glove)
+        onFrame: called on the worker thread for every frame, or None
+        resetDelay: seconds to wait before starting, for gloves whose ports were just opened
+        binaryMode: request binary frames instead of text lines
+        streamPort: localhost port to stream the frames to WebSocket clients on, or None
+    """
+
+    status = Signal(str)
+    failed = Signal(str)
+    statsReady = Signal(dict)
+
+    def __init__(self, ports, outputFileName, onFrame=None, resetDelay=0.0, binaryMode=False, streamPort=None,
+                 parent=None):
+        super().__init__(parent)
+        self.ports = ports
+        self.outputFileName = outputFileName
+        self.onFrame = onFrame
+        self.resetDelay = resetDelay
+        self.binaryMode = binaryMode
+        self.streamPort = streamPort
+        self.running = False
+
+    def run(self):
+        self.running = True
+        recorder = None
+        try:
+            if self.resetDelay:
+                self.status.emit("Connecting to glove...")
+                time.sleep(self.resetDelay)
+            self.status.emit("Reading data...")
+
+            # With both gloves connected, every frame is tagged with its port's hand
+            sources = [GloveSource(SerialTransport(serialPort=port), hand if len(self.ports) > 1 else None,
+                                   self.binaryMode)
+                       for hand, port in self.ports.items()]
+            recorder = openRecorder(self.outputFileName, CSV_HEADER)
+            service = runAcquisition(sources, recorder, self.onFrame, time.perf_counter(), lambda: self.running,
+                                     self.streamPort)
+            recorder.close()
+            self.statsReady.emit({"recording": recorder.stats(), "acquisition": service.stats()})
+        except Exception as e:
+            if recorder:
+                recorder.close()
+            self.failed.emit(str(e))
+        finally:
+            self.running = False
+
+    def stop(self):
+        self.running = False
+
+
+class GloveControlPanel(QMainWindow):
+    """
+    Output file, COM ports, calibration and start/stop for one or two gloves, as in
+    SensorRead3.0, with the calibration steps as pages of a stacked widget.
+    """
+
+    def __init__(self, outputFileName="GloveData.csv", port='COM8', portL='', binaryMode=False, streamPort=None):
+        super().__init__()
+        self.setWindowTitle("Glove Data Reader")
+        self.binaryMode = binaryMode
+        self.streamPort = streamPort
+        self.ports = {}
+        self.worker = None
+        self.monitorWindow = None
+        self.failedMessage = None
+        self.outputFileName = outputFileName
+
+        self.pages = QStackedWidget()
+        self.setCentralWidget(self.pages)
+
+        # Data page (controls for data collection) ------------------------------------------------------------------
+        dataPage = QWidget()
+        dataLayout = QGridLayout(dataPage)
+
+        self.fileNameEntry = QLineEdit(outputFileName)
+        self.comPortEntry = QLineEdit(port)
+        self.comPortEntryL = QLineEdit(portL)  # optional second glove, read concurrently with the first
+        dataLayout.addWidget(QLabel("Output File:"), 0, 0)
+        dataLayout.addWidget(self.fileNameEntry, 0, 1)
+        dataLayout.addWidget(QLabel("COM Port (Right Hand):"), 1, 0)
+        dataLayout.addWidget(self.comPortEntry, 1, 1)
+        dataLayout.addWidget(QLabel("COM Port (Left Hand):"), 2, 0)
+        dataLayout.addWidget(self.comPortEntryL, 2, 1)
+
+        self.startButton = QPushButton("Start Acquisition")
+        self.startButton.setEnabled(False)
+        self.startButton.clicked.connect(self.startAcquisition)
+        self.stopButton = QPushButton("Stop Acquisition")
+        self.stopButton.setEnabled(False)
+        self.stopButton.clicked.connect(self.stopAcquisition)
+        self.calibrateButton = QPushButton("Calibrate Glove")
+        self.calibrateButton.clicked.connect(self.calibrateGloves)
+        dataLayout.addWidget(self.startButton, 3, 0)
+        dataLayout.addWidget(self.stopButton, 3, 1)
+        dataLayout.addWidget(self.calibrateButton, 4, 0, 1, 2)
+
+        self.statusLabel = QLabel("Gloves not calibrated")
+        dataLayout.addWidget(self.statusLabel, 5, 0, 1, 2)
+        self.dataPage = self.addPage(dataPage)
+
+        # Calibration pages: open hand (CAL1), fist (CAL2), finished --------------------------------------------------
+        self.calibrationPage1 = self.addPage(self.calibrationPage(
+            "Place your hand on a flat surface with fingers spread, then press next", "Next", self.calibration1))
+        self.calibrationPage2 = self.addPage(self.calibrationPage(
+            "Now, make a fist with your thumb tucked, then press next", "Next", self.calibration2))
+        self.calibrationFinishedPage = self.addPage(self.calibrationPage(
+            "Calibration Finished!", "Finish", self.finishCalibration))
+
+        self.pages.setCurrentWidget(self.dataPage)
+
+    def addPage(self, page):
+        self.pages.addWidget(page)
+        return page
+
+    def calibrationPage(self, text, buttonText, onNext):
+        page = QWidget()
+        layout = QGridLayout(page)
+        layout.addWidget(QLabel(text), 0, 0)
+        nextButton = QPushButton(buttonText)
+        nextButton.clicked.connect(onNext)
+        layout.addWidget(nextButton, 1, 1)
+        return page
+
+    def setStatus(self, status):
+        self.statusLabel.setText(status)
+
+    # ------------------------------------------------------- ports ----------------------------------------------------
+    def openPorts(self):
+        # Open the port of each glove that is not open yet; returns whether any was opened (and is now resetting)
+        portNames = {'R': self.comPortEntry.text().strip(), 'L': self.comPortEntryL.text().strip()}
+        opened = False
+        for hand, name in portNames.items():
+            if name and hand not in self.ports:
+                self.ports[hand] = serial.Serial(name, BAUD_RATE, timeout=0)
+                opened = True
+        return opened
+
+    def closePorts(self):
+        for port in self.ports.values():
+            try:
+                port.close()
+            except serial.SerialException as e:
+                print(f"Error closing serial port: {e}")
+        self.ports = {}
+
+    def writeAll(self, command):
+        for port in self.ports.values():
+            port.write(command)
+
+    def showError(self, title, message):
+        self.setStatus(message)
+        QMessageBox.critical(self, title, message)
+        self.startButton.setEnabled(bool(self.ports))
+        self.stopButton.setEnabled(False)
+
+    # --------------------------------------------------- calibration --------------------------------------------------
+    def calibrateGloves(self):
+        self.setStatus("Connecting to glove...")
+        try:
+            opened = self.openPorts()
+        except serial.SerialException as e:
+            self.showError("Error", f"Error: Could not open serial port\n{e}")
+            return
+        # Let freshly opened gloves reset before asking for the first reading, without blocking the event loop
+        QTimer.singleShot(int(CALIBRATION_RESET_DELAY * 1000) if opened else 0,
+                          lambda: self.pages.setCurrentWidget(self.calibrationPage1))
+
+    def calibration1(self):
+        # Calibrate glove's minimum flex value
+        self.writeAll(b"CAL1")
+        self.pages.setCurrentWidget(self.calibrationPage2)
+
+    def calibration2(self):
+        # Calibrate glove's maximum flex value
+        self.writeAll(b"CAL2")
+        self.pages.setCurrentWidget(self.calibrationFinishedPage)
+
+    def finishCalibration(self):
+        self.pages.setCurrentWidget(self.dataPage)
+        self.startButton.setEnabled(True)
+        self.setStatus("Ready to collect data")
+
+    # --------------------------------------------------- acquisition --------------------------------------------------
+    def startAcquisition(self):
+        self.outputFileName = self.fileNameEntry.text()
+        self.setStatus("Connecting...")
+        try:
+            opened = self.openPorts()
+        except serial.SerialException as e:
+            self.showError("Error", f"Error: Could not open serial port\n{e}")
+            return
+        self.startButton.setEnabled(False)
+        self.stopButton.setEnabled(True)
+        self.failedMessage = None
+
+        self.monitorWindow = GloveMonitorWindow(pumpEvents=False)
+        self.monitorWindow.initDisplay()
+
+        self.worker = AcquisitionWorker(self.ports, self.outputFileName, self.monitorWindow.updateData,
+                                        RESET_DELAY if opened else 0.0, self.binaryMode, self.streamPort, self)
+        self.worker.status.connect(self.setStatus)
+        self.worker.failed.connect(self.acquisitionFailed)
+        self.worker.statsReady.connect(self.printStats)
+        self.worker.finished.connect(self.acquisitionFinished)
+        self.worker.start()
+
+    def stopAcquisition(self):
+        self.setStatus("Stopping...")
+        self.stopButton.setEnabled(False)
+        # The worker's sources send the stop command to every glove as they close
+        if self.worker:
+            self.worker.stop()
+
+    def acquisitionFailed(self, message):
+        self.failedMessage = message
+        self.showError("Error", f"Unexpected Error\n{message}")
+
+    def acquisitionFinished(self):
+        self.worker = None
+        if self.monitorWindow is not None:
+            self.monitorWindow.terminateDisplay()
+            self.monitorWindow.deleteLater()
+            self.monitorWindow = None
+        self.startButton.setEnabled(True)
+        self.stopButton.setEnabled(False)
+        if self.failedMessage is None:
+            self.setStatus("Data saved to " + self.outputFileName)
+
+        # Save per-stage timings next to the recording
+        if instrumentation.enabled:
+            instrumentation.dumpJson(os.path.splitext(self.outputFileName)[0] + "_timing.json")
+
+    def printStats(self, stats):
+        print(f"Recording stats: {stats['recording']}")
+        print(f"Acquisition stats: {stats['acquisition']}")
+
+    def closeEvent(self, event):
+        # If collecting data still, warn user
+        if self.worker is not None:
+            answer = QMessageBox.question(self, "Warning", "Data acquisition is still running. Continue?",
+                                          QMessageBox.Ok | QMessageBox.Cancel)
+            if answer != QMessageBox.Ok:
+                event.ignore()
+                return
+            self.worker.stop()
+            self.worker.wait(2000)
+        if self.monitorWindow is not None:
+            self.monitorWindow.terminateDisplay()
+        self.closePorts()
+        event.accept()
+        app.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Glove control panel")
+    parser.add_argument("--binary", action="store_true", help="use the binary frame protocol")
+    parser.add_argument("--stream", type=int, metavar="PORT",
+                        help="also stream the live frames to WebSocket clients on this localhost port")
+    args = parser.parse_args()
+
+    panel = GloveControlPanel(binaryMode=args.binary, streamPort=args.stream)
+    panel.show()
+    sys.exit(app.exec())
@@ -0,0 +1,167 @@
+import binascii
+import struct
+import numpy as np
+
+# Number of numeric channels sent per frame: 5 flex, 5 finger IMUs x (acc, gyro), wrist acc, wrist gyro
+NUM_CHANNELS = 41
+
+# CSV header written at the top of every recording
+CSV_HEADER = ["Timestamp",
+              "Thumb Flex", "Pointer Flex", "Middle Flex", "Ring Flex", "Pinky Flex",
+              "Thumb Acc. X", "Thumb Acc. Y", "Thumb Acc. Z", "Thumb Gyro X", "Thumb Gyro Y", "Thumb Gyro Z",
+              "Pointer Acc. X", "Pointer Acc. Y", "Pointer Acc. Z", "Pointer Gyro X", "Pointer Gyro Y", "Pointer Gyro Z",
+              "Middle Acc. X", "Middle Acc. Y", "Middle Acc. Z", "Middle Gyro X", "Middle Gyro Y", "Middle Gyro Z",
+              "Ring Acc. X", "Ring Acc. Y", "Ring Acc. Z", "Ring Gyro X", "Ring Gyro Y", "Ring Gyro Z",
+              "Pinky Acc. X","Pinky Acc. Y", "Pinky Acc. Z", "Pinky Gyro X", "Pinky Gyro Y", "Pinky Gyro Z",
+              "Wrist Gyro X", "Wrist Gyro Y", "Wrist Gyro Z", "Wrist Acc. X", "Wrist Acc. Y", "Wrist Acc. Z",
+              "Hand"]
+
+# Commands understood by the glove firmware
+START_COMMAND = b"ON"
+START_COMMAND_BINARY = b"ONB"
+STOP_COMMAND = b"OFF"
+
+# ------------------------------------------------- TEXT FRAMES --------------------------------------------------------
+# One ASCII line per sample: 41 comma separated values followed by the hand ("R"/"L")
+
+
+# parseTextLine(line)
+# line: raw bytes read from the serial port, including the line terminator
+# Returns the list of stripped fields, or None for an empty line
+def parseTextLine(line):
+    data = line.decode('utf-8').strip()
+    if not data:
+        return None
+    return [s.strip() for s in data.split(',')]
+
+
+# fieldsToValues(fields, out)
+# Convert the numeric fields of a text frame into out (float array of NUM_CHANNELS).
+# Unreadable fields (e.g. 'E' from a failed IMU read) become NaN
+def fieldsToValues(fields, out):
+    try:
+        out[:] = fields[:NUM_CHANNELS]
+    except ValueError:
+        for i in range(NUM_CHANNELS):
+            try:
+                out[i] = float(fields[i])
+            except ValueError:
+                out[i] = np.nan
+    return out
+
+
+# valuesToFields(values, hand)
+# Format a numeric frame the way the firmware prints it (flex as integers, IMU values to two decimals)
+def valuesToFields(values, hand):
+    fields = ['%d' % v if v == v else 'E' for v in values[:5].tolist()]
+    fields += ['%.2f' % v if v == v else 'E' for v in values[5:NUM_CHANNELS].tolist()]
+    fields.append(hand)
+    return fields
+
+
+# ------------------------------------------------- BINARY FRAMES ------------------------------------------------------
+# Fixed-size little-endian frame, requested from the glove with START_COMMAND_BINARY:
+#   sync        uint16   0x5AA5 (bytes A5 5A)
+#   sequence    uint16   increments by one per frame, wraps at 65536
+#   deviceTime  uint32   device clock in microseconds
+#   flex        uint8[5] calibrated flex readings, 0-254; FLEX_UNREADABLE (0xFF) where the text frame has 'E'
+#   imu         float32[36] thumb..pinky acc/gyro, wrist acc (g), wrist gyro (dps), same order as the text frame
+#   hand        char     'R' or 'L'
+#   crc         uint16   CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over sequence..hand
+
+SYNC_WORD = 0x5AA5
+SYNC_BYTES = struct.pack('<H', SYNC_WORD)
+FLEX_UNREADABLE = 0xFF
+CRC_INIT = 0xFFFF
+
+FRAME_DTYPE = np.dtype([('sync', '<u2'), ('sequence', '<u2'), ('deviceTime', '<u4'),
+                        ('flex', 'u1', (5,)), ('imu', '<f4', (36,)), ('hand', 'S1'), ('crc', '<u2')])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+FRAME_STRUCT = struct.Struct('<HHI5B36fcH')
+HEADER_STRUCT = struct.Struct('<HHI')
+CRC_STRUCT = struct.Struct('<H')
+
+
+# encodeBinaryFrame(sequence, deviceTime, values, hand)
+# Build one binary frame, as the firmware would send it. NaN flex readings are sent as FLEX_UNREADABLE,
+# and readings are limited to 0-254 so none is mistaken for it
+def encodeBinaryFrame(sequence, deviceTime, values, hand=b'R'):
+    flex = [FLEX_UNREADABLE if v != v else min(max(int(v), 0), FLEX_UNREADABLE - 1) for v in values[:5]]
+    frame = bytearray(FRAME_STRUCT.pack(SYNC_WORD, sequence & 0xFFFF, deviceTime & 0xFFFFFFFF,
+                                        *flex, *[float(v) for v in values[5:NUM_CHANNELS]], hand, 0))
+    CRC_STRUCT.pack_into(frame, FRAME_SIZE - 2, binascii.crc_hqx(frame[2:FRAME_SIZE - 2], CRC_INIT))
+    return bytes(frame)
+
+
+class BinaryFrameDecoder:
+    """
+    Decodes binary frames out of a reusable receive buffer.
+
+    Received bytes are copied into a preallocated bytearray, frames are located by their
+    sync word, checked against their CRC and decoded through numpy/struct views of the
+    buffer, so no intermediate bytes or strings are created per frame. Each decoded frame
+    is copied into the same preallocated float array, which stays valid only until the
+    next frame is decoded.
+    """
+
+    def __init__(self, capacity=64 * FRAME_SIZE):
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+        self.values = np.empty(NUM_CHANNELS)
+
+        # Receive error counters
+        self.crcErrors = 0
+        self.bytesSkipped = 0
+
+    def feed(self, data):
+        # Copy received bytes into the buffer, after moving any partial frame to its front
+        if self.start:
+            remaining = self.end - self.start
+            self.buffer[:remaining] = self.view[self.start:self.end]
+            self.start = 0
+            self.end = remaining
+        if self.end + len(data) > len(self.buffer):
+            raise BufferError("Binary frame buffer overflow")
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def nextFrame(self):
+        """
+        Decode the next complete frame in the buffer.
+
+        Returns:
+            (sequence, deviceTime, values, hand) or None when no complete frame is buffered.
+            values is the decoder's reusable float array (wrist gyro still in dps, NaN for unreadable flex).
+        """
+        while self.end - self.start >= FRAME_SIZE:
+            position = self.buffer.find(SYNC_BYTES, self.start, self.end)
+            if position < 0:
+                # keep the final byte, it may be the first half of a sync word
+                self.bytesSkipped += self.end - 1 - self.start
+                self.start = self.end - 1
+                return None
+            self.bytesSkipped += position - self.start
+            self.start = position
+            if self.end - position < FRAME_SIZE:
+                return None
+
+            crc = CRC_STRUCT.unpack_from(self.buffer, position + FRAME_SIZE - 2)[0]
+            if binascii.crc_hqx(self.view[position + 2:position + FRAME_SIZE - 2], CRC_INIT) != crc:
+                # false sync or corrupted frame, resume searching after this sync word
+                self.crcErrors += 1
+                self.start = position + 1
+                continue
+
+            frame = np.frombuffer(self.buffer, dtype=FRAME_DTYPE, count=1, offset=position)[0]
+            _, sequence, deviceTime = HEADER_STRUCT.unpack_from(self.buffer, position)
+            flex = frame['flex']
+            self.values[:5] = flex
+            if flex.max() == FLEX_UNREADABLE:
+                self.values[:5][flex == FLEX_UNREADABLE] = np.nan
+            self.values[5:] = frame['imu']
+            hand = chr(self.buffer[position + FRAME_SIZE - 3])
+            self.start = position + FRAME_SIZE
+            return sequence, deviceTime, self.values, hand
+        return None
@@ -0,0 +1,506 @@
+import argparse
+import errno
+import math
+import os
+import select
+import socket
+import sys
+import threading
+import time
+import numpy as np
+from GloveProtocol import (NUM_CHANNELS, START_COMMAND, START_COMMAND_BINARY, STOP_COMMAND,
+                           encodeBinaryFrame, fieldsToValues, valuesToFields)
+from ReplaySource import readRecording
+
+# Glove hardware simulator: answers the firmware's commands and streams frames at a configurable rate, over a
+# pseudo-terminal that serial.Serial opens like the glove's COM port, or over TCP (AsyncAcquisition.TcpTransport).
+#
+#   python GloveSimulator.py --rate 1000                     synthetic right glove on a pty, prints its path
+#   python GloveSimulator.py --recording GloveData.csv --tcp 5000 --hand L
+#   python GloveSimulator.py --sweep 100 500 1000 2000 5000  find the highest rate acquisition keeps up with
+#
+# Like the firmware, a command ends at a newline or when no more bytes follow for commandTimeout:
+#   ON / ONB    start streaming text lines / binary frames
+#   OFF         stop streaming
+#   CAL1 / CAL2 stop streaming and take the current raw flex readings as the open hand / fist levels
+#   anything else stops streaming, as the firmware falls back to idle
+
+MIN_SAMPLE_RATE = 100
+MAX_SAMPLE_RATE = 5000
+CALIBRATION_COMMANDS = (b"CAL1", b"CAL2")
+
+# Frames the simulator holds while the host is not reading (the firmware's serial transmit buffer plus the
+# USB endpoint). Frames produced while it is full are dropped and counted, as the real glove would lose them
+TX_BUFFER_BYTES = 16384
+
+# Synthetic hand motion: raw flex ADC readings of an open hand and a fist, and each finger's curl period (s)
+FLEX_OPEN_RAW = np.array([310.0, 290.0, 300.0, 295.0, 305.0])
+FLEX_FIST_RAW = np.array([620.0, 720.0, 740.0, 710.0, 680.0])
+CURL_PERIODS = np.array([3.1, 2.3, 2.6, 2.9, 3.4])
+GRAVITY = 9.81
+
+
+class SyntheticSignals:
+    """
+    Generated sensor readings for a hand slowly opening and closing while the wrist rocks.
+
+    Flex sensors give raw ADC readings (mapped to 0-255 by the simulator's calibration, as
+    the firmware does); finger IMUs report gravity turning with each finger's curl (m/s^2)
+    and the curl rate (rad/s); the wrist IMU reports acceleration in g and rotation in dps.
+    A little Gaussian noise is added to every channel.
+
+    Args:
+        seed: random seed for the noise
+    """
+
+    rawFlex = True
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+
+    def block(self, times):
+        # (len(times), NUM_CHANNELS) readings at the given times (s), flex channels raw
+        t = np.asarray(times, dtype=float)[:, np.newaxis]
+        count = len(t)
+        values = np.empty((count, NUM_CHANNELS))
+
+        omega = 2 * math.pi / CURL_PERIODS
+        curl = 0.5 - 0.5 * np.cos(omega * t)  # 0 open .. 1 fist
+        values[:, :5] = FLEX_OPEN_RAW + (FLEX_FIST_RAW - FLEX_OPEN_RAW) * curl
+
+        # Each finger IMU pitches up to 90 degrees with its curl
+        pitch = curl * (math.pi / 2)
+        pitchRate = 0.5 * omega * np.sin(omega * t) * (math.pi / 2)
+        fingers = values[:, 5:35].reshape(count, 5, 6)
+        fingers[:, :, 0] = 0.0
+        fingers[:, :, 1] = -GRAVITY * np.sin(pitch)
+        fingers[:, :, 2] = GRAVITY * np.cos(pitch)
+        fingers[:, :, 3] = pitchRate
+        fingers[:, :, 4] = 0.0
+        fingers[:, :, 5] = 0.0
+
+        # Wrist rocking +/-20 degrees about x every 4 s
+        rock = math.radians(20) * np.sin(2 * math.pi * t[:, 0] / 4.0)
+        rockRate = math.radians(20) * (2 * math.pi / 4.0) * np.cos(2 * math.pi * t[:, 0] / 4.0)
+        values[:, 35] = 0.0
+        values[:, 36] = np.sin(rock)
+        values[:, 37] = np.cos(rock)
+        values[:, 38] = np.degrees(rockRate)
+        values[:, 39] = 0.0
+        values[:, 40] = 0.0
+
+        values[:, 5:35] += self.rng.normal(0.0, 0.05, (count, 30))
+        values[:, 35:38] += self.rng.normal(0.0, 0.005, (count, 3))
+        values[:, 38:41] += self.rng.normal(0.0, 0.3, (count, 3))
+        values[:, :5] += self.rng.normal(0.0, 2.0, (count, 5))
+        return values
+
+
+class RecordingSignals:
+    """
+    Readings looped from a recording (GloveData.csv or .glove), one row per frame regardless
+    of the recorded timestamps, so any rate can be played from the same data. Flex values in
+    a recording are already calibrated, so calibration commands do not change them.
+
+    Args:
+        recordingPath: recording to loop
+    """
+
+    rawFlex = False
+
+    def __init__(self, recordingPath):
+        rows = [fields for _, fields in readRecording(recordingPath)]
+        if not rows:
+            raise ValueError(f"{recordingPath} has no frames")
+        self.values = np.empty((len(rows), NUM_CHANNELS))
+        for i, fields in enumerate(rows):
+            fieldsToValues(fields, self.values[i])
+        self.position = 0
+
+    def block(self, times):
+        # The next len(times) rows, wrapping to the start of the recording
+        indices = (self.position + np.arange(len(times))) % len(self.values)
+        self.position = (self.position + len(times)) % len(self.values)
+        return self.values[indices]
+
+
+class GloveSimulator:
+    """
+    One glove's firmware: command handling, flex calibration and frame production.
+
+    The simulator is driven by its link (PtyLink/TcpLink): bytes the host writes are passed
+    to receive, and poll returns the bytes of every frame that has fallen due since the last
+    call, so frames are produced on schedule however coarsely the link wakes up. Frames are
+    stamped with the simulator's own sequence counter and microsecond clock, like the
+    firmware's.
+
+    Args:
+        signals: SyntheticSignals or RecordingSignals
+        sampleRate: frames per second while streaming (MIN_SAMPLE_RATE to MAX_SAMPLE_RATE)
+        hand: 'R' or 'L'
+        commandTimeout: seconds without input after which a command without a newline is taken as complete
+                        (the firmware's readStringUntil timeout)
+    """
+
+    def __init__(self, signals, sampleRate=1000, hand='R', commandTimeout=0.05):
+        if not MIN_SAMPLE_RATE <= sampleRate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample rate must be {MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE} Hz, got {sampleRate}")
+        self.signals = signals
+        self.sampleRate = sampleRate
+        self.hand = hand
+        self.commandTimeout = commandTimeout
+
+        self.streaming = False
+        self.binary = False
+        self.command = b''
+        self.commandReceivedAt = None
+
+        # Flex calibration (raw ADC levels mapped to 0 and 255), until CAL1/CAL2 capture new ones
+        self.flexMin = FLEX_OPEN_RAW.copy()
+        self.flexMax = FLEX_FIST_RAW.copy()
+        self.lastRawFlex = FLEX_OPEN_RAW.copy()
+
+        self.clockStart = time.perf_counter()
+        self.streamStart = None
+        self.sequence = 0
+        self.framesProduced = 0
+        self.framesSent = 0
+        self.framesDropped = 0
+        self.commands = []
+
+    # ---------------------------------------------------- commands ----------------------------------------------------
+    def receive(self, data, now=None):
+        # Bytes written by the host. Complete lines are handled at once, a trailing partial command after commandTimeout
+        now = time.perf_counter() if now is None else now
+        self.command += data
+        *lines, self.command = self.command.split(b'\n')
+        for line in lines:
+            self.handleCommand(line.strip(), now)
+        self.commandReceivedAt = now if self.command else None
+
+    def checkCommandTimeout(self, now):
+        if self.command and now - self.commandReceivedAt >= self.commandTimeout:
+            command, self.command, self.commandReceivedAt = self.command.strip(), b'', None
+            self.handleCommand(command, now)
+
+    def handleCommand(self, command, now):
+        if not command:
+            return
+        self.commands.append(command.decode('ascii', 'replace'))
+        if command in (START_COMMAND, START_COMMAND_BINARY):
+            if not self.streaming:
+                self.streamStart = now
+                self.framesProduced = 0
+            self.streaming = True
+            self.binary = command == START_COMMAND_BINARY
+        elif command == b"CAL1":
+            self.streaming = False
+            self.flexMin = self.currentRawFlex(now)
+        elif command == b"CAL2":
+            self.streaming = False
+            self.flexMax = self.currentRawFlex(now)
+        else:
+            # STOP_COMMAND, or anything the firmware does not recognize
+            self.streaming = False
+
+    def currentRawFlex(self, now):
+        if not self.signals.rawFlex:
+            return self.lastRawFlex.copy()
+        return self.signals.block([now - self.clockStart])[0, :5].copy()
+
+    # ----------------------------------------------------- frames -----------------------------------------------------
+    def nextDue(self):
+        # perf_counter time the next frame is due, or None while idle
+        if not self.streaming:
+            return None
+        return self.streamStart + self.framesProduced / self.sampleRate
+
+    def poll(self, now=None):
+        # Bytes of every frame due by now, as one block
+        now = time.perf_counter() if now is None else now
+        self.checkCommandTimeout(now)
+        if not self.streaming:
+            return b''
+
+        due = int((now - self.streamStart) * self.sampleRate) + 1 - self.framesProduced
+        if due <= 0:
+            return b''
+        times = self.streamStart + (self.framesProduced + np.arange(due)) / self.sampleRate - self.clockStart
+        self.framesProduced += due
+        return self.encodeFrames(times, self.signals.block(times))
+
+    def encodeFrames(self, times, values):
+        if self.signals.rawFlex:
+            self.lastRawFlex = values[-1, :5].copy()
+            # map() then constrain() to one byte, as the firmware does
+            span = np.where(self.flexMax != self.flexMin, self.flexMax - self.flexMin, 1.0)
+            values[:, :5] = np.clip(np.trunc((values[:, :5] - self.flexMin) * 255.0 / span), 0, 255)
+        else:
+            values[:, :5] = np.clip(np.round(values[:, :5]), 0, 255)
+
+        hand = self.hand.encode()
+        frames = []
+        if self.binary:
+            deviceTimes = (times * 1e6).astype(np.int64) & 0xFFFFFFFF
+            for row, deviceTime in zip(values, deviceTimes.tolist()):
+                frames.append(encodeBinaryFrame(self.sequence, deviceTime, row, hand))
+                self.sequence = (self.sequence + 1) & 0xFFFF
+        else:
+            for row in values:
+                frames.append((','.join(valuesToFields(row, self.hand)) + '\r\n').encode('ascii'))
+        return frames
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.streamStart if self.streamStart is not None else 0.0
+        return {"framesSent": self.framesSent, "framesDropped": self.framesDropped,
+                "sampleRate": self.sampleRate, "streamingSeconds": round(elapsed, 3), "commands": list(self.commands)}
+
+
+class SimulatorLink:
+    """
+    Runs a GloveSimulator against one connection on its own thread: waits for host input or
+    the next frame, passes commands to the simulator and sends due frames without blocking.
+    Frames that do not fit in the transmit buffer (TX_BUFFER_BYTES, the host is not reading
+    fast enough) are dropped whole and counted in the simulator's framesDropped.
+
+    Subclasses provide the connection: fileno, recv and send.
+    """
+
+    def __init__(self, simulator, txBufferBytes=TX_BUFFER_BYTES):
+        self.simulator = simulator
+        self.txBufferBytes = txBufferBytes
+        self.pending = bytearray()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True, name="glove-simulator")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        self.close()
+
+    def run(self):
+        simulator = self.simulator
+        while self.running:
+            due = simulator.nextDue()
+            if simulator.command:
+                commandDue = simulator.commandReceivedAt + simulator.commandTimeout
+                due = commandDue if due is None else min(due, commandDue)
+            timeout = 0.05 if due is None else min(max(due - time.perf_counter(), 0.0), 0.05)
+            fd = self.fileno()
+            if fd is None:
+                time.sleep(timeout)
+                continue
+            readable, writable, _ = select.select([fd], [fd] if self.pending else [], [], timeout)
+
+            if readable:
+                data = self.recv()
+                if data:
+                    simulator.receive(data)
+            if writable:
+                self.flush()
+
+            for frame in simulator.poll():
+                if len(self.pending) + len(frame) > self.txBufferBytes:
+                    simulator.framesDropped += 1
+                else:
+                    self.pending += frame
+                    simulator.framesSent += 1
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        try:
+            sent = self.send(self.pending)
+        except BlockingIOError:
+            return
+        del self.pending[:sent]
+
+
+class PtyLink(SimulatorLink):
+    """
+    The simulated glove on a pseudo-terminal (POSIX only). path is the terminal to open in
+    place of the glove's COM port, e.g. serial.Serial(link.path, 2000000).
+    """
+
+    def __init__(self, simulator, txBufferBytes=TX_BUFFER_BYTES):
+        super().__init__(simulator, txBufferBytes)
+        import tty
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo or newline translation, like a serial device
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+
+    def fileno(self):
+        return self.master
+
+    def recv(self):
+        try:
+            return os.read(self.master, 4096)
+        except BlockingIOError:
+            return b''
+        except OSError as e:
+            if e.errno == errno.EIO:  # no process has the terminal open
+                return b''
+            raise
+
+    def send(self, data):
+        return os.write(self.master, data)
+
+    def close(self):
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class TcpLink(SimulatorLink):
+    """
+    The simulated glove on a local TCP port, one host connection at a time (e.g.
+    AsyncAcquisition.TcpTransport, or serial.serial_for_url('socket://localhost:PORT')).
+    Output is dropped while no host is connected, and the glove goes idle when the host
+    disconnects.
+    """
+
+    def __init__(self, simulator, host='localhost', port=5000, txBufferBytes=TX_BUFFER_BYTES):
+        super().__init__(simulator, txBufferBytes)
+        self.server = socket.create_server((host, port))
+        self.server.setblocking(False)
+        self.address = self.server.getsockname()
+        self.connection = None
+
+    def fileno(self):
+        if self.connection is None:
+            self.accept()
+        return self.connection.fileno() if self.connection is not None else None
+
+    def accept(self):
+        try:
+            self.connection, _ = self.server.accept()
+        except BlockingIOError:
+            return
+        self.connection.setblocking(False)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def recv(self):
+        try:
+            data = self.connection.recv(4096)
+        except BlockingIOError:
+            return b''
+        except ConnectionError:
+            data = b''
+        if not data:
+            self.disconnect()
+        return data
+
+    def send(self, data):
+        if self.connection is None:
+            return len(data)
+        try:
+            return self.connection.send(data)
+        except ConnectionError:
+            self.disconnect()
+            return len(data)
+
+    def disconnect(self):
+        self.connection.close()
+        self.connection = None
+        self.pending.clear()
+        self.simulator.handleCommand(STOP_COMMAND, time.perf_counter())
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+        self.server.close()
+
+
+# measureThroughput(sampleRate, seconds, binaryMode, baudRate)
+# Stream simulated frames over a pty into the app's acquisition path (AcquisitionService reading a SerialTransport)
+# for a while and compare what was produced with what acquisition read:
+# {"sampleRate", "framesSent", "framesDropped", "framesReceived", "receivedRate"}
+def measureThroughput(sampleRate, seconds=5.0, binaryMode=False, baudRate=2000000):
+    import serial
+    from AsyncAcquisition import GloveSource, SerialTransport, runAcquisition
+
+    link = PtyLink(GloveSimulator(SyntheticSignals(), sampleRate)).start()
+    port = serial.Serial(link.path, baudRate, timeout=0)
+    received = [0]
+
+    def countFrame(*frame):
+        received[0] += 1
+
+    # The source sends the start and stop commands, as it does to a glove
+    source = GloveSource(SerialTransport(serialPort=port, resetDelay=0), binaryMode=binaryMode)
+    startTime = time.perf_counter()
+    deadline = startTime + seconds
+    runAcquisition([source], None, countFrame, startTime, lambda: time.perf_counter() < deadline)
+    elapsed = time.perf_counter() - startTime
+    port.close()
+    link.stop()
+
+    stats = link.simulator.stats()
+    return {"sampleRate": sampleRate, "framesSent": stats["framesSent"], "framesDropped": stats["framesDropped"],
+            "framesReceived": received[0], "receivedRate": received[0] / elapsed}
+
+
+# sweepRates(rates, seconds, binaryMode)
+# measureThroughput at each rate; returns the results and the highest rate acquisition sustained (no frames dropped
+# and at least 99% of the frames sent received), or None
+def sweepRates(rates, seconds=5.0, binaryMode=False):
+    results = []
+    sustained = None
+    for rate in sorted(rates):
+        result = measureThroughput(rate, seconds, binaryMode)
+        result["sustained"] = (result["framesDropped"] == 0 and
+                               result["framesReceived"] >= 0.99 * result["framesSent"])
+        if result["sustained"]:
+            sustained = rate
+        results.append(result)
+        print(f"{rate:5d} Hz: sent {result['framesSent']}, dropped {result['framesDropped']}, "
+              f"received {result['framesReceived']} ({result['receivedRate']:.0f}/s)"
+              f"{'' if result['sustained'] else '  <- not sustained'}")
+    return results, sustained
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulate a glove on a pseudo-terminal or TCP port")
+    parser.add_argument("--rate", type=float, default=1000,
+                        help=f"frames per second ({MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE})")
+    parser.add_argument("--recording", help="loop frames from this recording instead of synthesizing them")
+    parser.add_argument("--hand", choices=("R", "L"), default="R")
+    parser.add_argument("--tcp", type=int, metavar="PORT", help="serve on this TCP port instead of a pty")
+    parser.add_argument("--sweep", type=int, nargs="+", metavar="RATE",
+                        help="measure acquisition throughput at each rate over a pty and report the highest sustained")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each sweep step")
+    parser.add_argument("--binary", action="store_true", help="sweep using the binary frame protocol")
+    args = parser.parse_args()
+
+    if args.sweep:
+        _, sustained = sweepRates(args.sweep, args.seconds, args.binary)
+        print(f"Highest sustained rate: {sustained} Hz" if sustained else "No rate was sustained")
+        sys.exit(0)
+
+    signals = RecordingSignals(args.recording) if args.recording else SyntheticSignals()
+    simulator = GloveSimulator(signals, args.rate, args.hand)
+    if args.tcp:
+        link = TcpLink(simulator, port=args.tcp)
+        print(f"Simulated {args.hand} glove at {args.rate:g} Hz on tcp:localhost:{args.tcp}")
+    else:
+        link = PtyLink(simulator)
+        print(f"Simulated {args.hand} glove at {args.rate:g} Hz on {link.path}")
+    link.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    link.stop()
+    print(simulator.stats())
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+# Benchmark of the per-sample hot path, using GloveData.csv as fixture data:
+#   parse -> filter -> flex-to-angle -> RightHand -> AnimationWindow (-> labels)
+# Each stage is timed per sample and reported as samples/sec, p50/p99 latency and the
+# memory blocks (and bytes) allocated per sample, temporaries included. Runs headless with Qt's offscreen platform.
+#
+#   python HotPathBenchmark.py [--samples 5000] [--json results.json]
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('QT3D_RENDERER', 'opengl')
+
+from GloveProtocol import (NUM_CHANNELS, parseTextLine, fieldsToValues, encodeBinaryFrame,
+                           BinaryFrameDecoder, FRAME_SIZE)
+from FilterBank import FilterBank
+from ReplaySource import readRecording
+from PySideGraphicalDisplay import LowPassFilter, GloveMonitorWindow
+from FlexCalibration import FlexCalibration
+from Orientation import OrientationEngine, ACC_INDEX, GYRO_INDEX
+from SensorFusion import MadgwickFusion
+from RightHand import RightHand
+from AnimationWindow import AnimationWindow
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "GloveData.csv")
+
+
+# loadFixture(path, samples)
+# Fixture rows repeated until there are `samples` of them, as raw serial lines, fields and values
+def loadFixture(path, samples):
+    rows = [fields for _, fields in readRecording(path)]
+    rows = [rows[i % len(rows)] for i in range(samples)]
+    lines = [(','.join(fields) + '\r\n').encode('utf-8') for fields in rows]
+    values = np.array([fieldsToValues(fields, np.empty(NUM_CHANNELS)) for fields in rows])
+    frames = [encodeBinaryFrame(i, i * 10000, values[i], fields[NUM_CHANNELS].encode())
+              for i, fields in enumerate(rows)]
+    return rows, lines, values, frames
+
+
+# timeStage(name, stage, samples)
+# stage(i) processes sample i. Returns a dict of throughput, latency percentiles and allocation
+def timeStage(name, stage, samples):
+    # warm up caches and lazily created objects
+    for i in range(min(50, samples)):
+        stage(i)
+
+    latencies = np.empty(samples)
+    perf_counter_ns = time.perf_counter_ns
+    start = perf_counter_ns()
+    for i in range(samples):
+        t0 = perf_counter_ns()
+        stage(i)
+        latencies[i] = perf_counter_ns() - t0
+    total = (perf_counter_ns() - start) / 1e9
+
+    # Allocation is measured in a separate, shorter pass since tracing slows everything down
+    allocationSamples = min(samples, 500)
+    allocatedBlocks, allocatedBytes = countAllocations(stage, allocationSamples)
+    idleBlocks, idleBytes = countAllocations(idleStage, allocationSamples)
+
+    return {
+        "stage": name,
+        "samples": samples,
+        "samplesPerSec": samples / total,
+        "p50us": float(np.percentile(latencies, 50)) / 1000,
+        "p99us": float(np.percentile(latencies, 99)) / 1000,
+        "allocBlocksPerSample": max(allocatedBlocks - idleBlocks, 0) / allocationSamples,
+        "allocBytesPerSample": max(allocatedBytes - idleBytes, 0) / allocationSamples,
+    }
+
+
+# countAllocations(stage, samples)
+# Gross blocks and bytes allocated over `samples` calls of stage(i), outputs dropped. The allocator counters are
+# sampled at every Python call/return and C call/return inside the stage and only the increases are summed, so
+# temporaries freed before the sample ends are counted too. An object created and freed between two such events
+# (inside one C call, or within a loop of plain bytecode) is missed, so this is a lower bound
+def countAllocations(stage, samples):
+    getBlocks = sys.getallocatedblocks
+    getTracedMemory = tracemalloc.get_traced_memory
+    # last blocks, last bytes, allocated blocks, allocated bytes
+    state = [0, 0, 0, 0]
+
+    def profile(frame, event, arg):
+        blocks = getBlocks()
+        size = getTracedMemory()[0]
+        if blocks > state[0]:
+            state[2] += blocks - state[0]
+        if size > state[1]:
+            state[3] += size - state[1]
+        state[0] = blocks
+        state[1] = size
+
+    tracemalloc.start()
+    try:
+        for i in range(samples):
+            state[0] = getBlocks()
+            state[1] = getTracedMemory()[0]
+            sys.setprofile(profile)
+            stage(i)
+            sys.setprofile(None)
+    finally:
+        sys.setprofile(None)
+        tracemalloc.stop()
+    return state[2], state[3]
+
+
+# Stage that does nothing, to subtract the profiler's own per-sample allocations
+def idleStage(i):
+    return None
+
+
+def buildStages(rows, lines, values, frames):
+    stages = []
+
+    # ---------------------------------------------------- parsing ---------------------------------------------------
+    # Original path: data_acquire decoded/split the line, then updateData split and stripped it again
+    def parseLegacy(i):
+        data = lines[i].decode('utf-8').strip()
+        dataLine = data.split(',')
+        dataArray = [s.strip() for s in data.split(',')]
+        return [float(v) for v in dataArray[:NUM_CHANNELS]]
+    stages.append(("parse: text, legacy double split", parseLegacy))
+
+    out = np.empty(NUM_CHANNELS)
+
+    def parseText(i):
+        return fieldsToValues(parseTextLine(lines[i]), out)
+    stages.append(("parse: text, GloveProtocol", parseText))
+
+    decoder = BinaryFrameDecoder(capacity=4 * FRAME_SIZE)
+
+    def parseBinary(i):
+        decoder.feed(frames[i])
+        return decoder.nextFrame()
+    stages.append(("parse: binary frame", parseBinary))
+
+    # ---------------------------------------------------- filtering -------------------------------------------------
+    filters = [LowPassFilter(5, 100, order=2) for _ in range(NUM_CHANNELS)]
+
+    def filterPerChannel(i):
+        return [filters[c].update(rows[i][c]) for c in range(NUM_CHANNELS)]
+    stages.append(("filter: 41 x LowPassFilter.update", filterPerChannel))
+
+    bank = FilterBank(NUM_CHANNELS, 5, 100, order=2)
+
+    def filterBank(i):
+        return bank.update(values[i])
+    stages.append(("filter: FilterBank.update", filterBank))
+
+    # ------------------------------------------------- flex to angle ------------------------------------------------
+    # Original path: cubic fit evaluated with ** per finger, per sample
+    def flexToAngleLegacy(i):
+        frame = rows[i]
+        thumb = float(frame[0])
+        angles = [0.000005956 * thumb ** 3 - 0.001171 * thumb ** 2 + 0.2502 * thumb + 2.747]
+        for c in range(1, 5):
+            flex = float(frame[c])
+            angles.append(0.00001595 * flex ** 3 - 0.003083 * flex ** 2 + 0.4174 * flex + 0.8620)
+        return angles
+    stages.append(("kinematics: cubic polynomial, legacy", flexToAngleLegacy))
+
+    calibration = FlexCalibration.load()
+
+    def flexToAngle(i):
+        return calibration.angles(values[i, :5]).tolist()
+    stages.append(("kinematics: FlexCalibration table lookup", flexToAngle))
+
+    # -------------------------------------------------- orientation -------------------------------------------------
+    gyro = np.nan_to_num(values[:, GYRO_INDEX])
+    acc = values[:, ACC_INDEX]
+    dts = np.full(len(values), 0.01)
+    integrator = OrientationEngine()
+
+    def gyroIntegration(i):
+        return integrator.updateBlock(gyro[i:i + 1], dts[i:i + 1])
+    stages.append(("orientation: gyro integration, 6 IMUs", gyroIntegration))
+
+    fusion = MadgwickFusion()
+
+    def madgwickFusion(i):
+        return fusion.updateFusedBlock(gyro[i:i + 1], acc[i:i + 1], dts[i:i + 1])
+    stages.append(("orientation: Madgwick fusion, 6 IMUs", madgwickFusion))
+
+    blockFusion = MadgwickFusion()
+
+    def madgwickFusionBlocks(i):
+        # As processBlock fuses the ring buffer's frames: a block every 16th sample, so the cost is per sample
+        if i % 16 == 15:
+            return blockFusion.updateFusedBlock(gyro[i - 15:i + 1], acc[i - 15:i + 1], dts[i - 15:i + 1])
+    stages.append(("orientation: Madgwick fusion, 6 IMUs, 16-sample blocks", madgwickFusionBlocks))
+
+    # -------------------------------------------------- hand model --------------------------------------------------
+    hand = RightHand()
+
+    def handSetters(i):
+        hand.setFromFrame(calibration.angles(values[i, :5]))
+        hand.updateOrientation(values[i][38], values[i][39], values[i][40], 0.01)
+        return hand.j1Angles.tolist(), hand.j2Angles.tolist(), hand.getOrientationQuaternion()
+    stages.append(("hand: RightHand.setFromFrame + orientation", handSetters))
+
+    # -------------------------------------------------- animation ---------------------------------------------------
+    animation = AnimationWindow()
+
+    def animationSetters(i):
+        j1, j2, wrist = handSetters(i)
+        animation.setAnglesPointer(j1[1], j2[0])
+        animation.setAnglesMiddle(j1[2], j2[1])
+        animation.setAnglesRing(j1[3], j2[2])
+        animation.setAnglesPinky(j1[4], j2[3])
+        animation.setAngleThumb(j1[0])
+        animation.setOrientationPalmQuaternion(*wrist)
+    stages.append(("render: AnimationWindow.setAngles*/setOrientationPalmQuaternion", animationSetters))
+
+    posedAnimation = AnimationWindow()
+
+    def animationPose(i):
+        j1, j2, wrist = handSetters(i)
+        posedAnimation.setPose(j1, j2, wrist)
+    stages.append(("render: AnimationWindow.setPose (deadbanded)", animationPose))
+
+    stillPose = handSetters(0)
+
+    def animationStillPose(i):
+        posedAnimation.setPose(*stillPose)
+    stages.append(("render: AnimationWindow.setPose, hand still", animationStillPose))
+
+    # ----------------------------------------------- full display path ----------------------------------------------
+    window = GloveMonitorWindow(pumpEvents=False)
+    window.render_timer.stop()
+
+    def fullPath(i):
+        window.updateData(rows[i], i * 0.01)
+        window.processFrames()
+    stages.append(("end to end: updateData + processFrames", fullPath))
+
+    return stages, (animation, window)
+
+
+def printReport(results):
+    print(f"{'stage':<56}{'samples/s':>12}{'p50 us':>10}{'p99 us':>10}{'blocks':>10}{'alloc B':>10}")
+    for r in results:
+        print(f"{r['stage']:<56}{r['samplesPerSec']:>12.0f}{r['p50us']:>10.1f}{r['p99us']:>10.1f}"
+              f"{r['allocBlocksPerSample']:>10.1f}{r['allocBytesPerSample']:>10.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the per-sample glove processing hot path")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="recording used as input data")
+    parser.add_argument("--samples", type=int, default=5000, help="samples timed per stage")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    fixture = loadFixture(args.fixture, args.samples)
+    stages, keepAlive = buildStages(*fixture)
+    results = [timeStage(name, stage, args.samples) for name, stage in stages]
+
+    printReport(results)
+    if args.json:
+        with open(args.json, 'w') as jsonFile:
+            json.dump({"python": sys.version.split()[0], "fixture": args.fixture, "results": results}, jsonFile, indent=2)
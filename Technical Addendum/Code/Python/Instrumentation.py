@@ -0,0 +1,123 @@
+import json
+import os
+import time
+
+# Switchable per-stage latency instrumentation for the acquisition/display hot path.
+#
+#   t0 = instrumentation.start()
+#   ...stage...
+#   instrumentation.stop('filter', t0)
+#
+# start() returns 0 while instrumentation is disabled and stop() ignores a 0 start time, so the
+# disabled cost is one attribute check per call. Set GLOVE_INSTRUMENTATION=1 to enable at startup.
+
+# Stages recorded by the application, in display order
+STAGES = ('acquire', 'updateData', 'filter', 'updateDisplay', 'labels', 'animation')
+
+# Histogram resolution: SUB_BUCKETS buckets per power of two of nanoseconds
+SUB_BITS = 2
+SUB_BUCKETS = 1 << SUB_BITS
+NUM_BUCKETS = 64 * SUB_BUCKETS
+
+
+# bucketIndex(ns)
+# Log-linear bucket for a duration in nanoseconds: the power of two, refined by the next SUB_BITS bits
+def bucketIndex(ns):
+    bits = ns.bit_length()
+    if bits <= SUB_BITS:
+        return ns
+    return ((bits - SUB_BITS) << SUB_BITS) + ((ns >> (bits - SUB_BITS - 1)) & (SUB_BUCKETS - 1))
+
+
+# bucketUpperBound(index)
+# Largest duration (ns) that falls into a bucket
+def bucketUpperBound(index):
+    if index < SUB_BUCKETS:
+        return index
+    bits = (index >> SUB_BITS) + SUB_BITS
+    sub = index & (SUB_BUCKETS - 1)
+    return ((SUB_BUCKETS + sub + 1) << (bits - SUB_BITS - 1)) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of durations in nanoseconds.
+
+    Buckets are preallocated; recording a sample only increments counters, so
+    percentiles are accurate to within one bucket (about 12%).
+    """
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[bucketIndex(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        target = self.count * p / 100.0
+        seen = 0
+        for index, bucketCount in enumerate(self.counts):
+            seen += bucketCount
+            if bucketCount and seen >= target:
+                return min(bucketUpperBound(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def reset(self):
+        for i in range(NUM_BUCKETS):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def summary(self):
+        # Durations in microseconds
+        return {"count": self.count, "meanUs": self.mean() / 1000, "p50Us": self.percentile(50) / 1000,
+                "p99Us": self.percentile(99) / 1000, "maxUs": self.max / 1000}
+
+
+class Instrumentation:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+
+    def start(self):
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, stage, startNs):
+        if startNs:
+            self.histograms[stage].record(time.perf_counter_ns() - startNs)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self):
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def formatTable(self):
+        lines = [f"{'stage':<14}{'n':>8}{'p50 us':>9}{'p99 us':>9}{'max us':>9}"]
+        for stage, histogram in self.histograms.items():
+            if histogram.count:
+                s = histogram.summary()
+                lines.append(f"{stage:<14}{s['count']:>8}{s['p50Us']:>9.0f}{s['p99Us']:>9.0f}{s['maxUs']:>9.0f}")
+        return '\n'.join(lines)
+
+    def dumpJson(self, path):
+        with open(path, 'w') as jsonFile:
+            json.dump({"unit": "microseconds", "stages": self.summary()}, jsonFile, indent=2)
+
+
+# Shared by every module on the hot path
+instrumentation = Instrumentation(enabled=os.environ.get('GLOVE_INSTRUMENTATION', '') not in ('', '0'))
@@ -0,0 +1,113 @@
+import math
+import numpy as np
+
+SEQUENCE_MODULUS = 1 << 16      # binary frame sequence numbers are uint16
+DEVICE_CLOCK_MODULUS = 1 << 32  # binary frame device timestamps are uint32 microseconds
+
+
+class LatencyTracker:
+    """
+    Glove-to-scene latency, measured per sample from the frame's own timing data.
+
+      device -> host    host receive time minus device timestamp. The two clocks share no epoch,
+                        so this is reported as the excess over the smallest offset seen in the
+                        last one or two offsetWindow periods (i.e. queueing and transfer jitter).
+      host -> filter    receive time to the render tick that filtered the sample
+      filter -> scene   filtering to the AnimationWindow update of the rendered sample
+
+    Gaps in the device sequence numbers are counted as dropped frames. Frames without a
+    sequence number or device time (text protocol) only contribute the host-side stages.
+    Values are smoothed with an exponential moving average.
+    """
+
+    def __init__(self, smoothing=0.05, offsetWindow=10.0):
+        self.smoothing = smoothing
+        self.offsetWindow = offsetWindow
+
+        # Exponential moving averages, seconds (NaN until the first measurement)
+        self.deviceToHost = math.nan
+        self.hostToFilter = math.nan
+        self.filterToScene = math.nan
+
+        # Sequence tracking
+        self.lastSequence = None
+        self.framesDropped = 0
+        self.framesSeen = 0
+
+        # Device clock unwrapping and offset estimation
+        self.lastDeviceRaw = None
+        self.deviceWraps = 0
+        self.offsetMin = math.inf
+        self.previousOffsetMin = math.inf
+        self.offsetWindowStart = None
+
+    def smooth(self, average, value):
+        if math.isnan(average):
+            return value
+        return average + self.smoothing * (value - average)
+
+    def onSamples(self, sequences, deviceTimes, receivedAt, filteredAt):
+        """
+        Account for a block of samples filtered together at time filteredAt.
+
+        Args:
+            sequences: int array, -1 where the frame carried no sequence number
+            deviceTimes: float array of device timestamps in microseconds, NaN where absent
+            receivedAt: float array of host perf_counter receive times
+            filteredAt: host perf_counter time the block was filtered
+        """
+        count = len(receivedAt)
+        if not count:
+            return
+        self.framesSeen += count
+        self.hostToFilter = self.smooth(self.hostToFilter, filteredAt - float(receivedAt.mean()))
+
+        sequenced = sequences >= 0
+        if sequenced.any():
+            seq = sequences[sequenced]
+            steps = np.diff(seq) % SEQUENCE_MODULUS
+            if self.lastSequence is not None:
+                first = (int(seq[0]) - self.lastSequence) % SEQUENCE_MODULUS
+                self.framesDropped += max(first - 1, 0)
+            self.framesDropped += int(np.maximum(steps - 1, 0).sum())
+            self.lastSequence = int(seq[-1])
+
+        timed = ~np.isnan(deviceTimes)
+        if timed.any():
+            deviceSeconds = self.unwrapDeviceTimes(deviceTimes[timed]) * 1e-6
+            offsets = receivedAt[timed] - deviceSeconds
+
+            # Windowed minimum offset: follows slow drift between the two clocks
+            now = float(receivedAt[-1])
+            if self.offsetWindowStart is None:
+                self.offsetWindowStart = now
+            elif now - self.offsetWindowStart > self.offsetWindow:
+                self.previousOffsetMin = self.offsetMin
+                self.offsetMin = math.inf
+                self.offsetWindowStart = now
+            self.offsetMin = min(self.offsetMin, float(offsets.min()))
+            baseline = min(self.offsetMin, self.previousOffsetMin)
+            self.deviceToHost = self.smooth(self.deviceToHost, float(offsets.mean()) - baseline)
+
+    def unwrapDeviceTimes(self, raw):
+        # Continue the device clock across uint32 microsecond wraparounds
+        steps = np.diff(raw, prepend=raw[0] if self.lastDeviceRaw is None else self.lastDeviceRaw)
+        wraps = self.deviceWraps + np.cumsum(steps < -DEVICE_CLOCK_MODULUS / 2)
+        self.deviceWraps = int(wraps[-1])
+        self.lastDeviceRaw = float(raw[-1])
+        return raw + wraps * float(DEVICE_CLOCK_MODULUS)
+
+    def onSceneUpdate(self, filteredAt, sceneAt):
+        self.filterToScene = self.smooth(self.filterToScene, sceneAt - filteredAt)
+
+    def summary(self):
+        return {"deviceToHostMs": self.deviceToHost * 1000, "hostToFilterMs": self.hostToFilter * 1000,
+                "filterToSceneMs": self.filterToScene * 1000, "framesDropped": self.framesDropped,
+                "framesSeen": self.framesSeen}
+
+    def formatLabel(self):
+        def ms(value):
+            return '--' if math.isnan(value) else f'{value * 1000:.1f}'
+        dropped = f'{self.framesDropped}' if self.lastSequence is not None else '--'
+        return (f'Latency (ms): device→host {ms(self.deviceToHost)} | host→filter {ms(self.hostToFilter)}'
+                f' | filter→scene {ms(self.filterToScene)} | dropped {dropped}')
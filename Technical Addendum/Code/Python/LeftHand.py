@@ -0,0 +1,12 @@
+from RightHand import RightHand, RIGHT_HAND_SEGMENTS
+
+
+# The left hand mirrors the right: same segments and hand state layout, thumb on the other side.
+# Each glove's IMUs report in their own right-handed frames, so orientations are used as they are;
+# the mirroring is only in where things are drawn (AnimationWindow(mirrored=True), ForwardKinematics.LEFT_HAND_BASES)
+LEFT_HAND_SEGMENTS = RIGHT_HAND_SEGMENTS
+
+
+class LeftHand(RightHand):
+    HAND = 'L'
+    SEGMENT_LENGTHS = LEFT_HAND_SEGMENTS
@@ -0,0 +1,165 @@
+import math
+import numpy as np
+
+# Quaternions are (w, x, y, z) with w the scalar part
+
+# IMUs in frame order, and the first of each one's accelerometer / gyro X, Y, Z channels in the 41-channel frame.
+# Finger IMUs report m/s^2 and rad/s; the wrist reports g and dps, its gyro is converted to rad/s before filtering
+IMUS = ('thumb', 'pointer', 'middle', 'ring', 'pinky', 'wrist')
+ACC_CHANNELS = (5, 11, 17, 23, 29, 35)
+GYRO_CHANNELS = (8, 14, 20, 26, 32, 38)
+WRIST = IMUS.index('wrist')
+
+# Index arrays selecting every IMU's X, Y, Z from a frame: frame[..., GYRO_INDEX] is (..., 6, 3)
+ACC_INDEX = np.array([[c, c + 1, c + 2] for c in ACC_CHANNELS])
+GYRO_INDEX = np.array([[c, c + 1, c + 2] for c in GYRO_CHANNELS])
+
+
+# quatMultiply(p, q)
+# Hamilton product p * q of (..., 4) arrays
+def quatMultiply(p, q):
+    pw, px, py, pz = np.moveaxis(p, -1, 0)
+    qw, qx, qy, qz = np.moveaxis(q, -1, 0)
+    return np.stack((pw * qw - px * qx - py * qy - pz * qz,
+                     pw * qx + px * qw + py * qz - pz * qy,
+                     pw * qy - px * qz + py * qw + pz * qx,
+                     pw * qz + px * qy - py * qx + pz * qw), axis=-1)
+
+
+# quatConjugate(q)
+# Inverse of (..., 4) unit quaternions
+def quatConjugate(q):
+    return np.asarray(q, dtype=float) * (1.0, -1.0, -1.0, -1.0)
+
+
+# quatRotate(q, v)
+# Rotate (..., 3) vectors by (..., 4) unit quaternions (shapes broadcast)
+def quatRotate(q, v):
+    q = np.asarray(q, dtype=float)
+    w = q[..., :1]
+    u = q[..., 1:]
+    t = 2 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
+
+
+# quatFromRotationVector(rotation)
+# Unit quaternion rotating by |rotation| radians about rotation's direction, for (..., 3) arrays
+def quatFromRotationVector(rotation):
+    angle = np.linalg.norm(rotation, axis=-1, keepdims=True)
+    half = angle / 2
+    # sin(a/2)/a -> 1/2 as a -> 0
+    scale = np.where(angle > 1e-12, np.sin(half) / np.where(angle > 1e-12, angle, 1), 0.5)
+    return np.concatenate((np.cos(half), rotation * scale), axis=-1)
+
+
+# quatToEulerDegrees(q)
+# Roll (X), pitch (Y), yaw (Z) in degrees, 0-360, of (..., 4) quaternions (Z-Y-X convention)
+def quatToEulerDegrees(q):
+    w, x, y, z = np.moveaxis(np.asarray(q, dtype=float), -1, 0)
+    roll = np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    pitch = np.arcsin(np.clip(2 * (w * y - z * x), -1, 1))
+    yaw = np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    return np.degrees(np.stack((roll, pitch, yaw), axis=-1)) % 360
+
+
+# integrateQuaternion(q, gyroX, gyroY, gyroZ, dt)
+# One body-rate step for a single (w, x, y, z) tuple in plain floats, the per-sample fast path
+def integrateQuaternion(q, gyroX, gyroY, gyroZ, dt):
+    angle = math.sqrt(gyroX * gyroX + gyroY * gyroY + gyroZ * gyroZ) * dt
+    if angle < 1e-12:
+        return q
+    half = angle / 2
+    scale = math.sin(half) * dt / angle
+    dw, dx, dy, dz = math.cos(half), gyroX * scale, gyroY * scale, gyroZ * scale
+    w, x, y, z = q
+    w, x, y, z = (w * dw - x * dx - y * dy - z * dz,
+                  w * dx + x * dw + y * dz - z * dy,
+                  w * dy - x * dz + y * dw + z * dx,
+                  w * dz + x * dy - y * dx + z * dw)
+    norm = math.sqrt(w * w + x * x + y * y + z * z)
+    return w / norm, x / norm, y / norm, z / norm
+
+
+class OrientationEngine:
+    """
+    Unit quaternion orientation per IMU, integrated from body-frame gyro rates.
+
+    Each step rotates by the gyro rate times the measured interval since the previous
+    sample, so combined rotations compose correctly and a varying sample rate does
+    not distort the result. Intervals are clamped to maxDt so a pause in the stream
+    does not turn the next sample into a large jump; non-positive intervals are skipped.
+
+    Args:
+        numImus: number of IMUs tracked (default: the six in IMUS)
+        maxDt: longest interval (s) integrated in one step
+        quaternions: optional (numImus, 4) array to keep the orientations in, e.g. a view of a larger
+                     state array; it is only ever updated in place
+    """
+
+    def __init__(self, numImus=len(IMUS), maxDt=0.5, quaternions=None):
+        self.maxDt = maxDt
+        self.quaternions = np.zeros((numImus, 4)) if quaternions is None else quaternions
+        self.reset()
+
+    def reset(self, index=None):
+        if index is None:
+            self.quaternions[:] = (1.0, 0.0, 0.0, 0.0)
+        else:
+            self.quaternions[index] = (1.0, 0.0, 0.0, 0.0)
+
+    def clampDt(self, dt):
+        return min(dt, self.maxDt) if dt > 0 else 0.0
+
+    def updateImu(self, index, gyroX, gyroY, gyroZ, dt):
+        # One sample for one IMU, rates in rad/s
+        dt = self.clampDt(dt)
+        if dt:
+            self.quaternions[index] = integrateQuaternion(self.quaternions[index].tolist(), gyroX, gyroY, gyroZ, dt)
+
+    def update(self, gyroRadss, dt):
+        # One sample for every IMU: gyroRadss is (numImus, 3) in rad/s
+        dt = self.clampDt(dt)
+        if dt:
+            q = quatMultiply(self.quaternions, quatFromRotationVector(np.asarray(gyroRadss, dtype=float) * dt))
+            self.quaternions[:] = q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+    def updateBlock(self, gyroRadss, dts):
+        """
+        Integrate a block of samples for every IMU.
+
+        Args:
+            gyroRadss: (N, numImus, 3) rates in rad/s
+            dts: (N,) interval before each sample in seconds
+
+        Returns:
+            (numImus, 4) quaternions after the last sample
+        """
+        # Plain float math: per-sample numpy calls on 4-element quaternions cost more than the arithmetic
+        quaternions = [tuple(q) for q in self.quaternions.tolist()]
+        maxDt = self.maxDt
+        for sample, dt in zip(np.asarray(gyroRadss, dtype=float).tolist(), np.asarray(dts, dtype=float).tolist()):
+            if dt > 0:
+                dt = min(dt, maxDt)
+                quaternions = [integrateQuaternion(q, gyroX, gyroY, gyroZ, dt)
+                               for q, (gyroX, gyroY, gyroZ) in zip(quaternions, sample)]
+        self.quaternions[:] = quaternions
+        return self.quaternions
+
+    def updateImuBlock(self, index, gyroRadss, dts):
+        # Block of samples for one IMU: gyroRadss is (N, 3); returns the (N, 4) quaternions after each sample
+        q = tuple(self.quaternions[index].tolist())
+        maxDt = self.maxDt
+        history = []
+        for (gyroX, gyroY, gyroZ), dt in zip(np.asarray(gyroRadss, dtype=float).tolist(),
+                                             np.asarray(dts, dtype=float).tolist()):
+            if dt > 0:
+                q = integrateQuaternion(q, gyroX, gyroY, gyroZ, min(dt, maxDt))
+            history.append(q)
+        self.quaternions[index] = q
+        return np.array(history).reshape(len(history), 4)
+
+    def quaternion(self, index=WRIST):
+        return tuple(self.quaternions[index].tolist())
+
+    def eulerDegrees(self, index=WRIST):
+        return quatToEulerDegrees(self.quaternions[index]).tolist()
@@ -1,11 +1,51 @@
 from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QWidget, QGridLayout, QPushButton
 from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFontDatabase
 from scipy import signal
-from collections import deque
 from RightHand import RightHand  # Assuming this is your hand model class
+from LeftHand import LeftHand
 import time
 from AnimationWindow import AnimationWindow
 import math
+import numpy as np
+from FilterBank import FilterBank, designLowPass, RATE_BUCKET_STEP
+from GloveProtocol import fieldsToValues
+from FrameRingBuffer import FrameRingBuffer, FrameBlock
+from Instrumentation import instrumentation
+from LatencyTracker import LatencyTracker
+from SampleRateEstimator import SampleRateEstimator
+from StripChart import StripChartWindow
+from FlexCalibration import FlexCalibration
+from Orientation import ACC_INDEX, GYRO_INDEX
+
+# Channels each view's readouts show, as indices into the 41-channel frame:
+# finger views flex, gyro X/Y/Z, acc X/Y/Z (labels 1-7); the wrist view gyro X/Y/Z, acc X/Y/Z (labels 2-7)
+FINGER_VIEW_CHANNELS = {'Thumb': (0, 8, 9, 10, 5, 6, 7),
+                        'Pointer': (1, 14, 15, 16, 11, 12, 13),
+                        'Middle': (2, 20, 21, 22, 17, 18, 19),
+                        'Ring': (3, 26, 27, 28, 23, 24, 25),
+                        'Pinky': (4, 32, 33, 34, 29, 30, 31)}
+WRIST_VIEW_CHANNELS = (38, 39, 40, 35, 36, 37)
+VIEW_FINGERS = ('Thumb', 'Pointer', 'Middle', 'Ring', 'Pinky')
+
+# Readout text, formatted once per label refresh with these prebuilt format methods
+READING_FORMAT = '{:.2f}'.format
+TIMESTAMP_FORMAT = 'Timestamp: {:.3f}s'.format
+SAMPLE_RATE_FORMAT = 'Sample Rate: {:.1f} Hz'.format
+DATA_LABEL_FORMATS = ('Flex: {}'.format, 'Gyro X: {}'.format, 'Gyro Y: {}'.format, 'Gyro Z: {}'.format,
+                      'Acc X: {}'.format, 'Acc Y: {}'.format, 'Acc Z: {}'.format, 'Flex Angle (deg): {}'.format)
+ORIENTATION_FORMAT = 'Wrist Orientation (deg):\nX = {}\nY = {}\nZ = {}'.format
+
+
+# formatReading(value)
+# A filtered reading to two decimals, '--' if it is unreadable ('E' or NaN)
+def formatReading(value):
+    try:
+        value = float(value)
+    except (ValueError, TypeError):
+        return '--'
+    return '--' if value != value else READING_FORMAT(value)
+
 
 # CRITICAL: Create QApplication instance ONCE at module level
 # This must exist before any Qt widgets are created
@@ -16,15 +56,7 @@ if app is None:
 
 class LowPassFilter:
     def __init__(self, cutoff_freq=5, sample_rate=100, order=2):
-        if sample_rate < 1:
-            sample_rate = 100
-        nyquist = sample_rate / 2
-        if cutoff_freq >= nyquist:
-            cutoff_freq = nyquist * 0.9
-        normal_cutoff = cutoff_freq / nyquist
-        if not (0 < normal_cutoff < 1):
-            normal_cutoff = 0.1
-        self.b, self.a = signal.butter(order, normal_cutoff, btype='low')
+        self.b, self.a = designLowPass(cutoff_freq, sample_rate, order)
         self.zi = signal.lfilter_zi(self.b, self.a)
 
     def update(self, new_value):
@@ -36,22 +68,153 @@ class LowPassFilter:
             return new_value
 
 
-class GloveMonitorWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle('Acquisition Window')
+class HandPipeline:
+    """
+    Everything the display keeps per glove: filters, hand model, sample timing, latency and animation.
 
-        self.rightHand = RightHand()
+    With both gloves connected their frames arrive interleaved in one stream; each glove's
+    samples go through its own pipeline so neither disturbs the other's filter state,
+    sample intervals or dropped-frame count.
+
+    Args:
+        hand: hand code from the frame's Hand column, 'R' or 'L' (the left hand is drawn mirrored)
+        sample_rate: initial filter sample rate in Hz, until it is estimated from the data
+        cutoff_freq: low-pass cutoff frequency in Hz
+    """
+
+    def __init__(self, hand, sample_rate=100, cutoff_freq=5):
+        self.hand = hand
+        self.model = (LeftHand if hand == 'L' else RightHand)(historyLength=600)  # last 600 rendered poses
+        self.animationView = AnimationWindow(mirrored=hand == 'L', segmentLengths=self.model.segmentLengths.tolist())
         self.currentData = None
         self.filteredData = None
+        self.flexAngles = None
         self.currentTimestamp = None
+
+        # Previous sample's host timestamp and device time (us), for measured orientation intervals
+        self.last_sample_time = None
+        self.last_device_time = None
+        # Rate estimated from the same intervals; the filters are retuned in place when it moves
+        self.rateEstimator = SampleRateEstimator(initialRate=sample_rate)
+        self.estimated_sample_rate = sample_rate
+
+        self.initializeFilters(sample_rate, cutoff_freq)
+
+        # Device -> host -> filter -> scene latency and dropped frames, from sequence numbers and device time
+        self.latencyTracker = LatencyTracker()
+        self.last_scene_update = None
+
+    def initializeFilters(self, sample_rate, cutoff_freq=5):
+        # One bank filters all 41 channels: flex (0-4), finger acc/gyro (5-34), wrist acc (35-37), wrist gyro (38-40)
+        self.filterBank = FilterBank(41, cutoff_freq, sample_rate, order=2)
+
+    def updateSampleRate(self, intervals):
+        # Estimate the rate from a block's sample intervals. Once it is more than a rate bucket away from the
+        # filters' rate, swap their coefficients (state carried over, designs cached per bucket) rather than
+        # rebuilding and resetting them; the bucket's width keeps jitter from retuning back and forth
+        self.estimated_sample_rate = self.rateEstimator.update(intervals)
+        if abs(self.estimated_sample_rate / self.filterBank.sample_rate - 1) > RATE_BUCKET_STEP:
+            self.filterBank.setSampleRate(self.estimated_sample_rate)
+            print(f"Sample rate updated to: {self.estimated_sample_rate:.1f} Hz ({self.hand})")
+
+    def sampleIntervals(self, block):
+        # Seconds between consecutive samples: device time when every frame has it (binary frames),
+        # otherwise the acquisition timestamps. The first sample ever gets 0 (no rotation)
+        if not np.isnan(block.deviceTimes).any():
+            previous = block.deviceTimes[0] if self.last_device_time is None else self.last_device_time
+            dts = np.diff(block.deviceTimes, prepend=previous) * 1e-6
+            dts[dts < -2147.483648] += 4294.967296  # uint32 microsecond counter wrapped
+            self.last_device_time = block.deviceTimes[-1]
+        else:
+            previous = block.timestamps[0] if self.last_sample_time is None else self.last_sample_time
+            dts = np.diff(block.timestamps, prepend=previous)
+        self.last_sample_time = block.timestamps[-1]
+        return dts
+
+    def processBlock(self, block):
+        """
+        Filter a block of this glove's frames and integrate every IMU over it.
+
+        Returns:
+            host perf_counter time the block was filtered
+        """
+        values, timestamps, hands = block.values, block.timestamps, block.hands
+
+        # Wrist Gyro X, Y, Z (dps -> rad/s) so filtered output is always rad/s
+        values[:, 38:41] *= math.pi / 180.0
+
+        filtered = self.filterBank.updateBlock(values)
+        filteredAt = time.perf_counter()
+        self.latencyTracker.onSamples(block.sequences, block.deviceTimes, block.receivedAt, filteredAt)
+
+        # Fuse every IMU's gyro and accelerometer over every sample, not just the rendered one,
+        # using the measured interval before each sample. Unreadable gyros read as no rotation
+        intervals = self.sampleIntervals(block)
+        self.model.updateImuOrientations(filtered[:, GYRO_INDEX], intervals, filtered[:, ACC_INDEX])
+
+        # The same intervals (device or acquisition time, never the render tick's) give the sample rate
+        self.updateSampleRate(intervals)
+        self.model.updateSampleRate(self.estimated_sample_rate)
+
+        # unreadable values pass through as 'E', except wrist gyro which reads as no rotation
+        filteredArray = filtered[-1].tolist()
+        for i in np.flatnonzero(np.isnan(values[-1])):
+            filteredArray[i] = 0.0 if i >= 38 else 'E'
+
+        # Hand indicator (41)
+        filteredArray.append(hands[-1])
+
+        self.currentData = values[-1]
+        self.currentTimestamp = timestamps[-1]
+        self.filteredData = filteredArray
+        return filteredAt
+
+    def updateAnimation(self, flexAngles, timestamp):
+        # Store the frame's joint angles in the hand model and pose the animation from it
+        self.last_scene_update = None
+        if np.isnan(flexAngles).any():
+            print(f"Waiting for Legible Flex Values: {self.filteredData[:5]}")
+            return
+        self.model.setFromFrame(flexAngles)
+
+        # Pose the fingers and wrist (integrated per sample in processBlock) in one call; only joints that
+        # moved past the animation's deadbands are pushed to the scene
+        self.animationView.setPose(self.model.j1Angles.tolist(), self.model.j2Angles.tolist(),
+                                   self.model.getOrientationQuaternion())
+        self.last_scene_update = time.perf_counter()
+        self.model.snapshot(timestamp)
+
+
+class GloveMonitorWindow(QMainWindow):
+    def __init__(self, pumpEvents=True, labelRate=15):
+        # pumpEvents: keep Qt responsive from a foreign event loop (SensorRead3.0's Tk mainloop) by processing
+        # Qt events every 10 ms. Leave it off when Qt's own event loop runs (GloveControlPanel, app.exec())
+        # labelRate: how often (Hz) the numeric readouts are refreshed; the animation follows every render tick
+        super().__init__()
+        self.setWindowTitle('Acquisition Window')
+
+        # Flex reading to joint angle tables, fitted coefficients from FlexCalibration.json
+        self.flexCalibration = FlexCalibration.load()
         self.currentView = 'Thumb'
 
-        self.last_update_time = None
-        self.sample_intervals = deque(maxlen=50)
-        self.estimated_sample_rate = 10
+        # One pipeline per glove, by hand code. The right hand is always shown; the left hand's
+        # pipeline and mirrored animation are added when its first frame arrives
+        self.hands = {}
+        self.currentHand = 'R'
+        self.displayOpen = False
+        self.rightHand = self.pipeline('R').model
+
+        # Frames parsed on the acquisition thread wait here until the next render tick
+        self.frameBuffer = FrameRingBuffer(capacity=4096, num_channels=41)
+        self.display_rate = 60  # Hz
 
-        self.initializeFilters(sample_rate=100, cutoff_freq=5)
+        # Readouts are refreshed at label_rate from the latest filtered state, and a label's text is only
+        # set when it changes (the text each label shows is cached here)
+        self.label_rate = labelRate
+        self.last_label_update = 0.0
+        self.labelTexts = {}
+
+        self.last_latency_update = 0.0
 
         container = QWidget()
         self.setCentralWidget(container)
@@ -73,12 +236,34 @@ class GloveMonitorWindow(QMainWindow):
         wristView = viewSelectMenu.addAction('Wrist')
         wristView.triggered.connect(lambda: self.changeView('Wrist'))
 
+        # Which glove's readings the labels show when both are connected
+        handSelectMenu = menuBar.addMenu('Hand')
+        rightHandView = handSelectMenu.addAction('Right')
+        rightHandView.triggered.connect(lambda: self.changeHand('R'))
+        leftHandView = handSelectMenu.addAction('Left')
+        leftHandView.triggered.connect(lambda: self.changeHand('L'))
+
+        # Scrolling plots of the selected glove's raw channels at full rate, see StripChart.py
+        self.stripChart = None
+        plotAction = menuBar.addAction('Plot')
+        plotAction.triggered.connect(self.openStripChart)
+
+        # Per-stage latency instrumentation, see Instrumentation.py
+        self.statsAction = menuBar.addAction('Stats')
+        self.statsAction.setCheckable(True)
+        self.statsAction.setChecked(instrumentation.enabled)
+        self.statsAction.toggled.connect(self.toggleStats)
+        self.last_stats_update = 0.0
+
         self.timestampLabel = QLabel('Timestamp: --')
         self.timestampLabel.setAlignment(Qt.AlignCenter)
 
         self.sampleRateLabel = QLabel('Sample Rate: -- Hz')
         self.sampleRateLabel.setAlignment(Qt.AlignCenter)
 
+        self.latencyLabel = QLabel(self.hands['R'].latencyTracker.formatLabel())
+        self.latencyLabel.setAlignment(Qt.AlignCenter)
+
         self.viewTitleLabel = QLabel('Thumb Data')
         self.viewTitleLabel.setAlignment(Qt.AlignCenter)
         self.viewTitleLabel.setStyleSheet("font-weight: bold; font-size: 14pt;")
@@ -110,16 +295,27 @@ class GloveMonitorWindow(QMainWindow):
         self.dataLabel9 = QLabel('Wrist Orientation (deg): --')
         self.dataLabel9.setAlignment(Qt.AlignCenter)
 
+        self.statsLabel = QLabel('')
+        self.statsLabel.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.statsLabel.setVisible(instrumentation.enabled)
+
+        self.dataLabels = (self.dataLabel1, self.dataLabel2, self.dataLabel3, self.dataLabel4,
+                           self.dataLabel5, self.dataLabel6, self.dataLabel7, self.dataLabel8)
+
         self.gyroResetButton = QPushButton("Zero Gyro", self)
         self.gyroResetButton.clicked.connect(self.zeroGyros)
 
-        # Create animation window
-        self.animationView = AnimationWindow()
+        # Setup a timer to process Qt events periodically, only needed under another toolkit's event loop
+        self.event_timer = None
+        if pumpEvents:
+            self.event_timer = QTimer()
+            self.event_timer.timeout.connect(self.process_events)
+            self.event_timer.start(10)  # Process events every 10ms
 
-        # Setup a timer to process Qt events periodically
-        self.event_timer = QTimer()
-        self.event_timer.timeout.connect(self.process_events)
-        self.event_timer.start(10)  # Process events every 10ms
+        # Render tick: filter every buffered sample, then draw the latest state
+        self.render_timer = QTimer()
+        self.render_timer.timeout.connect(self.processFrames)
+        self.render_timer.start(int(1000 / self.display_rate))
 
         self.setupLayout()
 
@@ -127,42 +323,30 @@ class GloveMonitorWindow(QMainWindow):
         """Process Qt events - necessary when running with Tkinter"""
         QApplication.processEvents()
 
-    def initializeFilters(self, sample_rate, cutoff_freq=5):
-        self.flex_filters = [LowPassFilter(cutoff_freq, sample_rate, order=2) for _ in range(5)]
-        self.gyro_filters = [LowPassFilter(cutoff_freq, sample_rate, order=2) for _ in range(18)]
-        self.acc_filters = [LowPassFilter(cutoff_freq, sample_rate, order=2) for _ in range(18)]
-
-    def updateSampleRate(self):
-        current_time = time.time()
-
-        if self.last_update_time is not None:
-            interval = current_time - self.last_update_time
-            if interval > 0:
-                self.sample_intervals.append(interval)
-
-                if len(self.sample_intervals) >= 10:
-                    avg_interval = sum(self.sample_intervals) / len(self.sample_intervals)
-                    new_sample_rate = 1.0 / avg_interval
-
-                    if abs(new_sample_rate - self.estimated_sample_rate) > 10:
-                        self.estimated_sample_rate = new_sample_rate
-                        self.initializeFilters(self.estimated_sample_rate)
-                        print(f"Sample rate updated to: {self.estimated_sample_rate:.1f} Hz")
-                    else:
-                        self.estimated_sample_rate = new_sample_rate
-
-                    self.sampleRateLabel.setText(f'Sample Rate: {self.estimated_sample_rate:.1f} Hz')
-
-        self.last_update_time = current_time
+    def pipeline(self, hand):
+        # The glove's pipeline, created on its first frame; anything but 'L' is the right hand.
+        # Only the frame path calls this: display lookups use self.hands.get, so selecting a glove that is not
+        # connected opens no animation window
+        hand = 'L' if hand == 'L' else 'R'
+        pipeline = self.hands.get(hand)
+        if pipeline is None:
+            pipeline = self.hands[hand] = HandPipeline(hand)
+            if self.displayOpen:
+                pipeline.animationView.show()
+        return pipeline
 
     def setupLayout(self):
         for i in reversed(range(self.layout.count())):
             self.layout.itemAt(i).widget().setParent(None)
 
         self.layout.addWidget(self.timestampLabel, 0, 0, 1, 3)
-        self.layout.addWidget(self.sampleRateLabel, 1, 0, 1, 3)
+        self.layout.addWidget(self.sampleRateLabel, 1, 0)
+        self.layout.addWidget(self.latencyLabel, 1, 1, 1, 2)
         self.layout.addWidget(self.viewTitleLabel, 2, 0, 1, 3)
 
+        # Stats panel along the bottom, shown while instrumentation is on
+        self.layout.addWidget(self.statsLabel, 7, 0, 1, 3)
+
         if self.currentView == 'Wrist':
             # Hide flex-related labels for wrist view
             self.dataLabel1.hide()
@@ -208,249 +392,170 @@ class GloveMonitorWindow(QMainWindow):
 
     def changeView(self, viewName):
         self.currentView = viewName
-        self.viewTitleLabel.setText(f'{viewName} Data')
+        self.viewTitleLabel.setText(f"{'Left ' if self.currentHand == 'L' else ''}{viewName} Data")
         self.setupLayout()
-        if self.filteredData is not None:
-            self.updateDisplay(self.filteredData, self.currentTimestamp)
+        current = self.hands.get(self.currentHand)
+        if current is not None and current.filteredData is not None and current.flexAngles is not None:
+            self.updateLabels(current)
+
+    def changeHand(self, hand):
+        self.currentHand = hand
+        self.changeView(self.currentView)
 
     def initDisplay(self):
         self.show()
-        self.animationView.show()
+        self.displayOpen = True
+        for pipeline in self.hands.values():
+            pipeline.animationView.show()
 
     def terminateDisplay(self):
         if self.event_timer:
             self.event_timer.stop()
-        if self.animationView:
-            self.animationView.close()
+        if self.render_timer:
+            self.render_timer.stop()
+        for pipeline in self.hands.values():
+            pipeline.animationView.close()
+        if self.stripChart is not None:
+            self.stripChart.close()
+        self.displayOpen = False
         self.close()
 
+    def openStripChart(self):
+        if self.stripChart is None:
+            self.stripChart = StripChartWindow(title="Channel Plot")
+        self.stripChart.show()
+        self.stripChart.raise_()
+
+    def toggleStats(self, enabled):
+        instrumentation.enabled = enabled
+        self.statsLabel.setVisible(enabled)
+
+    def updateStats(self):
+        self.statsLabel.setText(instrumentation.formatTable())
+
     def zeroGyros(self):
         """Called when Zero Gyro button is clicked"""
-        self.rightHand.zeroOrientation()
+        for pipeline in self.hands.values():
+            pipeline.model.zeroOrientation()
         print("Gyroscope orientation zeroed")
 
-    def updateData(self, data, timestamp):
+    def updateData(self, data, timestamp, hand=None, sequence=-1, deviceTime=math.nan, receivedAt=None):
+        # Runs on the acquisition thread: parse the frame and queue it for the next render tick.
+        # data is a text frame (the raw line, or its fields already split by data_acquire),
+        # or the float array decoded from a binary frame, in which case the hand comes separately.
+        # sequence and deviceTime (us) come from the binary frame header; receivedAt is the host
+        # perf_counter time the frame came off the port
+        t0 = instrumentation.start()
+        if receivedAt is None:
+            receivedAt = time.perf_counter()
+        if isinstance(data, np.ndarray):
+            if len(data) < 41:
+                return
+            self.frameBuffer.push(data[:41], timestamp, hand or 'R', sequence, deviceTime, receivedAt)
+            instrumentation.stop('updateData', t0)
+            return
+
         try:
-            dataArray = [s.strip() for s in data.split(',')]
+            dataArray = [s.strip() for s in data.split(',')] if isinstance(data, str) else data
             if len(dataArray) < 41:
                 return
         except:
             return
 
-        self.currentData = dataArray
-        self.currentTimestamp = timestamp
-        self.updateSampleRate()
+        # Convert the frame to floats in one step; unreadable fields (e.g. 'E' from a failed IMU read) become NaN
+        values = fieldsToValues(dataArray, np.empty(41))
+        self.frameBuffer.push(values, timestamp, hand or (dataArray[41] if len(dataArray) > 41 else '0'),
+                              sequence, deviceTime, receivedAt)
+        instrumentation.stop('updateData', t0)
+
+    def processFrames(self):
+        # Runs on the GUI thread at display rate: filter every queued sample, render only the latest.
+        # With both gloves connected, each glove's frames are filtered by its own pipeline
+        block = self.frameBuffer.drain()
+        hands = block.hands
+        if len(hands) == 0:
+            return
 
-        filteredArray = []
-        try:
-            # Flex (0-4)
-            for i in range(5):
-                filteredArray.append(self.flex_filters[i].update(dataArray[i]))
-
-            # Thumb acc/gyro (5-10)
-            for i in range(6):
-                if i < 3:
-                    filteredArray.append(self.acc_filters[i].update(dataArray[5 + i]))
-                else:
-                    filteredArray.append(self.gyro_filters[i - 3].update(dataArray[5 + i]))
-
-            # Pointer acc/gyro (11-16)
-            for i in range(6):
-                if i < 3:
-                    filteredArray.append(self.acc_filters[3 + i].update(dataArray[11 + i]))
-                else:
-                    filteredArray.append(self.gyro_filters[3 + i - 3].update(dataArray[11 + i]))
-
-            # Middle acc/gyro (17-22)
-            for i in range(6):
-                if i < 3:
-                    filteredArray.append(self.acc_filters[6 + i].update(dataArray[17 + i]))
-                else:
-                    filteredArray.append(self.gyro_filters[6 + i - 3].update(dataArray[17 + i]))
-
-            # Ring acc/gyro (23-28)
-            for i in range(6):
-                if i < 3:
-                    filteredArray.append(self.acc_filters[9 + i].update(dataArray[23 + i]))
-                else:
-                    filteredArray.append(self.gyro_filters[9 + i - 3].update(dataArray[23 + i]))
-
-            # Pinky acc/gyro (29-34)
-            for i in range(6):
-                if i < 3:
-                    filteredArray.append(self.acc_filters[12 + i].update(dataArray[29 + i]))
-                else:
-                    filteredArray.append(self.gyro_filters[12 + i - 3].update(dataArray[29 + i]))
-
-            # === WRIST (35-40) ===
-            # Acc X, Y, Z (m/s²) - no conversion needed
-            for i in range(3):
-                filteredArray.append(self.acc_filters[15 + i].update(dataArray[35 + i]))
-
-            # Gyro X, Y, Z (dps → rad/s) so filtered output is always rad/s
-            for i in range(3):
-                try:
-                    dps = float(dataArray[38 + i])
-                    rad_per_sec = dps * (math.pi / 180.0)
-                    filteredArray.append(self.gyro_filters[15 + i].update(rad_per_sec))
-                except (ValueError, TypeError):
-                    filteredArray.append(0.0)
-
-            # Hand indicator (41)
-            filteredArray.append(dataArray[41] if len(dataArray) > 41 else '0')
-
-        except ValueError:
-            return  # Skip if filtering fails
+        if (hands == hands[0]).all():
+            self.processHandFrames(self.pipeline(hands[0]), block)
+        else:
+            for hand in np.unique(hands):
+                rows = hands == hand
+                self.processHandFrames(self.pipeline(hand), FrameBlock(*(column[rows] for column in block)))
+
+        # Latency readout alongside the sample rate, refreshed twice a second
+        now = time.perf_counter()
+        current = self.hands.get(self.currentHand)
+        if current is not None and now - self.last_latency_update > 0.5:
+            self.last_latency_update = now
+            self.setLabel(self.sampleRateLabel, SAMPLE_RATE_FORMAT(current.estimated_sample_rate))
+            self.setLabel(self.latencyLabel, current.latencyTracker.formatLabel())
+
+        # Refresh the stats panel twice a second
+        if instrumentation.enabled and time.perf_counter() - self.last_stats_update > 0.5:
+            self.last_stats_update = time.perf_counter()
+            self.updateStats()
+
+    def processHandFrames(self, pipeline, block):
+        # Every raw sample of the selected glove goes to the plots (copied before filtering converts the wrist gyro)
+        if self.stripChart is not None and pipeline.hand == self.currentHand and self.stripChart.isVisible():
+            self.stripChart.push(block.values, block.timestamps)
+
+        t0 = instrumentation.start()
+        filteredAt = pipeline.processBlock(block)
+        instrumentation.stop('filter', t0)
+
+        t0 = instrumentation.start()
+        self.updateDisplay(pipeline.filteredData, pipeline.currentTimestamp, pipeline.hand)
+        instrumentation.stop('updateDisplay', t0)
+
+        if pipeline.last_scene_update is not None:
+            pipeline.latencyTracker.onSceneUpdate(filteredAt, pipeline.last_scene_update)
+
+    def updateDisplay(self, dataArray, timestamp, hand='R'):
+        # Pose the glove's animation from its latest filtered frame; readouts show the selected glove only,
+        # refreshed at label_rate
+        if len(dataArray) < 41:
+            return
 
-        self.filteredData = filteredArray
-        self.updateDisplay(filteredArray, timestamp)
+        # Thumb, pointer, middle, ring, pinky joint angles (deg) in one table lookup; unreadable flex reads as NaN
+        flexAngles = self.flexCalibration.angles([v if isinstance(v, float) else math.nan for v in dataArray[:5]])
 
-    def updateDisplay(self, dataArray, timestamp):
-        self.timestampLabel.setText(f'Timestamp: {timestamp:.3f}s')
+        t0 = instrumentation.start()
+        pipeline = self.pipeline(hand)
+        pipeline.flexAngles = flexAngles
+        pipeline.updateAnimation(flexAngles, timestamp)
+        instrumentation.stop('animation', t0)
 
-        if len(dataArray) < 41:
+        if pipeline.hand != self.currentHand:
             return
+        if time.perf_counter() - self.last_label_update >= 1.0 / self.label_rate:
+            self.updateLabels(pipeline)
 
-        def format_value(value):
-            try:
-                return f'{float(value):.2f}'
-            except (ValueError, TypeError):
-                return '--'
-
-        def getFingerAngle(value):
-            try:
-                flex = float(value)
-                return 0.00001595 * flex ** 3 - 0.003083 * flex ** 2 + 0.4174 * flex + 0.8620
-            except (ValueError, TypeError):
-                return '--'
-
-        def getThumbAngle(value):
-            try:
-                flex = float(value)
-                return 0.000005956 * flex ** 3 - 0.001171 * flex ** 2 + 0.2502 * flex + 2.747
-            except (ValueError, TypeError):
-                return '--'
-
-        def updateAnimation(dataArray):
-            try:
-                # get finger angles, convert to joint-based information
-                # and store as variables of right-hand object
-                thumbAngle = getThumbAngle(dataArray[0])
-                pointerAngle = getFingerAngle(dataArray[1])
-                middleAngle = getFingerAngle(dataArray[2])
-                ringAngle = getFingerAngle(dataArray[3])
-                pinkyAngle = getFingerAngle(dataArray[4])
-
-                self.rightHand.setJ1Angles(thumbAngle, pointerAngle * 0.75, middleAngle * 0.75,
-                                           ringAngle * 0.75, pinkyAngle * 0.75)
-                self.rightHand.setJ2Angles(pointerAngle * 0.25, middleAngle * 0.25,
-                                           ringAngle * 0.25, pinkyAngle * 0.25)
-
-                # Update displayed finger angles
-                j1Angles = self.rightHand.getJ1Angles()
-                j2Angles = self.rightHand.getJ2Angles()
-
-                self.animationView.setAnglesPointer(j1Angles[1], j2Angles[0])
-                self.animationView.setAnglesMiddle(j1Angles[2], j2Angles[1])
-                self.animationView.setAnglesRing(j1Angles[3], j2Angles[2])
-                self.animationView.setAnglesPinky(j1Angles[4], j2Angles[3])
-                self.animationView.setAngleThumb(j1Angles[0])
-
-            except (ValueError, TypeError) as e:
-                print(f"Waiting for Legible Flex Values: {e}")
-                return
-
-            try:
-                self.rightHand.updateSampleRate(self.estimated_sample_rate)
-                self.rightHand.updateOrientation(float(dataArray[38]), float(dataArray[39]), float(dataArray[40]))
-            except (ValueError, TypeError) as e:
-                print(f"Waiting for Gyro Read: {e}")
-                return
+    def updateLabels(self, pipeline):
+        # Numeric readouts for the current view from the glove's latest filtered frame
+        t0 = instrumentation.start()
+        self.last_label_update = time.perf_counter()
+        dataArray = pipeline.filteredData
+        self.setLabel(self.timestampLabel, TIMESTAMP_FORMAT(pipeline.currentTimestamp))
 
-            # Update Displayed Wrist Orientation
-            wristXYZ = self.rightHand.getOrientation()
-
-            self.animationView.setOrientationPalm(wristXYZ[0], wristXYZ[1], wristXYZ[2])
-
-            # Update displayed finger angles
-            j1Angles = self.rightHand.getJ1Angles()
-            j2Angles = self.rightHand.getJ2Angles()
-
-            self.animationView.setAnglesPointer(j1Angles[1], j2Angles[0])
-            self.animationView.setAnglesMiddle(j1Angles[2], j2Angles[1])
-            self.animationView.setAnglesRing(j1Angles[3], j2Angles[2])
-            self.animationView.setAnglesPinky(j1Angles[4], j2Angles[3])
-            self.animationView.setAngleThumb(j1Angles[0])
-
-        updateAnimation(dataArray)
-
-        # View-specific label updates
-        if self.currentView == 'Thumb':
-            self.dataLabel1.setText(f'Flex: {format_value(dataArray[0])}')
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[8])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[9])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[10])}')
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[5])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[6])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[7])}')
-            self.dataLabel8.setText(f'Flex Angle (deg): {format_value(getThumbAngle(dataArray[0]))}')
-
-        elif self.currentView == 'Pointer':
-            self.dataLabel1.setText(f'Flex: {format_value(dataArray[1])}')
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[14])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[15])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[16])}')
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[11])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[12])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[13])}')
-            self.dataLabel8.setText(f'Flex Angle (deg): {format_value(getFingerAngle(dataArray[1]))}')
-
-        elif self.currentView == 'Middle':
-            self.dataLabel1.setText(f'Flex: {format_value(dataArray[2])}')
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[20])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[21])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[22])}')
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[17])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[18])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[19])}')
-            self.dataLabel8.setText(f'Flex Angle (deg): {format_value(getFingerAngle(dataArray[2]))}')
-
-        elif self.currentView == 'Ring':
-            self.dataLabel1.setText(f'Flex: {format_value(dataArray[3])}')
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[26])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[27])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[28])}')
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[23])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[24])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[25])}')
-            self.dataLabel8.setText(f'Flex Angle (deg): {format_value(getFingerAngle(dataArray[3]))}')
-
-        elif self.currentView == 'Pinky':
-            self.dataLabel1.setText(f'Flex: {format_value(dataArray[4])}')
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[32])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[33])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[34])}')
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[29])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[30])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[31])}')
-            self.dataLabel8.setText(f'Flex Angle (deg): {format_value(getFingerAngle(dataArray[4]))}')
-
-        elif self.currentView == 'Wrist':
-            # Raw gyro rates
-            self.dataLabel2.setText(f'Gyro X: {format_value(dataArray[38])}')
-            self.dataLabel3.setText(f'Gyro Y: {format_value(dataArray[39])}')
-            self.dataLabel4.setText(f'Gyro Z: {format_value(dataArray[40])}')
-
-            # Accelerometer
-            self.dataLabel5.setText(f'Acc X: {format_value(dataArray[35])}')
-            self.dataLabel6.setText(f'Acc Y: {format_value(dataArray[36])}')
-            self.dataLabel7.setText(f'Acc Z: {format_value(dataArray[37])}')
-
-            # Integrated orientation in the 9th label
-            gyroN = self.rightHand.getOrientation()  # Returns [roll, pitch, yaw] in degrees
-            self.dataLabel9.setText(
-                f'Wrist Orientation (deg):\n'
-                f'X = {format_value(gyroN[0])}\n'
-                f'Y = {format_value(gyroN[1])}\n'
-                f'Z = {format_value(gyroN[2])}'
-            )
\ No newline at end of file
+        if self.currentView == 'Wrist':
+            # Raw gyro rates and accelerometer, then the integrated orientation in the 9th label
+            for label, labelFormat, channel in zip(self.dataLabels[1:7], DATA_LABEL_FORMATS[1:7], WRIST_VIEW_CHANNELS):
+                self.setLabel(label, labelFormat(formatReading(dataArray[channel])))
+            roll, pitch, yaw = pipeline.model.getOrientation()
+            self.setLabel(self.dataLabel9, ORIENTATION_FORMAT(formatReading(roll), formatReading(pitch),
+                                                              formatReading(yaw)))
+        else:
+            for label, labelFormat, channel in zip(self.dataLabels, DATA_LABEL_FORMATS,
+                                                   FINGER_VIEW_CHANNELS[self.currentView]):
+                self.setLabel(label, labelFormat(formatReading(dataArray[channel])))
+            flexAngle = pipeline.flexAngles[VIEW_FINGERS.index(self.currentView)]
+            self.setLabel(self.dataLabel8, DATA_LABEL_FORMATS[7](formatReading(flexAngle)))
+        instrumentation.stop('labels', t0)
+
+    def setLabel(self, label, text):
+        # setText (and the relayout it triggers) only when the label's text actually changes
+        if self.labelTexts.get(label) != text:
+            label.setText(text)
+            self.labelTexts[label] = text
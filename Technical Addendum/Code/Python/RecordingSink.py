@@ -0,0 +1,146 @@
+import csv
+import io
+import queue
+import threading
+import time
+from GloveProtocol import CSV_HEADER, valuesToFields
+
+
+class CsvRecordingSink:
+    """
+    Records rows to a CSV file from a dedicated writer thread.
+
+    Rows are collected into blocks on the caller's thread and handed to the writer over
+    a bounded queue; the writer formats each block with one csv.writerows call and
+    writes it with a single file write. Output matches csv.writer(lineterminator='\\n')
+    row by row, so files are byte-compatible with the existing GloveData.csv layout.
+
+    When the queue is full the sink either waits for the writer (blockOnFull=True,
+    counted in rowsBackpressured) or discards the block (counted in rowsDropped).
+
+    If a file write fails (disk full, I/O error) the writer keeps draining the queue without
+    writing, so producers never wait on it; the error is reported in stats() as writeError
+    and every later row is counted in rowsDropped. close() may be called from any thread,
+    more than once; rows written after it are dropped.
+    """
+
+    def __init__(self, fileName, header=CSV_HEADER, batchSize=256, flushInterval=0.5,
+                 maxQueuedBlocks=64, blockOnFull=True):
+        self.fileName = fileName
+        self.batchSize = batchSize
+        self.flushInterval = flushInterval
+        self.blockOnFull = blockOnFull
+
+        self.file = open(fileName, 'w', newline='')
+        csv.writer(self.file, lineterminator='\n').writerow(header)
+
+        self.batch = []
+        self.batchStarted = 0.0
+        self.queue = queue.Queue(maxsize=maxQueuedBlocks)
+        self.closeLock = threading.Lock()
+        self.closed = False
+        self.writeError = None  # exception that stopped the writer, if any
+
+        # Counters, updated from both the caller's and the writer's thread under countersLock
+        self.countersLock = threading.Lock()
+        self.rowsQueued = 0
+        self.rowsWritten = 0
+        self.rowsDropped = 0
+        self.rowsBackpressured = 0
+
+        self.writerThread = threading.Thread(target=self.writerLoop, daemon=True)
+        self.writerThread.start()
+
+    @property
+    def queueDepth(self):
+        # blocks waiting for the writer thread
+        return self.queue.qsize()
+
+    def writeRow(self, row):
+        # row: list of values, formatted exactly as csv.writer would
+        if not self.batch:
+            self.batchStarted = time.monotonic()
+        self.batch.append(row)
+        if len(self.batch) >= self.batchSize or time.monotonic() - self.batchStarted >= self.flushInterval:
+            self.flushBatch()
+
+    def writeValues(self, timestamp, values, hand):
+        # Numeric frame (binary protocol); formatted like the firmware's text output on the writer thread
+        self.writeRow((timestamp, values.copy(), hand))
+
+    def flushBatch(self):
+        if not self.batch:
+            return
+        block = self.batch
+        self.batch = []
+        if self.closed or self.writeError is not None:
+            with self.countersLock:
+                self.rowsDropped += len(block)
+            return
+        try:
+            self.queue.put_nowait(block)
+        except queue.Full:
+            if self.blockOnFull:
+                with self.countersLock:
+                    self.rowsBackpressured += len(block)
+                self.queue.put(block)
+            else:
+                with self.countersLock:
+                    self.rowsDropped += len(block)
+                return
+        with self.countersLock:
+            self.rowsQueued += len(block)
+
+    def writerLoop(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        while True:
+            block = self.queue.get()
+            if block is None:
+                break
+            if self.writeError is not None:
+                with self.countersLock:
+                    self.rowsDropped += len(block)
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            try:
+                writer.writerows([row if isinstance(row, list) else [row[0]] + valuesToFields(row[1], row[2])
+                                  for row in block])
+                self.file.write(buffer.getvalue())
+            except (OSError, ValueError) as e:
+                print(f"Error writing {self.fileName}: {e}")
+                self.writeError = e
+                with self.countersLock:
+                    self.rowsDropped += len(block)
+                continue
+            with self.countersLock:
+                self.rowsWritten += len(block)
+
+    def stats(self):
+        with self.countersLock:
+            return {"queueDepth": self.queueDepth, "rowsQueued": self.rowsQueued, "rowsWritten": self.rowsWritten,
+                    "rowsDropped": self.rowsDropped, "rowsBackpressured": self.rowsBackpressured,
+                    "writeError": None if self.writeError is None else str(self.writeError)}
+
+    def close(self):
+        # Flush the partial batch, let the writer drain the queue, then close the file. Only the first call
+        # does anything; later rows are dropped rather than queued for a writer that has stopped
+        with self.closeLock:
+            if self.closed:
+                return
+            self.flushBatch()
+            self.closed = True
+            self.queue.put(None)
+            self.writerThread.join()
+            # A producer racing close may still have queued a block behind the end marker: drop it, which
+            # also frees a producer waiting on a full queue
+            while not self.queue.empty():
+                block = self.queue.get_nowait()
+                if block is not None:
+                    with self.countersLock:
+                        self.rowsDropped += len(block)
+            try:
+                self.file.close()
+            except OSError as e:
+                self.writeError = self.writeError or e
@@ -0,0 +1,236 @@
+import argparse
+import csv
+import os
+import sys
+import threading
+import time
+import numpy as np
+from GloveProtocol import (NUM_CHANNELS, START_COMMAND, START_COMMAND_BINARY, STOP_COMMAND,
+                           encodeBinaryFrame, fieldsToValues, valuesToFields)
+from BinaryRecording import BinaryRecording, isBinaryRecording
+from Acquisition import openRecorder
+from AsyncAcquisition import GloveSource, ReplayTransport, runAcquisition
+from Instrumentation import instrumentation
+
+
+# readRecording(recordingPath)
+# Yield (timestamp, fields) for every row of a GloveData.csv style or .glove recording
+def readRecording(recordingPath):
+    if isBinaryRecording(recordingPath):
+        recording = BinaryRecording(recordingPath)
+        for i in range(len(recording)):
+            fields = valuesToFields(recording.channels[i].astype(float), chr(recording.hands[i]))
+            yield float(recording.timestamps[i]), fields
+        return
+
+    with open(recordingPath, newline='') as csvFile:
+        reader = csv.reader(csvFile)
+        next(reader)  # header
+        for row in reader:
+            if row:
+                yield float(row[0]), row[1:]
+
+
+class ReplaySerial:
+    """
+    Stands in for serial.Serial, playing a recording back as the glove would send it.
+
+    Like the firmware, nothing is sent until "ON" (text lines) or "ONB" (binary frames)
+    is written, and "OFF" pauses the stream. Rows are paced by the recorded Timestamp
+    column: speed=1 is real time, speed=N is N times real time and speed=None sends as
+    fast as the reader consumes. At the end of the recording the port reports closed
+    (isOpen() is False) unless loop is set. hand ('R'/'L') replaces the recorded Hand column,
+    e.g. to play a right-hand recording as the left glove.
+    """
+
+    def __init__(self, recordingPath, speed=1.0, loop=False, hand=None):
+        self.recordingPath = recordingPath
+        self.speed = speed
+        self.loop = loop
+        self.hand = hand
+
+        self.rows = readRecording(recordingPath)
+        self.streaming = False
+        self.binary = False
+        self.finished = False
+        self.pending = b''
+        self.sequence = 0
+        self.framesSent = 0
+
+        # Pacing state: wall clock and recorded time of the first row sent, and the loop time offset
+        self.wallStart = None
+        self.recordedStart = None
+        self.timeOffset = 0.0
+        self.lastTimestamp = None
+        self.lastInterval = 0.1
+
+    # --------------------------------------- serial.Serial compatible interface -----------------------------------
+    def write(self, data):
+        command = bytes(data).strip()
+        if command == START_COMMAND_BINARY:
+            self.streaming, self.binary = True, True
+        elif command == START_COMMAND:
+            self.streaming, self.binary = True, False
+        elif command == STOP_COMMAND:
+            self.streaming = False
+        # Calibration commands have no effect on recorded data
+        return len(data)
+
+    def isOpen(self):
+        return not self.finished
+
+    @property
+    def is_open(self):
+        return not self.finished
+
+    @property
+    def in_waiting(self):
+        return len(self.pending)
+
+    def close(self):
+        self.finished = True
+
+    def readline(self):
+        if not self.pending:
+            self.pending = self.nextFrame()
+        line, self.pending = self.pending, b''
+        return line
+
+    def readinto(self, buffer):
+        if not self.pending:
+            self.pending = self.nextFrame()
+        count = min(len(buffer), len(self.pending))
+        buffer[:count] = self.pending[:count]
+        self.pending = self.pending[count:]
+        return count
+
+    # --------------------------------------------------- playback ---------------------------------------------------
+    def nextFrame(self):
+        # Behave like a serial read timing out while the glove is idle or the recording is over
+        if not self.streaming or self.finished:
+            time.sleep(0.01)
+            return b''
+
+        row = self.nextRow()
+        if row is None:
+            return b''
+        delay = self.delayUntilDue(row[0])
+        if delay > 0:
+            time.sleep(delay)
+        return self.encodeRow(row[1])
+
+    def nextRow(self):
+        # (timestamp, fields) of the next row on the playback timeline, or None at the end of the recording
+        row = next(self.rows, None)
+        if row is None:
+            if not self.loop:
+                self.finished = True
+                return None
+            # Start over, continuing the timeline one sample interval after the last row
+            self.rows = readRecording(self.recordingPath)
+            row = next(self.rows, None)
+            if row is None:
+                self.finished = True
+                return None
+            self.timeOffset = self.lastTimestamp + self.lastInterval - row[0]
+
+        timestamp, fields = row
+        timestamp += self.timeOffset
+        if self.hand:
+            fields = fields[:NUM_CHANNELS] + [self.hand]
+        if self.lastTimestamp is not None and timestamp > self.lastTimestamp:
+            self.lastInterval = timestamp - self.lastTimestamp
+        self.lastTimestamp = timestamp
+        return timestamp, fields
+
+    def encodeRow(self, fields):
+        # The bytes the glove would send for a row, as a text line or a binary frame
+        self.framesSent += 1
+        if self.binary:
+            values = fieldsToValues(fields, np.empty(NUM_CHANNELS))
+            hand = fields[NUM_CHANNELS].encode() if len(fields) > NUM_CHANNELS else b'R'
+            # Device clock in microseconds since playback started, wrapping like the firmware's uint32 counter
+            deviceTime = int((time.perf_counter() - self.wallStart) * 1e6) & 0xFFFFFFFF
+            frame = encodeBinaryFrame(self.sequence, deviceTime, values, hand)
+            self.sequence = (self.sequence + 1) & 0xFFFF
+            return frame
+        return (','.join(fields) + '\r\n').encode('utf-8')
+
+    def delayUntilDue(self, timestamp):
+        # Seconds until a row recorded at timestamp is due at the playback speed (<= 0 when due now)
+        if self.wallStart is None:
+            self.wallStart = time.perf_counter()
+            self.recordedStart = timestamp
+        if not self.speed:
+            return 0.0
+        return self.wallStart + (timestamp - self.recordedStart) / self.speed - time.perf_counter()
+
+
+# replay(recordingPath, speed, loop, outputFileName, binaryMode, leftRecordingPath)
+# Drive a GloveMonitorWindow from a recording through the live acquisition path
+# (runAcquisition on a data thread -> recorder -> updateData -> render tick) and report throughput.
+# With leftRecordingPath, the two recordings play as the right and left gloves on separate ports
+def replay(recordingPath, speed=1.0, loop=False, outputFileName=None, binaryMode=False, leftRecordingPath=None):
+    from PySide6.QtCore import QTimer
+    from PySideGraphicalDisplay import GloveMonitorWindow, app
+
+    window = GloveMonitorWindow(pumpEvents=False)  # app.exec() runs the event loop
+    window.initDisplay()
+
+    readers = {'R': ReplaySerial(recordingPath, speed, loop, 'R' if leftRecordingPath else None)}
+    if leftRecordingPath:
+        readers['L'] = ReplaySerial(leftRecordingPath, speed, loop, 'L')
+    recorder = openRecorder(outputFileName) if outputFileName else None
+
+    # The sources send the start command, as they would to a glove
+    startTime = time.perf_counter()
+    sources = [GloveSource(ReplayTransport(replay=reader), hand if leftRecordingPath else None, binaryMode)
+               for hand, reader in readers.items()]
+    dataThread = threading.Thread(target=runAcquisition,
+                                  args=(sources, recorder, window.updateData, startTime), daemon=True)
+    dataThread.start()
+
+    def checkFinished():
+        if not dataThread.is_alive():
+            window.processFrames()
+            app.quit()
+
+    finishTimer = QTimer()
+    finishTimer.timeout.connect(checkFinished)
+    finishTimer.start(100)
+    app.exec()
+
+    elapsed = time.perf_counter() - startTime
+    finishTimer.stop()
+    window.terminateDisplay()
+    if recorder:
+        recorder.close()
+
+    framesSent = sum(reader.framesSent for reader in readers.values())
+    print(f"Replayed {framesSent} frames in {elapsed:.2f}s "
+          f"({framesSent / elapsed:.1f} frames/s), ring buffer overruns: {window.frameBuffer.overruns}")
+    for hand, pipeline in window.hands.items():
+        print(f"{hand}: {pipeline.latencyTracker.formatLabel()}")
+    if instrumentation.enabled:
+        print(instrumentation.formatTable())
+    return framesSent, elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay a glove recording into the acquisition window")
+    parser.add_argument("recording", help="GloveData.csv or a .glove recording")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="playback speed as a multiple of real time; 0 plays as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="restart the recording when it ends")
+    parser.add_argument("--output", help="also record the replayed frames to this file (.csv or .glove)")
+    parser.add_argument("--binary", action="store_true", help="replay using the binary frame protocol")
+    parser.add_argument("--left", help="second recording to play as the left glove, on its own port")
+    args = parser.parse_args()
+
+    # Without a display (e.g. CI), render with Qt's offscreen platform. Qt3D's default RHI backend
+    # crashes without a GL context there, the OpenGL renderer just skips drawing
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.environ.setdefault('QT3D_RENDERER', 'opengl')
+
+    replay(args.recording, args.speed or None, args.loop, args.output, args.binary, args.left)
@@ -1,182 +1,186 @@
-import math
-
-
-class Thumb:
-    def __init__(self, segment1Length, segment2Length): # segments progressive from base
-        self.seg1Len = segment1Length
-        self.seg2Len = segment2Length
-        self.j1flex = 0.0 # angle of joint between segments 1 and 2
+import numpy as np
+from Orientation import WRIST, quatMultiply, quatConjugate, quatToEulerDegrees
+from SensorFusion import MadgwickFusion
+
+
+# Hand state layout: one contiguous float array, every part of the hand is a view into it.
+#   segment lengths (in)  5 fingers x 3 segments, progressive from base (the thumb has 2, its third is 0)
+#   joint angles (deg)    5 fingers x (J1, J2); J1 between segments 1 and 2, J2 between 2 and 3 (thumb: J1 only)
+#   orientation           6 IMUs x (w, x, y, z) quaternion: thumb, pointer, middle, ring, pinky, wrist
+#   orientation zero      6 IMUs x quaternion, the pose captured by zeroOrientation
+FINGERS = ('thumb', 'pointer', 'middle', 'ring', 'pinky')
+SEGMENTS = slice(0, 15)
+JOINTS = slice(15, 25)
+ORIENTATION = slice(25, 49)
+ORIENTATION_ZERO = slice(49, 73)
+HAND_STATE_SIZE = 73
+
+RIGHT_HAND_SEGMENTS = ((1.625, 1.4375, 0.0),
+                       (2.0, 1.25, 1.0),
+                       (2.5, 1.375, 1.0),
+                       (2.25, 1.375, 1.0),
+                       (1.375, 1.0, 1.0))
+
+# Share of a finger's flex angle at J1 (the rest is J2); the thumb bends at J1 only
+J1_SHARE = np.array([1.0, 0.75, 0.75, 0.75, 0.75])
+J2_SHARE = 1.0 - J1_SHARE[1:]
+
+
+class Finger:
+    """
+    One finger's segment lengths and joint angles, as views into the hand state.
+
+    Args:
+        segments: view of the finger's 3 segment lengths
+        joints: view of the finger's J1, J2 angles
+        numSegments: 2 for the thumb, 3 otherwise
+    """
+
+    def __init__(self, segments, joints, numSegments):
+        self.segments = segments
+        self.joints = joints
+        self.numSegments = numSegments
 
     def setJ1Flex(self, newJ1Flex):
-        self.j1flex = newJ1Flex
-        return
-
-    def getJ1Flex(self):
-        return self.j1flex
-
-    def getSegLens(self):
-        return [self.seg1Len, self.seg2Len]
-
-
-class Pointer:
-    def __init__(self, segment1Length, segment2Length, segment3Length): # segments progressive from base
-        self.seg1Len = segment1Length
-        self.seg2Len = segment2Length
-        self.seg3Len = segment3Length
-        self.j1flex = 0.0  # angle of joint between segments 1 and 2
-        self.j2flex = 0.0  # angle of joint between segments 2 and 3
-
-    def setJ1Flex(self, newJ1Flex):
-        self.j1flex = newJ1Flex
+        self.joints[0] = newJ1Flex
         return
 
     def setJ2Flex(self, newJ2Flex):
-        self.j2flex = newJ2Flex
+        self.joints[1] = newJ2Flex
         return
 
     def getJ1Flex(self):
-        return self.j1flex
+        return self.joints[0]
 
     def getJ2Flex(self):
-        return self.j2flex
+        return self.joints[1]
 
     def getSegLens(self):
-        return [self.seg1Len, self.seg2Len, self.seg3Len]
+        return self.segments[:self.numSegments]
 
 
-class Middle:
-    def __init__(self, segment1Length, segment2Length, segment3Length): # segments progressive from base
-        self.seg1Len = segment1Length
-        self.seg2Len = segment2Length
-        self.seg3Len = segment3Length
-        self.j1flex = 0.0  # angle of joint between segments 1 and 2
-        self.j2flex = 0.0  # angle of joint between segments 2 and 3
+class HandHistory:
+    """
+    Ring of hand state snapshots, preallocated so recording one copies into an existing row.
 
-    def setJ1Flex(self, newJ1Flex):
-        self.j1flex = newJ1Flex
-        return
+    Args:
+        capacity: number of snapshots kept
+    """
 
-    def setJ2Flex(self, newJ2Flex):
-        self.j2flex = newJ2Flex
-        return
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, HAND_STATE_SIZE))
+        self.timestamps = np.zeros(capacity)
+        self.count = 0  # total snapshots taken; slot = count % capacity
 
-    def getJ1Flex(self):
-        return self.j1flex
-
-    def getJ2Flex(self):
-        return self.j2flex
-
-    def getSegLens(self):
-        return [self.seg1Len, self.seg2Len, self.seg3Len]
-
-
-class Ring:
-    def __init__(self, segment1Length, segment2Length, segment3Length): # segments progressive from base
-        self.seg1Len = segment1Length
-        self.seg2Len = segment2Length
-        self.seg3Len = segment3Length
-        self.j1flex = 0.0  # angle of joint between segments 1 and 2
-        self.j2flex = 0.0  # angle of joint between segments 2 and 3
+    def record(self, state, timestamp):
+        slot = self.count % self.capacity
+        self.states[slot] = state
+        self.timestamps[slot] = timestamp
+        self.count += 1
 
-    def setJ1Flex(self, newJ1Flex):
-        self.j1flex = newJ1Flex
-        return
+    def snapshots(self):
+        """
+        Returns:
+            (timestamps, states) copies of the kept snapshots, oldest first
+        """
+        slots = np.arange(max(0, self.count - self.capacity), self.count) % self.capacity
+        return self.timestamps[slots], self.states[slots]
 
-    def setJ2Flex(self, newJ2Flex):
-        self.j2flex = newJ2Flex
-        return
 
-    def getJ1Flex(self):
-        return self.j1flex
-
-    def getJ2Flex(self):
-        return self.j2flex
-
-    def getSegLens(self):
-        return [self.seg1Len, self.seg2Len, self.seg3Len]
-
-
-class Pinky:
-    def __init__(self, segment1Length, segment2Length, segment3Length): # segments progressive from base
-        self.seg1Len = segment1Length
-        self.seg2Len = segment2Length
-        self.seg3Len = segment3Length
-        self.j1flex = 0.0  # angle of joint between segments 1 and 2
-        self.j2flex = 0.0  # angle of joint between segments 2 and 3
-
-    def setJ1Flex(self, newJ1Flex):
-        self.j1flex = newJ1Flex
-        return
-
-    def setJ2Flex(self, newJ2Flex):
-        self.j2flex = newJ2Flex
-        return
-
-    def getJ1Flex(self):
-        return self.j1flex
-
-    def getJ2Flex(self):
-        return self.j2flex
+class RightHand: # NOTE: if two distinct hand classes are not necessary, backtrack and re-write this for the general case
+    HAND = 'R'  # hand code in the frame's Hand column
+    SEGMENT_LENGTHS = RIGHT_HAND_SEGMENTS
+
+    def __init__(self, historyLength=0):
+        self.state = np.zeros(HAND_STATE_SIZE)
+        self.segmentLengths = self.state[SEGMENTS].reshape(len(FINGERS), 3)
+        self.jointAngles = self.state[JOINTS].reshape(len(FINGERS), 2)
+        self.j1Angles = self.jointAngles[:, 0]   # thumb, pointer, middle, ring, pinky
+        self.j2Angles = self.jointAngles[1:, 1]  # pointer, middle, ring, pinky
+        self.quaternions = self.state[ORIENTATION].reshape(-1, 4)
+        self.orientationZero = self.state[ORIENTATION_ZERO].reshape(-1, 4)
+
+        self.segmentLengths[:] = self.SEGMENT_LENGTHS
+        self.thumb = Finger(self.segmentLengths[0], self.jointAngles[0], 2)
+        self.pointer = Finger(self.segmentLengths[1], self.jointAngles[1], 3)
+        self.middle = Finger(self.segmentLengths[2], self.jointAngles[2], 3)
+        self.ring = Finger(self.segmentLengths[3], self.jointAngles[3], 3)
+        self.pinky = Finger(self.segmentLengths[4], self.jointAngles[4], 3)
+
+        # One quaternion per IMU, integrated in place in the state array. Orientations are reported
+        # relative to the pose captured by zeroOrientation
+        self.orientation = MadgwickFusion(quaternions=self.quaternions)
+        self.orientationZero[:] = self.quaternions
+        self.sampleRate = 10
 
-    def getSegLens(self):
-        return [self.seg1Len, self.seg2Len, self.seg3Len]
+        self.history = HandHistory(historyLength) if historyLength else None
 
+    def setFromFrame(self, flexAngles):
+        # Bulk update from the five flex angles (deg, thumb to pinky): split between J1 and J2 in place
+        np.multiply(flexAngles, J1_SHARE, out=self.j1Angles)
+        np.multiply(flexAngles[1:], J2_SHARE, out=self.j2Angles)
 
-class RightHand: # NOTE: if two distinct hand classes are not necessary, backtrack and re-write this for the general case
-    def __init__(self):
-        self.thumb = Thumb(1.625, 1.4375)
-        self.pointer = Pointer(2.0, 1.25, 1.0)
-        self.middle = Middle(2.5, 1.375, 1.0)
-        self.ring = Ring(2.25, 1.375, 1.0)
-        self.pinky = Pinky(1.375, 1.0, 1.0)
-        self.wristGyroDegX = 0
-        self.wristGyroDegY = 0
-        self.wristGyroDegZ = 0
-        self.sampleRate = 10
+    def snapshot(self, timestamp):
+        # Copy the current state into the history buffer
+        self.history.record(self.state, timestamp)
 
     def setJ1Angles(self, thumbFlex, pointerFlex, middleFlex, ringFlex, pinkyFlex):
-        self.thumb.setJ1Flex(thumbFlex)
-        self.pointer.setJ1Flex(pointerFlex)
-        self.middle.setJ1Flex(middleFlex)
-        self.ring.setJ1Flex(ringFlex)
-        self.pinky.setJ1Flex(pinkyFlex)
+        self.j1Angles[:] = (thumbFlex, pointerFlex, middleFlex, ringFlex, pinkyFlex)
 
     def setJ2Angles(self, pointerFlex, middleFlex, ringFlex, pinkyFlex):
-        self.pointer.setJ2Flex(pointerFlex)
-        self.middle.setJ2Flex(middleFlex)
-        self.ring.setJ2Flex(ringFlex)
-        self.pinky.setJ2Flex(pinkyFlex)
+        self.j2Angles[:] = (pointerFlex, middleFlex, ringFlex, pinkyFlex)
 
     def getJ1Angles(self):
-        j1Angles = [self.thumb.getJ1Flex(), self.pointer.getJ1Flex(), self.middle.getJ1Flex(), self.ring.getJ1Flex(), self.pinky.getJ1Flex()]
-        return j1Angles
+        # List copy: thumb, pointer, middle, ring, pinky
+        return self.j1Angles.tolist()
 
     def getJ2Angles(self):
-        j2Angles = [self.pointer.getJ2Flex(), self.middle.getJ2Flex(), self.ring.getJ2Flex(), self.pinky.getJ2Flex()]
-        return j2Angles
+        # List copy: pointer, middle, ring, pinky
+        return self.j2Angles.tolist()
+
+    def getJ1AnglesView(self):
+        # Live view into the state array, updated in place (hot path: no copy per frame)
+        return self.j1Angles
+
+    def getJ2AnglesView(self):
+        # Live view into the state array, updated in place
+        return self.j2Angles
 
     def updateSampleRate(self, newRate):
         self.sampleRate = newRate
         return
-    def updateOrientation(self, wristGyroRadssX, wristGyroRadssY, wristGyroRadssZ):
-        self.wristGyroDegX = (self.wristGyroDegX + ((wristGyroRadssX / self.sampleRate) * 180 / math.pi) + 360) % 360
-        self.wristGyroDegY = (self.wristGyroDegY + ((wristGyroRadssY / self.sampleRate) * 180 / math.pi) + 360) % 360
-        self.wristGyroDegZ = (self.wristGyroDegZ + ((wristGyroRadssZ / self.sampleRate) * 180 / math.pi) + 360) % 360
+    def updateOrientation(self, wristGyroRadssX, wristGyroRadssY, wristGyroRadssZ, dt=None):
+        # dt: measured time since the previous sample (s); defaults to one interval at the estimated sample rate
+        if dt is None:
+            dt = 1 / self.sampleRate
+        self.orientation.updateImu(WRIST, wristGyroRadssX, wristGyroRadssY, wristGyroRadssZ, dt)
         return
 
+    def updateImuOrientations(self, gyroRadss, dts, acc=None, history=None):
+        # Every IMU over a block of samples: gyroRadss is (N, 6, 3) in rad/s, dts the (N,) measured intervals.
+        # With acc (N, 6, 3) the accelerometers correct roll/pitch drift (Madgwick), otherwise gyro only.
+        # history: optional (N, 6, 4) array filled with the raw quaternions after each sample
+        if acc is None:
+            if history is None:
+                return self.orientation.updateBlock(gyroRadss, dts)
+            for imu in range(len(self.quaternions)):
+                history[:, imu] = self.orientation.updateImuBlock(imu, gyroRadss[:, imu], dts)
+            return self.quaternions
+        return self.orientation.updateFusedBlock(gyroRadss, acc, dts, history)
+
     def zeroOrientation(self):
-        self.wristGyroDegX = 0
-        self.wristGyroDegY = 0
-        self.wristGyroDegZ = 0
+        # Current pose becomes the zero orientation of every IMU
+        self.orientationZero[:] = self.quaternions
         return
 
-    def getOrientation(self):
-        return [self.wristGyroDegX, self.wristGyroDegY, self.wristGyroDegZ]
-
-
-
-
-
-
+    def relativeOrientation(self, quaternions, imu=WRIST):
+        # Raw quaternions (..., 4) of an IMU expressed relative to its zero pose
+        return quatMultiply(quatConjugate(self.orientationZero[imu]), quaternions)
 
+    def getOrientationQuaternion(self, imu=WRIST):
+        return tuple(self.relativeOrientation(self.quaternions[imu], imu).tolist())
 
+    def getOrientation(self, imu=WRIST):
+        # Roll, pitch, yaw in degrees (0-360)
+        return quatToEulerDegrees(self.getOrientationQuaternion(imu)).tolist()
@@ -0,0 +1,60 @@
+import math
+import numpy as np
+
+
+class SampleRateEstimator:
+    """
+    Sample rate of one glove's stream, from the intervals between its acquisition timestamps.
+
+    Samples and elapsed time are both accumulated in exponential moving averages that
+    decay with elapsed stream time (timeConstant seconds), and the rate is their ratio.
+    Because whole blocks are counted against the time they span, samples that share a
+    receive time (several binary frames in one read) or arrive in bursts still give the
+    true rate, and the estimate costs two multiply-adds per block.
+
+    Intervals longer than maxInterval (the stream paused, or the glove was reset) are
+    left out, so a pause does not drag the estimate down.
+
+    Args:
+        initialRate: rate reported until timeConstant seconds of samples have been seen
+        timeConstant: seconds of stream time the estimate averages over
+        maxInterval: longest interval (s) counted as part of the stream
+    """
+
+    def __init__(self, initialRate=100.0, timeConstant=1.0, maxInterval=0.5):
+        self.timeConstant = timeConstant
+        self.maxInterval = maxInterval
+        self.rate = initialRate
+        self.samples = 0.0  # decayed count of intervals
+        self.elapsed = 0.0  # decayed sum of their durations, seconds
+        self.started = False
+        self.pending = 0  # samples of blocks that spanned no time yet
+
+    def update(self, intervals):
+        """
+        Add a block's sample intervals.
+
+        Args:
+            intervals: seconds before each sample, oldest first (HandPipeline.sampleIntervals)
+        Returns:
+            current rate estimate in Hz
+        """
+        intervals = np.asarray(intervals, dtype=float)
+        if not self.started and len(intervals):
+            intervals = intervals[1:]  # the stream's first sample has no interval
+            self.started = True
+        counted = (intervals > 0) & (intervals <= self.maxInterval)
+        span = float(intervals[counted].sum())
+        # Samples sharing a receive time (interval 0) belong to the block's span as well
+        self.pending += int(np.count_nonzero(counted | (intervals == 0)))
+        if span <= 0:
+            return self.rate
+        samples, self.pending = self.pending, 0
+
+        decay = math.exp(-span / self.timeConstant)
+        self.samples = self.samples * decay + samples
+        self.elapsed = self.elapsed * decay + span
+        # Until the average spans a time constant it is too noisy to report
+        if self.elapsed >= self.timeConstant * (1 - 1 / math.e):
+            self.rate = self.samples / self.elapsed
+        return self.rate
@@ -1,39 +1,68 @@
 import serial
-import csv
 import time
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import threading
 import sys
+import os
 from PySideGraphicalDisplay import GloveMonitorWindow
+from GloveProtocol import CSV_HEADER, STOP_COMMAND
+from Acquisition import openRecorder
+from AsyncAcquisition import GloveSource, SerialTransport, runAcquisition
+from Instrumentation import instrumentation
 
 #Serial port constants and variables
-port = 'COM8'
+port = 'COM8'  # right glove
+portL = ''  # left glove; leave empty to acquire the right glove only
 baudRate = 2000000
+binaryMode = False  # request packed binary frames (GloveProtocol) instead of ASCII lines; needs firmware support
+streamPort = None  # e.g. 8765 to also stream the live frames to local WebSocket clients (FrameServer)
 dataLine = [0]
 dataThread = None
 reader = None
+readerL = None
 enable = 0
 liveGUIWindow = None
 
 # CSV file setup
 outputFileName = "GloveData.csv"
-csvFile = None
-csvWriter = None
+recorder = None
+
+#open_ports(delay)
+#Open the serial port of each glove that is not open yet: the right glove on port, the left on portL if one is given.
+#delay: seconds to wait for newly opened gloves to reset
+def open_ports(delay):
+    global reader, readerL
+    opened = False
+    if(reader == None):
+        reader = serial.Serial(port, baudRate)
+        opened = True
+    if(portL and readerL == None):
+        readerL = serial.Serial(portL, baudRate)
+        opened = True
+    if opened:
+        time.sleep(delay)
+
+#glove_readers()
+#The open serial readers, by hand ('R', and 'L' if the left glove is connected)
+def glove_readers():
+    readers = {'R': reader}
+    if readerL:
+        readers['L'] = readerL
+    return readers
 
 #start_data_acquire()
 #Begin data collection. Disable start button, and start up data collection thread. If no serial, produce error code
 def start_data_acquire():
-    global enable, reader, csvWriter, csvFile, startTime, dataThread, outputFileName, port, liveGUIWindow
+    global enable, reader, recorder, startTime, dataThread, outputFileName, port, portL, liveGUIWindow
     set_status("Connecting...")
     outputFileName = fileNameEntry.get()
     port = comPortEntry.get()
+    portL = comPortEntryL.get().strip()
     try:
         set_status("Connecting to glove...")
-        if(reader == None):
-            reader = serial.Serial(port, baudRate)
-            time.sleep(3)
+        open_ports(3)
         startButton.configure(state=tk.DISABLED)
         stopButton.configure(state=tk.NORMAL)
 
@@ -60,51 +89,35 @@ def start_data_acquire():
 #buadRate: communication baud rate
 #outputFileName: CSV output file name
 
-#Read data sent from gloves over serial, and output to desired file
+#Read data sent from gloves over serial, and output to desired file.
+#Every connected glove is read on one asyncio event loop (AsyncAcquisition.py); the recorder and the live display
+#each consume the frames from their own queue, as does the WebSocket frame server when streamPort is set
 def data_acquire(port, baudRate, outputFileName):
-    global enable, reader, csvFile, csvWriter, startTime, liveGUIWindow
+    global enable, reader, recorder, startTime, liveGUIWindow
     # Try to open serial port
     try:
         set_status("Connecting to glove...")
-        if(reader == None):
-            reader = serial.Serial(port, baudRate)
-            time.sleep(3)
+        open_ports(3)
         #Begin data collection
         set_status("Reading data...")
 
-        if reader:
-            reader.write(b"ON")
+        # With both gloves connected, every frame is tagged with its port's hand
+        readers = glove_readers()
+        sources = [GloveSource(SerialTransport(serialPort=gloveReader), hand if len(readers) > 1 else None, binaryMode)
+                   for hand, gloveReader in readers.items()]
         startTime = time.perf_counter()
-        csvFile = open(outputFileName, 'w', newline='')
-        csvWriter = csv.writer(csvFile, lineterminator='\n')
-
-        # Write header row
-        csvWriter.writerow(
-            ["Timestamp",
-             "Thumb Flex", "Pointer Flex", "Middle Flex", "Ring Flex", "Pinky Flex",
-             "Thumb Acc. X", "Thumb Acc. Y", "Thumb Acc. Z", "Thumb Gyro X", "Thumb Gyro Y", "Thumb Gyro Z",
-             "Pointer Acc. X", "Pointer Acc. Y", "Pointer Acc. Z", "Pointer Gyro X", "Pointer Gyro Y", "Pointer Gyro Z",
-             "Middle Acc. X", "Middle Acc. Y", "Middle Acc. Z", "Middle Gyro X", "Middle Gyro Y", "Middle Gyro Z",
-             "Ring Acc. X", "Ring Acc. Y", "Ring Acc. Z", "Ring Gyro X", "Ring Gyro Y", "Ring Gyro Z",
-             "Pinky Acc. X","Pinky Acc. Y", "Pinky Acc. Z", "Pinky Gyro X", "Pinky Gyro Y", "Pinky Gyro Z",
-             "Wrist Gyro X", "Wrist Gyro Y", "Wrist Gyro Z", "Wrist Acc. X", "Wrist Acc. Y", "Wrist Acc. Z",
-             "Hand"])
+        recorder = openRecorder(outputFileName, CSV_HEADER)
         enable = True
 
-        #While device enabled, read data from serial and write to file
+        #While device enabled, read data from serial and write to file (sources send the start command)
         # Also, pipe data to PySide Window Manager
-        while enable and reader.isOpen():
-            # Read data from serial port
-            data = reader.readline().decode('utf-8').strip()
-
-            if data:
-                timestamp = round(time.perf_counter() - startTime, 3)
-                dataLine = (data.split(','))
-                dataLine.insert(0, timestamp)
-                csvWriter.writerow(dataLine)
-
-                if liveGUIWindow:
-                    liveDisplayUpdate(liveGUIWindow, data, timestamp) # send data to liveDisplay for conversion to Interface Output
+        try:
+            service = runAcquisition(sources, recorder, forward_frame, startTime, lambda: enable, streamPort)
+        finally:
+            # Flush remaining rows to disk
+            recorder.close()
+        print(f"Recording stats: {recorder.stats()}")
+        print(f"Acquisition stats: {service.stats()}")
 
     except serial.SerialException as e:
         tk.messagebox.showerror("Error", f"Error: Could not open serial port\n{e}")
@@ -119,24 +132,35 @@ def data_acquire(port, baudRate, outputFileName):
         startButton.config(state=tk.NORMAL)
         exit()
 
+#forward_frame(data, timestamp, hand, sequence, deviceTime, receivedAt)
+#Pass each acquired frame, with its sequence number and device/host times, to the live display, if one is open
+def forward_frame(data, timestamp, hand=None, sequence=-1, deviceTime=float('nan'), receivedAt=None):
+    if liveGUIWindow:
+        liveDisplayUpdate(liveGUIWindow, data, timestamp, hand, sequence, deviceTime, receivedAt) # send data to liveDisplay for conversion to Interface Output
+
 #stop_data()
 #Stop collecting data from gloves
 def stop_data():
-    global enable, reader
+    global enable, reader, readerL
     set_status("Stopping...")
     enable = False
-    if reader:
-        reader.write(b"OFF")
+    for gloveReader in (reader, readerL):
+        if gloveReader:
+            gloveReader.write(STOP_COMMAND)
     stopButton.config(state=tk.DISABLED)
     startButton.config(state=tk.NORMAL)
     set_status("Data saved to " + outputFileName)
 
+    # Save per-stage timings next to the recording
+    if instrumentation.enabled:
+        instrumentation.dumpJson(os.path.splitext(outputFileName)[0] + "_timing.json")
+
     liveDisplayClose(liveGUIWindow) # end PySide Session
 
 
 #Close serial reader, csv file, and data thread
 def free_resources():
-    global  reader, csvFile, dataThread, liveGUIWindow
+    global  enable, reader, readerL, recorder, dataThread, liveGUIWindow
 
     # close pyside window if it exists
     if liveGUIWindow is not None:
@@ -144,24 +168,8 @@ def free_resources():
         liveGUIWindow.deleteLater()
         liveGUIWindow = None
 
-    #Close serial reader
-    if reader:
-        try:
-            reader.close()
-            print("Serial port closed")
-        except serial.SerialException as e:
-            print(f"Error closing serial port: {e}")
-    #Close csv file
-    if csvFile:
-        try:
-            csvFile.close()
-            print("Csv file closed")
-        except Exception as e:
-            print("Error closing CSV file: {e}")
-
-        return
-
-    #Join data thread with main thread
+    #Stop acquisition and join data thread with main thread, so nothing writes to the recorder while it closes
+    enable = False
     if dataThread:
         try:
             if dataThread and dataThread.is_alive():
@@ -170,6 +178,23 @@ def free_resources():
         except Exception as e:
             print(f"Error closing data thread: {e}")
 
+    #Close serial readers
+    for gloveReader in (reader, readerL):
+        if gloveReader:
+            try:
+                gloveReader.close()
+                print("Serial port closed")
+            except serial.SerialException as e:
+                print(f"Error closing serial port: {e}")
+    #Close output file, unless the data thread is still using it (close is idempotent; the data thread closes it as
+    #acquisition ends)
+    if recorder and not (dataThread and dataThread.is_alive()):
+        try:
+            recorder.close()
+            print("Csv file closed")
+        except Exception as e:
+            print(f"Error closing CSV file: {e}")
+
 #on_close()
 #fires when x button is pressed. Close program
 def on_close():
@@ -195,14 +220,13 @@ def set_status(status):
 
 #Run flex sensor calibration
 def calibrate_gloves():
-    global reader, port
+    global reader, port, portL
     port = comPortEntry.get()
-    #If no serial reader/writer, open one
+    portL = comPortEntryL.get().strip()
+    #If no serial reader/writer, open one per glove
     try:
-        if (reader == None):
-            set_status("Connecting to glove...")
-            reader = serial.Serial(port, baudRate)
-            time.sleep(1)
+        set_status("Connecting to glove...")
+        open_ports(1)
     except serial.SerialException as e:
         tk.messagebox.showerror("Error", f"Error: Could not open serial port\n{e}")
         stopButton.config(state=tk.DISABLED)
@@ -222,17 +246,17 @@ def calibrate_gloves():
 #calibration1()
 #Calibrate glove's minimum flex value
 def calibration1():
-    global reader
-    if(reader):
-        reader.write(b"CAL1")
+    for gloveReader in glove_readers().values():
+        if(gloveReader):
+            gloveReader.write(b"CAL1")
     #Lift second calibration frame, with button to continue
     calibrationFrame2.lift()
 
 #calibration2()
 #calibrate glove's maximum flex value
 def calibration2():
-    global reader
-    reader.write(b"CAL2")
+    for gloveReader in glove_readers().values():
+        gloveReader.write(b"CAL2")
     calibrationFinishedFrame.lift()
 
 #finishCalibration()
@@ -249,8 +273,8 @@ def liveDisplayOpen():
     liveGUIWindow.initDisplay()
     return liveGUIWindow
 
-def liveDisplayUpdate(currentWindow, data, timestamp):
-    currentWindow.updateData(data, timestamp)
+def liveDisplayUpdate(currentWindow, data, timestamp, hand=None, sequence=-1, deviceTime=float('nan'), receivedAt=None):
+    currentWindow.updateData(data, timestamp, hand, sequence, deviceTime, receivedAt)
     return
 
 def liveDisplayClose(OldWindow):
@@ -281,25 +305,32 @@ if __name__ == "__main__":
     fileNameEntry.grid(column=1, row=0, padx=5, sticky="NSEW")
     fileNameEntry.insert(0, outputFileName)
 
-    comPortLabel = ttk.Label(dataFrame, text="COM Port:")
+    comPortLabel = ttk.Label(dataFrame, text="COM Port (Right Hand):")
     comPortLabel.grid(column=0, row=1)
     comPortEntry = ttk.Entry(dataFrame)
     comPortEntry.grid(column=1, row=1, padx=5, sticky="NSEW")
     comPortEntry.insert(0, port)
 
+    # Optional second glove, read concurrently with the first
+    comPortLabelL = ttk.Label(dataFrame, text="COM Port (Left Hand):")
+    comPortLabelL.grid(column=0, row=2)
+    comPortEntryL = ttk.Entry(dataFrame)
+    comPortEntryL.grid(column=1, row=2, padx=5, sticky="NSEW")
+    comPortEntryL.insert(0, portL)
+
     startButton = ttk.Button(dataFrame, text="Start Acquisition", command=start_data_acquire)
     startButton.configure(state=tk.DISABLED)
-    startButton.grid(column=0, row=2, padx=5, sticky="NEW")
+    startButton.grid(column=0, row=3, padx=5, sticky="NEW")
 
     stopButton = ttk.Button(dataFrame, text="Stop Acquisition", command=stop_data)
     stopButton.configure(state=tk.DISABLED)
-    stopButton.grid(column=1, row=2, padx=5, sticky="NEW")
+    stopButton.grid(column=1, row=3, padx=5, sticky="NEW")
 
     calibrateButton = ttk.Button(dataFrame, text="Calibrate Glove", command=calibrate_gloves)
-    calibrateButton.grid(column=0, row=3, columnspan=2, sticky="ew")
+    calibrateButton.grid(column=0, row=4, columnspan=2, sticky="ew")
 
     statusText = ttk.Label(dataFrame, text="")
-    statusText.grid(column=0, row=4, columnspan=2)
+    statusText.grid(column=0, row=5, columnspan=2)
     set_status("Gloves not calibrated")
     # ------------------------------------------------------------------------------------------------------------------
 
@@ -0,0 +1,273 @@
+import argparse
+import time
+import numpy as np
+import shiboken6
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QDoubleSpinBox, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+from GloveProtocol import CSV_HEADER, NUM_CHANNELS
+
+# Scrolling strip charts of any of the 41 channels, for watching sensor waveforms at full rate.
+# Samples go into a preallocated ring (ChannelHistory); each repaint reduces the visible window to one
+# min/max pair per pixel column (decimateMinMax), so drawing cost follows the widget's width, not the
+# sample rate.
+#
+#   python StripChart.py [--rate 1000]    synthetic glove (GloveSimulator) at the given rate
+
+CHANNEL_NAMES = CSV_HEADER[1:NUM_CHANNELS + 1]
+DEFAULT_CHANNELS = (0, 1, 2, 3, 4)  # flex sensors
+LANE_COLORS = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#17becf')
+
+
+class ChannelHistory:
+    """
+    Preallocated ring of the most recent samples of every channel.
+
+    Blocks are copied in with vectorized slot arithmetic; nothing is allocated per sample.
+    Only the GUI thread uses it (fed from the render tick's drained block), so it takes no lock.
+
+    Args:
+        capacity: samples kept, e.g. 10 s at 1 kHz
+        num_channels: channels per sample
+    """
+
+    def __init__(self, capacity=16384, num_channels=NUM_CHANNELS):
+        self.capacity = capacity
+        self.values = np.full((capacity, num_channels), np.nan)
+        self.timestamps = np.zeros(capacity)
+        self.count = 0  # total samples written; slot = count % capacity
+
+    def extend(self, values, timestamps):
+        values = values[-self.capacity:]
+        timestamps = timestamps[-self.capacity:]
+        slots = (self.count + np.arange(len(values))) % self.capacity
+        self.values[slots] = values
+        self.timestamps[slots] = timestamps
+        self.count += len(values)
+
+    def window(self, seconds, channels):
+        """
+        The samples of the last `seconds` before the newest one, oldest first.
+
+        Args:
+            seconds: time span, back from the newest sample
+            channels: channel indices to copy out
+
+        Returns:
+            (timestamps, values) copies, values (N, len(channels)), possibly empty
+        """
+        available = min(self.count, self.capacity)
+        slots = (self.count - available + np.arange(available)) % self.capacity
+        timestamps = self.timestamps[slots]
+        if available:
+            first = np.searchsorted(timestamps, timestamps[-1] - seconds)
+            slots, timestamps = slots[first:], timestamps[first:]
+        return timestamps, self.values[np.ix_(slots, channels)]
+
+
+# decimateMinMax(values, columns)
+# Reduce (N, channels) samples to at most `columns` rows of per-column minimum and maximum, ignoring NaN,
+# so every spike survives however many samples share a pixel. Returns (mins, maxs, firstSample) where
+# firstSample is the index of each column's first sample; with N <= columns every sample is its own column
+def decimateMinMax(values, columns):
+    count = len(values)
+    if count <= columns:
+        return values, values, np.arange(count)
+    edges = np.linspace(0, count, columns, endpoint=False).astype(np.intp)
+    with np.errstate(invalid='ignore'):
+        return np.fmin.reduceat(values, edges, axis=0), np.fmax.reduceat(values, edges, axis=0), edges
+
+
+# polylineBuffer(count)
+# A QPolygonF of `count` points and a (count, 2) float64 NumPy view of its storage, so points are written
+# with array operations instead of creating a QPointF per point
+def polylineBuffer(count):
+    polyline = QPolygonF()
+    polyline.resize(count)
+    storage = shiboken6.VoidPtr(polyline.data(), count * 2 * 8, True)
+    return polyline, np.frombuffer(storage, dtype=np.float64).reshape(count, 2)
+
+
+class StripChart(QWidget):
+    """
+    Stacked lanes, one per selected channel, each scaled to its own range over the window.
+
+    Args:
+        history: ChannelHistory to draw from
+        channels: channel indices (0-40, CSV order after Timestamp) to show
+        windowSeconds: time span shown
+        refreshRate: repaints per second while new samples arrive
+    """
+
+    def __init__(self, history, channels=DEFAULT_CHANNELS, windowSeconds=5.0, refreshRate=30, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.channels = list(channels)
+        self.windowSeconds = windowSeconds
+        self.setMinimumSize(400, 300)
+
+        self.lastDrawnCount = -1
+        self.paints = 0
+        self.paintSeconds = 0.0  # duration of the last paintEvent
+
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.timeout.connect(self.refresh)
+        self.refreshTimer.start(int(1000 / refreshRate))
+
+    def setChannels(self, channels):
+        self.channels = list(channels)
+        self.update()
+
+    def setWindowSeconds(self, seconds):
+        self.windowSeconds = seconds
+        self.update()
+
+    def refresh(self):
+        # Repaint only when samples arrived since the last paint
+        if self.history.count != self.lastDrawnCount:
+            self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        self.lastDrawnCount = self.history.count
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('white'))
+        if not self.channels:
+            painter.end()
+            return
+
+        timestamps, values = self.history.window(self.windowSeconds, self.channels)
+        width, height = self.width(), self.height()
+        laneHeight = height / len(self.channels)
+        painter.setPen(QColor('#dddddd'))
+        for lane in range(1, len(self.channels)):
+            painter.drawLine(0, int(lane * laneHeight), width, int(lane * laneHeight))
+
+        if len(timestamps):
+            mins, maxs, firstSample = decimateMinMax(values, width)
+            # Columns placed by time, so the newest sample is at the right edge and gaps in the stream show
+            span = self.windowSeconds
+            xs = (width - 1) - (timestamps[-1] - timestamps[firstSample]) * ((width - 1) / span)
+            for lane, channel in enumerate(self.channels):
+                self.drawLane(painter, lane, channel, xs, mins[:, lane], maxs[:, lane], laneHeight)
+
+        painter.end()
+        self.paints += 1
+        self.paintSeconds = time.perf_counter() - start
+
+    def drawLane(self, painter, lane, channel, xs, mins, maxs, laneHeight):
+        top = lane * laneHeight
+        painter.setPen(QColor('#444444'))
+        painter.drawText(4, int(top + 14), CHANNEL_NAMES[channel])
+
+        readable = ~(np.isnan(mins) | np.isnan(maxs))
+        if not readable.any():
+            return
+        low, high = float(mins[readable].min()), float(maxs[readable].max())
+        if high - low < 1e-9:
+            low, high = low - 1.0, high + 1.0
+        painter.drawText(4, int(top + laneHeight - 4), f"{low:.2f} .. {high:.2f}")
+
+        # Envelope as one polyline through every column's min and max
+        scale = (laneHeight - 20) / (high - low)
+        bottom = top + laneHeight - 4
+        x = xs[readable]
+        yMin = bottom - (mins[readable] - low) * scale
+        yMax = bottom - (maxs[readable] - low) * scale
+        polyline, points = polylineBuffer(len(x) * 2)
+        points[0::2, 0] = x
+        points[1::2, 0] = x
+        points[0::2, 1] = yMin
+        points[1::2, 1] = yMax
+        painter.setPen(QPen(QColor(LANE_COLORS[lane % len(LANE_COLORS)]), 1))
+        painter.drawPolyline(polyline)
+
+
+class StripChartWindow(QWidget):
+    """
+    Strip chart with a channel picker and window length, fed with blocks of samples.
+
+    Args:
+        capacity: samples kept in the history ring
+        title: window title
+    """
+
+    def __init__(self, capacity=16384, title="Channel Plot"):
+        super().__init__()
+        self.setWindowTitle(title)
+        self.resize(1000, 700)
+        self.history = ChannelHistory(capacity)
+        self.chart = StripChart(self.history)
+
+        self.channelList = QListWidget()
+        for index, name in enumerate(CHANNEL_NAMES):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if index in DEFAULT_CHANNELS else Qt.Unchecked)
+            self.channelList.addItem(item)
+        self.channelList.itemChanged.connect(self.updateChannels)
+        self.channelList.setMaximumWidth(200)
+
+        self.windowBox = QDoubleSpinBox()
+        self.windowBox.setRange(0.1, 60.0)
+        self.windowBox.setValue(self.chart.windowSeconds)
+        self.windowBox.setSuffix(" s")
+        self.windowBox.valueChanged.connect(self.chart.setWindowSeconds)
+
+        controls = QVBoxLayout()
+        controls.addWidget(QLabel("Window:"))
+        controls.addWidget(self.windowBox)
+        controls.addWidget(QLabel("Channels:"))
+        controls.addWidget(self.channelList)
+
+        layout = QHBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.chart, 1)
+
+    def updateChannels(self):
+        self.chart.setChannels([i for i in range(self.channelList.count())
+                                if self.channelList.item(i).checkState() == Qt.Checked])
+
+    def push(self, values, timestamps):
+        # Add a block of samples, (N, 41) and (N,); drawn on the chart's next refresh
+        self.history.extend(values, timestamps)
+
+
+if __name__ == '__main__':
+    from PySideGraphicalDisplay import app
+    from GloveSimulator import SyntheticSignals
+
+    parser = argparse.ArgumentParser(description="Strip charts of a synthetic glove's channels")
+    parser.add_argument("--rate", type=float, default=1000, help="samples per second")
+    parser.add_argument("--seconds", type=float, default=0, help="close after this many seconds (0: stay open)")
+    args = parser.parse_args()
+
+    window = StripChartWindow()
+    window.show()
+    signals = SyntheticSignals()
+    startTime = time.perf_counter()
+    produced = [0]
+    paintTimes = []
+    paintsSeen = [0]
+
+    # Feed whatever samples fell due at 60 Hz, as the acquisition window's render tick does
+    def feed():
+        now = time.perf_counter() - startTime
+        due = int(now * args.rate) - produced[0]
+        if due > 0:
+            times = (produced[0] + np.arange(due)) / args.rate
+            window.push(signals.block(times), times)
+            produced[0] += due
+        if window.chart.paints != paintsSeen[0]:
+            paintsSeen[0] = window.chart.paints
+            paintTimes.append(window.chart.paintSeconds)
+
+    feedTimer = QTimer()
+    feedTimer.timeout.connect(feed)
+    feedTimer.start(16)
+    if args.seconds:
+        QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec()
+    if paintTimes:
+        print(f"{produced[0]} samples at {args.rate:g} Hz, paint p50 {np.median(paintTimes) * 1000:.2f} ms, "
+              f"p99 {np.percentile(paintTimes, 99) * 1000:.2f} ms")
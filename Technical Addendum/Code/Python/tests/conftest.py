@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The modules are flat scripts in the directory above; import them by name as the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Anything that creates Qt widgets runs headless
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('QT3D_RENDERER', 'opengl')
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GloveData.csv")
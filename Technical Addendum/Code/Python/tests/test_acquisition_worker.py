@@ -0,0 +1,50 @@
+import csv
+import time
+import serial
+from PySide6.QtWidgets import QApplication
+from GloveControlPanel import AcquisitionWorker
+from GloveSimulator import GloveSimulator, PtyLink, SyntheticSignals
+
+
+def runWorker(worker, seconds):
+    app = QApplication.instance()
+    results = {"status": [], "failed": [], "stats": []}
+    worker.status.connect(results["status"].append)
+    worker.failed.connect(results["failed"].append)
+    worker.statsReady.connect(results["stats"].append)
+    worker.start()
+    time.sleep(seconds)
+    worker.stop()
+    assert worker.wait(5000)
+    app.processEvents()
+    return results
+
+
+def test_workerRecordsAndForwardsTheGlove(tmp_path):
+    link = PtyLink(GloveSimulator(SyntheticSignals(), sampleRate=500)).start()
+    port = serial.Serial(link.path, 2000000, timeout=0)
+    frames = []
+    output = str(tmp_path / "GloveData.csv")
+    results = runWorker(AcquisitionWorker({'R': port}, output, lambda *frame: frames.append(frame), binaryMode=True),
+                        0.5)
+    time.sleep(0.1)  # let the simulator read the stop command
+    port.close()
+    link.stop()
+
+    assert results["failed"] == []
+    assert results["status"] == ["Reading data..."]
+    [stats] = results["stats"]
+    with open(output, newline='') as csvFile:
+        rows = list(csv.reader(csvFile))[1:]
+    assert len(rows) == len(frames) == stats["recording"]["rowsWritten"] > 100
+    assert link.simulator.commands[:2] == ['ONB', 'OFF']
+
+
+def test_workerReportsAClosedPort(tmp_path):
+    link = PtyLink(GloveSimulator(SyntheticSignals())).start()
+    port = serial.Serial(link.path, 2000000, timeout=0)
+    port.close()
+    results = runWorker(AcquisitionWorker({'R': port}, str(tmp_path / "GloveData.csv")), 0.1)
+    link.stop()
+    assert len(results["failed"]) == 1
+    assert results["stats"] == []
@@ -0,0 +1,41 @@
+import math
+import pytest
+from PySide6.QtWidgets import QApplication
+from AnimationWindow import AnimationWindow
+
+
+@pytest.fixture(scope="module")
+def window():
+    app = QApplication.instance() or QApplication([])
+    window = AnimationWindow(angleDeadband=0.5, orientationDeadband=1.0)
+    yield window
+    window.destroy()
+
+
+def test_firstPoseUpdatesEveryTransform(window):
+    assert window.setPose([10.0] * 5, [5.0] * 4, (1.0, 0.0, 0.0, 0.0)) == 10
+
+
+def test_stillHandAndSmallMovesAreSkipped(window):
+    window.setPose([10.0] * 5, [5.0] * 4, (1.0, 0.0, 0.0, 0.0))
+    skipped = window.transformsSkipped
+    assert window.setPose([10.0] * 5, [5.0] * 4, (1.0, 0.0, 0.0, 0.0)) == 0
+    assert window.setPose([10.4] * 5, [5.0] * 4, (1.0, 0.0, 0.0, 0.0)) == 0
+    assert window.transformsSkipped == skipped + 20
+
+    # Only the joints that moved past the deadband, and each joint measures from its last applied angle
+    assert window.setPose([10.0, 10.6, 10.0, 10.0, 10.0], [5.0, 4.0, 5.0, 5.0], None) == 2
+    assert window.joint_angles[1] == 10.6
+    assert window.setPose([10.0, 10.2, 10.0, 10.0, 10.0], [5.0, 4.0, 5.0, 5.0], None) == 0
+
+
+def test_palmFollowsOnlyTurnsPastTheDeadband(window):
+    def aboutZ(degrees):
+        half = math.radians(degrees) / 2
+        return (math.cos(half), 0.0, 0.0, math.sin(half))
+
+    window.setPose([0.0] * 5, [0.0] * 4, aboutZ(0))
+    assert window.setPose([0.0] * 5, [0.0] * 4, aboutZ(0.5)) == 0
+    assert window.setPose([0.0] * 5, [0.0] * 4, aboutZ(1.5)) == 1
+    # q and -q are the same orientation
+    assert window.setPose([0.0] * 5, [0.0] * 4, tuple(-c for c in aboutZ(1.5))) == 0
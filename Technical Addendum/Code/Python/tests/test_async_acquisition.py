@@ -0,0 +1,113 @@
+import asyncio
+import numpy as np
+import pytest
+from AsyncAcquisition import (MAX_READ_SPAN, GloveSource, ReplayTransport, Subscription, TcpTransport,
+                              parseSource)
+from GloveProtocol import NUM_CHANNELS, START_COMMAND, encodeBinaryFrame
+
+
+class ChunkTransport:
+    # Delivers prepared chunks of bytes, one per read, a fixed time apart
+    def __init__(self, chunks, interval=0.02):
+        self.chunks = list(chunks)
+        self.interval = interval
+        self.written = []
+
+    async def open(self):
+        pass
+
+    async def read(self):
+        await asyncio.sleep(self.interval)
+        return self.chunks.pop(0)
+
+    async def write(self, data):
+        self.written.append(data)
+
+    def isOpen(self):
+        return bool(self.chunks)
+
+    def close(self):
+        self.chunks = []
+
+
+def textLine(i):
+    return (','.join(['%03d' % i] * NUM_CHANNELS) + ',R\r\n').encode()
+
+
+def collect(source):
+    async def main():
+        await source.start()
+        return [frame async for frame in source.frames(0.0)]
+    return asyncio.run(main())
+
+
+def assertSpreadOverEachRead(frames, perRead):
+    receivedAt = np.array([frame.receivedAt for frame in frames]).reshape(-1, perRead)
+    # Frames of one read are evenly spaced (equal sizes) and distinct; the first read has no span to spread over
+    assert (receivedAt[0] == receivedAt[0, -1]).all()
+    steps = np.diff(receivedAt[1:], axis=1)
+    assert (steps > 0).all()
+    np.testing.assert_allclose(steps, np.repeat(steps[:, :1], perRead - 1, axis=1), rtol=1e-6)
+    # A read's frames span the time since the previous read
+    np.testing.assert_allclose(receivedAt[1:, -1] - receivedAt[:-1, -1], steps.sum(axis=1) * perRead / (perRead - 1),
+                               rtol=1e-6)
+
+
+def test_textFramesAreStampedByPositionInTheRead():
+    transport = ChunkTransport([b''.join(textLine(4 * read + i) for i in range(4)) for read in range(5)])
+    frames = collect(GloveSource(transport, 'L'))
+    assert transport.written == [START_COMMAND]
+    assert [int(frame.data[0]) for frame in frames] == list(range(20))
+    assert {frame.hand for frame in frames} == {'L'}
+    assertSpreadOverEachRead(frames, 4)
+
+
+def test_binaryFramesAreStampedByPositionInTheRead():
+    values = np.zeros(NUM_CHANNELS)
+    stream = b''.join(encodeBinaryFrame(i, i * 1000, values + i) for i in range(15))
+    size = len(stream) // 5
+    transport = ChunkTransport([stream[offset:offset + size] for offset in range(0, len(stream), size)])
+    frames = collect(GloveSource(transport, binaryMode=True))
+    assert [frame.sequence for frame in frames] == list(range(15))
+    assert [frame.data[0] for frame in frames] == list(range(15))
+    assertSpreadOverEachRead(frames, 3)
+
+
+def test_readSpanIsCappedAfterAnIdleGlove():
+    transport = ChunkTransport([textLine(0), textLine(1) + textLine(2)], interval=3 * MAX_READ_SPAN)
+    frames = collect(GloveSource(transport))
+    assert frames[2].receivedAt - frames[1].receivedAt <= MAX_READ_SPAN / 2 + 1e-9
+
+
+def test_subscriptionDropsOldestOrWaits():
+    async def main():
+        dropping = Subscription(maxsize=3, dropOldest=True)
+        for i in range(10):
+            await dropping.put(i)
+        await dropping.end()
+        kept = [frame async for frame in dropping]
+
+        waiting = Subscription(maxsize=3)
+        for i in range(3):
+            await waiting.put(i)
+        blocked = asyncio.ensure_future(waiting.put(3))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert await waiting.queue.get() == 0
+        await blocked
+        return kept, dropping.stats(), waiting.stats()
+
+    kept, dropped, waited = asyncio.run(main())
+    assert kept == [8, 9]
+    assert dropped["framesDropped"] == 8
+    assert waited["framesBackpressured"] == 1
+
+
+def test_parseSource():
+    source = parseSource('tcp:127.0.0.1:5001@L', binaryMode=True)
+    assert isinstance(source.transport, TcpTransport)
+    assert (source.transport.host, source.transport.port, source.hand, source.binaryMode) == ('127.0.0.1', 5001, 'L', True)
+    replay = parseSource('replay:GloveData.csv')
+    assert isinstance(replay.transport, ReplayTransport) and replay.hand is None
+    with pytest.raises(ValueError):
+        parseSource('usb:3')
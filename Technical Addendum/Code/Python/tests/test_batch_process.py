@@ -0,0 +1,90 @@
+import csv
+import os
+import shutil
+import numpy as np
+from BatchProcess import (PROCESSED_HEADER, estimateSampleRate, findRecordings, loadRecording, processAll,
+                          processRecording, processValues)
+from BinaryRecording import csvToBinary
+from conftest import FIXTURE
+
+
+def test_estimateSampleRate():
+    timestamps = np.concatenate([np.arange(100) * 0.01, [5.0, 5.0, 5.01]])
+    assert np.isclose(estimateSampleRate(timestamps), 100)
+    assert estimateSampleRate(np.array([1.0])) == 10
+
+
+def test_csvAndColumnarRecordingsLoadTheSame(tmp_path):
+    csvToBinary(FIXTURE, str(tmp_path / "data.glove"))
+    fromCsv = loadRecording(FIXTURE)
+    fromBinary = loadRecording(str(tmp_path / "data.glove"))
+    np.testing.assert_array_equal(fromCsv[0], fromBinary[0])
+    np.testing.assert_allclose(fromCsv[1], fromBinary[1], rtol=1e-6)
+    np.testing.assert_array_equal(fromCsv[2], fromBinary[2])
+
+
+def test_processValuesShapes():
+    timestamps, values, _ = loadRecording(FIXTURE)
+    filtered, j1Angles, j2Angles, orientation = processValues(values, timestamps, estimateSampleRate(timestamps))
+    count = len(timestamps)
+    assert filtered.shape == values.shape
+    assert j1Angles.shape == (count, 5) and j2Angles.shape == (count, 4)
+    assert orientation.shape == (count, 6, 4)
+    np.testing.assert_allclose(np.linalg.norm(orientation, axis=2), 1.0, atol=1e-9)
+    np.testing.assert_allclose(j2Angles, j1Angles[:, 1:] / 3)
+
+
+def test_processAllWritesOneOutputPerRecording(tmp_path):
+    sessions = tmp_path / "sessions"
+    os.makedirs(sessions / "day2")
+    shutil.copy(FIXTURE, sessions / "a.csv")
+    csvToBinary(FIXTURE, str(sessions / "day2" / "b.glove"))
+
+    results = processAll([str(sessions)], str(tmp_path / "out"), workers=2)
+    assert sorted(os.path.basename(r["output"]) for r in results) == ["a_processed.csv", "b_processed.csv"]
+    for result in results:
+        with open(result["output"], newline='') as output:
+            rows = list(csv.reader(output))
+        assert rows[0] == PROCESSED_HEADER
+        assert len(rows) - 1 == result["rows"]
+
+    # Outputs written next to the inputs are not picked up as recordings on the next run
+    shutil.copy(tmp_path / "out" / "a_processed.csv", sessions)
+    assert len(findRecordings([str(sessions)])) == 2
+
+
+def test_dualGloveRecordingIsProcessedPerHand(tmp_path):
+    # The fixture as the right glove, interleaved with a left glove that is held flat and still
+    with open(FIXTURE, newline='') as fixture:
+        header, *rows = list(csv.reader(fixture))
+    left = ['0'] * 5 + ['0', '0', '9.81', '0', '0', '0'] * 5 + ['0', '0', '0', '0', '0', '9.81', 'L']
+    mixed = []
+    for row in rows:
+        mixed.append(row[:-1] + ['R'])
+        mixed.append([f"{float(row[0]) + 0.001:.3f}"] + left)
+    with open(tmp_path / "dual.csv", 'w', newline='') as recording:
+        csv.writer(recording).writerows([header] + mixed)
+
+    result = processRecording(str(tmp_path / "dual.csv"), str(tmp_path / "dual_processed.csv"))
+    timestamps, values, _ = loadRecording(FIXTURE)
+    assert np.isclose(result["sampleRates"]["R"], estimateSampleRate(timestamps))
+    with open(result["output"], newline='') as output:
+        header, *processed = list(csv.reader(output))
+    assert header == PROCESSED_HEADER
+    assert [row[1] for row in processed] == ['R', 'L'] * len(rows)
+
+    # The right glove's rows come out as if it had been recorded on its own
+    _, j1Angles, _, orientation = processValues(values, timestamps, result["sampleRates"]["R"])
+    right = np.array([row[2:] for row in processed[0::2]], dtype=float)
+    np.testing.assert_allclose(right[:, :5], j1Angles, atol=0.006)
+    quaternions = right[:, 12:12 + 24].reshape(-1, 6, 4)
+    np.testing.assert_allclose(quaternions, orientation, atol=1e-6)
+
+    # The left glove's fusion never sees the right glove's motion, and its thumb is on the other side
+    leftValues = np.array([[float(v) for v in row[1:-1]] for row in mixed[1::2]])
+    leftTimestamps = timestamps + 0.001
+    _, _, _, leftOrientation = processValues(leftValues, leftTimestamps, result["sampleRates"]["L"])
+    leftRows = np.array([row[2:] for row in processed[1::2]], dtype=float)
+    np.testing.assert_allclose(leftRows[:, 12:12 + 24].reshape(-1, 6, 4), leftOrientation, atol=1e-6)
+    thumbX = PROCESSED_HEADER.index("Thumb tip X (in)") - 2
+    assert np.all(leftRows[:, thumbX] > 0) and np.all(right[:, thumbX] < 0)
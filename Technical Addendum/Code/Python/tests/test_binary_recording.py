@@ -0,0 +1,67 @@
+import json
+import numpy as np
+from BinaryRecording import BinaryRecording, BinaryRecordingSink, binaryToCsv, columnPaths, csvToBinary
+from GloveProtocol import CSV_HEADER, NUM_CHANNELS
+from conftest import FIXTURE
+
+
+def test_csvRoundTripIsByteIdentical(tmp_path):
+    sidecar = str(tmp_path / "GloveData.glove")
+    rows = csvToBinary(FIXTURE, sidecar)
+    assert binaryToCsv(sidecar, str(tmp_path / "GloveData.csv")) == rows
+    with open(FIXTURE, 'rb') as original, open(tmp_path / "GloveData.csv", 'rb') as roundTrip:
+        assert roundTrip.read() == original.read()
+
+
+def test_csvConversionUsesTheSidecarDecimals(tmp_path):
+    sidecar = str(tmp_path / "data.glove")
+    sink = BinaryRecordingSink(sidecar)
+    values = np.full(NUM_CHANNELS, 1.5)
+    values[6] = np.nan
+    sink.writeValues(0.25, values, 'L')
+    sink.close()
+    with open(sidecar) as sidecarFile:
+        metadata = json.load(sidecarFile)
+    metadata["decimals"][5] = 4
+    with open(sidecar, 'w') as sidecarFile:
+        json.dump(metadata, sidecarFile)
+
+    binaryToCsv(sidecar, str(tmp_path / "data.csv"))
+    with open(tmp_path / "data.csv") as csvFile:
+        row = csvFile.read().splitlines()[1].split(',')
+    assert row[:8] == ['0.25', '1', '1', '1', '1', '1', '1.5000', 'E']
+    assert row[8:] == ['1.50'] * (NUM_CHANNELS - 7) + ['L']
+
+
+def test_recordingColumnsAndTimeRange(tmp_path):
+    sidecar = str(tmp_path / "data.glove")
+    sink = BinaryRecordingSink(sidecar, blockRows=7)
+    for i in range(50):
+        values = np.full(NUM_CHANNELS, float(i))
+        values[3] = np.nan
+        sink.writeValues(i * 0.1, values, 'L' if i % 2 else 'R')
+    sink.close()
+
+    recording = BinaryRecording(sidecar)
+    assert len(recording) == 50
+    assert recording.header == CSV_HEADER
+    timestamps, channels, hands = recording.timeRange(1.0, 2.0)
+    np.testing.assert_allclose(timestamps, np.arange(10, 20) * 0.1)
+    np.testing.assert_array_equal(channels[:, 0], np.arange(10, 20))
+    assert np.isnan(channels[:, 3]).all()
+    assert bytes(hands) == b'RL' * 5
+
+
+def test_truncatedRecordingIsStillReadable(tmp_path):
+    sidecar = str(tmp_path / "data.glove")
+    sink = BinaryRecordingSink(sidecar)
+    for i in range(10):
+        sink.writeValues(float(i), np.zeros(NUM_CHANNELS), 'R')
+    sink.close()
+
+    # A crash leaves a partial row in one column file
+    with open(columnPaths(sidecar)["channels"], 'r+b') as channelFile:
+        channelFile.truncate(9 * NUM_CHANNELS * 4 + 5)
+    assert len(BinaryRecording(sidecar)) == 9
+    with open(sidecar) as sidecarFile:
+        assert json.load(sidecarFile)["rows"] == 10
@@ -0,0 +1,44 @@
+import csv
+from AsyncAcquisition import GloveSource, ReplayTransport, runAcquisition
+from RecordingSink import CsvRecordingSink
+from ReplaySource import ReplaySerial
+from conftest import FIXTURE
+
+
+def recordedCount():
+    with open(FIXTURE, newline='') as csvFile:
+        return sum(1 for row in list(csv.reader(csvFile))[1:] if row)
+
+
+def test_bothGlovesAreRecordedInOneTimeOrderedStream(tmp_path):
+    for binaryMode in (False, True):
+        output = str(tmp_path / "dual.csv")
+        sources = [GloveSource(ReplayTransport(replay=ReplaySerial(FIXTURE, speed=None, hand=hand)), hand, binaryMode)
+                   for hand in ('R', 'L')]
+        recorder = CsvRecordingSink(output)
+        frames = []
+        service = runAcquisition(sources, recorder, lambda *frame: frames.append(frame))
+        recorder.close()
+
+        count = recordedCount()
+        assert service.stats()["framesRead"] == [count, count]
+        assert sorted(frame[2] for frame in frames).count('L') == count
+        with open(output, newline='') as csvFile:
+            rows = list(csv.reader(csvFile))[1:]
+        assert [row[-1] for row in rows].count('R') == count
+        assert [row[-1] for row in rows].count('L') == count
+        timestamps = [float(row[0]) for row in rows]
+        assert timestamps == sorted(timestamps)
+
+
+def test_stopsWhenIsRunningTurnsFalse():
+    checks = []
+
+    def isRunning():
+        checks.append(None)
+        return len(checks) < 3
+
+    sources = [GloveSource(ReplayTransport(FIXTURE, speed=1.0, loop=True, hand=hand), hand) for hand in ('R', 'L')]
+    service = runAcquisition(sources, isRunning=isRunning)
+    assert all(count > 0 for count in service.stats()["framesRead"])
+    assert not any(source.transport.replay.streaming for source in sources)
@@ -0,0 +1,28 @@
+import numpy as np
+from FilterBank import FilterBank
+from PySideGraphicalDisplay import LowPassFilter
+
+
+def test_bankMatchesOneLowPassFilterPerChannel():
+    rng = np.random.default_rng(0)
+    frames = rng.normal(0, 1, (300, 6)).cumsum(axis=0)
+    frames[[10, 11, 200], [2, 2, 5]] = np.nan
+
+    filters = [LowPassFilter(5, 100, 2) for _ in range(6)]
+    # LowPassFilter passes an unreadable field ('E') through without touching its state
+    expected = np.array([[np.nan if np.isnan(v) else filters[c].update(v) for c, v in enumerate(frame)]
+                         for frame in frames])
+
+    bank = FilterBank(6, 5, 100, 2)
+    perFrame = np.array([bank.update(frame) for frame in frames])
+    np.testing.assert_allclose(perFrame, expected, equal_nan=True)
+
+    block = FilterBank(6, 5, 100, 2)
+    np.testing.assert_allclose(np.vstack([block.updateBlock(frames[:150]), block.updateBlock(frames[150:])]),
+                               expected, equal_nan=True)
+
+
+def test_cutoffAboveNyquistIsClamped():
+    bank = FilterBank(1, cutoff_freq=80, sample_rate=100)
+    output = bank.updateBlock(np.ones((200, 1)))
+    np.testing.assert_allclose(output[-1], 1.0)
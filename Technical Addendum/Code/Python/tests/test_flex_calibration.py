@@ -0,0 +1,39 @@
+import numpy as np
+from FlexCalibration import FINGERS, FlexCalibration
+
+COEFFICIENTS = {finger: [0.001 * (i + 1), -0.2, 90.0 + i] for i, finger in enumerate(FINGERS)}
+
+
+def polynomialAngles(flex):
+    return np.array([np.polyval(COEFFICIENTS[finger], flex[..., i]) for i, finger in enumerate(FINGERS)]).T
+
+
+def test_integerReadingsMatchThePolynomial():
+    calibration = FlexCalibration(COEFFICIENTS)
+    flex = np.tile(np.arange(256.0), (5, 1)).T
+    np.testing.assert_allclose(calibration.angles(flex), polynomialAngles(flex))
+
+
+def test_fractionalReadingsInterpolateAndOutOfRangeClamps():
+    calibration = FlexCalibration(COEFFICIENTS)
+    flex = np.array([[10.5, 100.25, -7.0, 300.0, np.nan]])
+    angles = calibration.angles(flex)
+    # Interpolation error of a quadratic between neighbouring integers is at most a/4
+    np.testing.assert_allclose(angles[0, :2], polynomialAngles(flex)[0, :2], atol=0.01)
+    assert angles[0, 2] == np.polyval(COEFFICIENTS['middle'], 0)
+    assert angles[0, 3] == np.polyval(COEFFICIENTS['ring'], 255)
+    assert np.isnan(angles[0, 4])
+
+
+def test_singleFrameAndSaveLoad(tmp_path):
+    calibration = FlexCalibration(COEFFICIENTS)
+    calibration.save(str(tmp_path / "calibration.json"))
+    loaded = FlexCalibration.load(str(tmp_path / "calibration.json"))
+    frame = np.array([0.0, 50.0, 100.0, 150.0, 200.0])
+    assert loaded.angles(frame).shape == (5,)
+    np.testing.assert_array_equal(loaded.angles(frame), calibration.angles(frame))
+
+
+def test_defaultCalibrationLoads():
+    angles = FlexCalibration.load().angles(np.full(5, 128.0))
+    assert np.isfinite(angles).all()
@@ -0,0 +1,51 @@
+import math
+import numpy as np
+from ForwardKinematics import (RIGHT_HAND_BASES, TIP, fingerPositions, fingertipPositions,
+                               jointAnglesFromStates)
+from Orientation import quatFromRotationVector
+from RightHand import RIGHT_HAND_SEGMENTS, RightHand
+
+LENGTHS = np.array(RIGHT_HAND_SEGMENTS)
+
+
+def test_straightFingersPointAlongY():
+    tips = fingertipPositions(np.zeros((1, 5, 2)))[0]
+    expected = np.array(RIGHT_HAND_BASES) + np.outer(LENGTHS.sum(axis=1), [0, 1, 0])
+    np.testing.assert_allclose(tips, expected)
+
+
+def test_jointsCurlTowardThePalm():
+    angles = np.zeros((1, 5, 2))
+    angles[0, :, 0] = 90
+    angles[0, 0, 1] = 45  # thumb J2 has no segment after it
+    positions = fingerPositions(angles)[0]
+    base = np.array(RIGHT_HAND_BASES)
+    np.testing.assert_allclose(positions[:, TIP], base + np.column_stack(
+        (np.zeros(5), LENGTHS[:, 0], -(LENGTHS[:, 1] + LENGTHS[:, 2]))), atol=1e-12)
+
+
+def test_segmentLengthsArePreservedForAnyPose():
+    rng = np.random.default_rng(0)
+    positions = fingerPositions(rng.uniform(0, 110, (50, 10)))
+    lengths = np.linalg.norm(np.diff(positions, axis=2), axis=-1)
+    np.testing.assert_allclose(lengths, np.broadcast_to(LENGTHS, lengths.shape))
+
+
+def test_orientationRotatesTheWholeHand():
+    angles = np.random.default_rng(1).uniform(0, 90, (4, 5, 2))
+    q = quatFromRotationVector(np.array([0, 0, math.pi / 2]))
+    rotated = fingertipPositions(angles, orientation=np.tile(q, (4, 1)))
+    plain = fingertipPositions(angles)
+    # 90 degrees about z: (x, y) -> (-y, x)
+    np.testing.assert_allclose(rotated[..., 0], -plain[..., 1], atol=1e-12)
+    np.testing.assert_allclose(rotated[..., 1], plain[..., 0], atol=1e-12)
+
+
+def test_anglesFromHandHistory():
+    hand = RightHand(historyLength=4)
+    for i in range(4):
+        hand.setFromFrame(np.full(5, 10.0 * i))
+        hand.snapshot(float(i))
+    angles = jointAnglesFromStates(hand.history.snapshots()[1])
+    assert angles.shape == (4, 5, 2)
+    np.testing.assert_allclose(angles[3, 1], [22.5, 7.5])
@@ -0,0 +1,51 @@
+import threading
+import numpy as np
+from FrameRingBuffer import FrameRingBuffer
+
+
+def pushFrames(ring, first, count):
+    for i in range(first, first + count):
+        ring.push(np.full(4, i), i * 0.01, 'L' if i % 2 else 'R', sequence=i, deviceTime=i * 10, receivedAt=i)
+
+
+def test_drainReturnsFramesInOrder():
+    ring = FrameRingBuffer(capacity=16, num_channels=4)
+    pushFrames(ring, 0, 5)
+    assert ring.pending() == 5
+    block = ring.drain()
+    assert list(block.sequences) == [0, 1, 2, 3, 4]
+    np.testing.assert_array_equal(block.values[:, 0], [0, 1, 2, 3, 4])
+    assert list(block.hands) == ['R', 'L', 'R', 'L', 'R']
+    assert ring.pending() == 0
+    assert len(ring.drain().timestamps) == 0
+
+
+def test_overrunKeepsNewestFramesAndCountsTheRest():
+    ring = FrameRingBuffer(capacity=8, num_channels=4)
+    pushFrames(ring, 0, 20)
+    block = ring.drain()
+    # The slot at writeIndex may be mid-write, so capacity - 1 frames are readable
+    assert list(block.sequences) == list(range(13, 20))
+    assert ring.overruns == 13
+
+    pushFrames(ring, 20, 3)
+    assert list(ring.drain().sequences) == [20, 21, 22]
+    assert ring.overruns == 13
+
+
+def test_concurrentProducerNeverYieldsTornOrRepeatedFrames():
+    ring = FrameRingBuffer(capacity=64, num_channels=4)
+    total = 20000
+    producer = threading.Thread(target=pushFrames, args=(ring, 0, total))
+    producer.start()
+    received = []
+    while producer.is_alive() or ring.pending():
+        block = ring.drain()
+        # Every row must be one whole frame
+        np.testing.assert_array_equal(block.values[:, 0], block.sequences)
+        np.testing.assert_array_equal(block.values[:, 3], block.sequences)
+        received.extend(block.sequences)
+    producer.join()
+
+    assert all(np.diff(received) > 0)
+    assert len(received) + ring.overruns == total
@@ -0,0 +1,117 @@
+import asyncio
+import math
+import socket
+import struct
+import numpy as np
+from AsyncAcquisition import Frame, GloveSource, ReplayTransport, runAcquisition
+from conftest import FIXTURE
+from FrameServer import (OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG, STREAM_RECORD_SIZE, FrameServer, LoopbackWriter,
+                         decodeStreamRecord, encodeStreamRecord, websocketAccept, websocketFrame)
+from GloveProtocol import NUM_CHANNELS
+
+
+def binaryFrame(i):
+    return Frame(np.arange(NUM_CHANNELS, dtype=float) + i, i * 0.01, 'L', i, i * 1000.0, 0.0)
+
+
+def test_streamRecordRoundTrip():
+    fields = [str(v) for v in range(NUM_CHANNELS)] + ['R']
+    fields[6] = 'E'
+    sequence, timestamp, hand, deviceSequence, deviceTime, values = decodeStreamRecord(
+        encodeStreamRecord(7, Frame(fields, 1.25, None, -1, math.nan, 0.0)))
+    assert (sequence, timestamp, hand, deviceSequence) == (7, 1.25, 'R', -1)
+    assert math.isnan(deviceTime) and math.isnan(values[6])
+    assert values[40] == 40
+
+    record = encodeStreamRecord(3, binaryFrame(3))
+    assert len(record) == STREAM_RECORD_SIZE
+    decoded = decodeStreamRecord(record)
+    assert decoded[2:5] == ('L', 3, 3000.0)
+    np.testing.assert_array_equal(decoded[5], np.arange(NUM_CHANNELS) + 3)
+
+
+def test_websocketHandshakeAndFraming():
+    # RFC 6455 section 1.3 example
+    assert websocketAccept(b"dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+    assert websocketFrame(OPCODE_BINARY, bytes(10))[:2] == b'\x82\x0a'
+    assert websocketFrame(OPCODE_BINARY, bytes(300))[:4] == b'\x82\x7e\x01\x2c'
+    assert websocketFrame(OPCODE_BINARY, bytes(70000))[:10] == b'\x82\x7f' + struct.pack('!Q', 70000)
+
+
+def test_slowClientOnlyLosesItsOwnFrames():
+    async def main():
+        server = FrameServer(maxQueued=8)
+        fast, slow = LoopbackWriter(), LoopbackWriter(drainDelay=0.05)
+        server.addClient(fast, "fast")
+        server.addClient(slow, "slow")
+        for i in range(200):
+            server.publish(binaryFrame(i))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.2)
+        await server.close()
+        return server, fast.records(), slow.records()
+
+    server, fast, slow = asyncio.run(main())
+    assert [record[0] for record in fast] == list(range(200))
+    sequences = [record[0] for record in slow]
+    assert sequences == sorted(sequences) and sequences[-1] == 199
+    stats = {client["client"]: client for client in server.stats()["clients"]}
+    assert stats["fast"]["dropped"] == 0
+    assert stats["slow"]["dropped"] == 200 - len(slow) > 0
+
+
+def test_websocketClientOverTcp():
+    async def main():
+        server = FrameServer(port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection('localhost', server.port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        response = await reader.readuntil(b'\r\n\r\n')
+        while not server.clients:
+            await asyncio.sleep(0.01)
+        for i in range(3):
+            server.publish(binaryFrame(i))
+        messages = [await reader.readexactly(4 + STREAM_RECORD_SIZE) for _ in range(3)]
+
+        # Masked ping from the client gets a pong with the same payload
+        mask = b'\x01\x02\x03\x04'
+        writer.write(bytes([0x80 | OPCODE_PING, 0x80 | 2]) + mask + bytes(b ^ mask[i] for i, b in enumerate(b'hi')))
+        pong = await reader.readexactly(4)
+
+        # Close (status 1000) is echoed back before the server drops the connection
+        writer.write(bytes([0x80 | OPCODE_CLOSE, 0x80 | 2]) + mask + bytes(b ^ mask[i] for i, b in enumerate(b'\x03\xe8')))
+        closeReply = await reader.readexactly(4)
+        remainder = await reader.read()
+        writer.close()
+        await server.close()
+        return response, messages, pong, closeReply, remainder
+
+    response, messages, pong, closeReply, remainder = asyncio.run(main())
+    assert response.startswith(b"HTTP/1.1 101")
+    assert b"s3pPLMBiTxaQ9kYGzzhZRbK+xOo=" in response
+    assert [decodeStreamRecord(message[4:])[0] for message in messages] == [0, 1, 2]
+    assert pong == bytes([0x80 | OPCODE_PONG, 2]) + b'hi'
+    assert closeReply == bytes([0x80 | OPCODE_CLOSE, 2]) + b'\x03\xe8'
+    assert remainder == b''
+
+
+def test_takenStreamPortDoesNotStopRecording():
+    class ListRecorder:
+        def __init__(self):
+            self.rows = []
+
+        def writeRow(self, row):
+            self.rows.append(row)
+
+    taken = socket.socket()
+    taken.bind(('localhost', 0))
+    taken.listen()
+    try:
+        recorder = ListRecorder()
+        service = runAcquisition([GloveSource(ReplayTransport(FIXTURE, None))], recorder,
+                                 streamPort=taken.getsockname()[1])
+    finally:
+        taken.close()
+    assert len(recorder.rows) == service.sources[0].framesRead > 0
+    assert service.frameServer.stats()["framesPublished"] == 0
@@ -0,0 +1,108 @@
+import numpy as np
+from GloveProtocol import (NUM_CHANNELS, FRAME_SIZE, SYNC_BYTES, BinaryFrameDecoder, encodeBinaryFrame,
+                           fieldsToValues, parseTextLine, valuesToFields)
+
+
+def frameValues(i):
+    values = np.arange(NUM_CHANNELS, dtype=float) + i
+    values[:5] = (np.arange(5) * 50 + i) % 256
+    return values
+
+
+def decodeAll(decoder):
+    frames = []
+    frame = decoder.nextFrame()
+    while frame is not None:
+        sequence, deviceTime, values, hand = frame
+        frames.append((sequence, deviceTime, values.copy(), hand))
+        frame = decoder.nextFrame()
+    return frames
+
+
+def test_binaryFrameRoundTrip():
+    decoder = BinaryFrameDecoder()
+    decoder.feed(encodeBinaryFrame(7, 123456, frameValues(3), b'L'))
+    [(sequence, deviceTime, values, hand)] = decodeAll(decoder)
+    assert (sequence, deviceTime, hand) == (7, 123456, 'L')
+    np.testing.assert_allclose(values, frameValues(3).astype(np.float32))
+
+
+def test_unreadableFieldsSurviveTheBinaryFrame():
+    fields = valuesToFields(np.arange(NUM_CHANNELS, dtype=float), 'R')
+    fields[2] = fields[9] = 'E'
+    decoder = BinaryFrameDecoder()
+    decoder.feed(encodeBinaryFrame(1, 0, fieldsToValues(fields, np.empty(NUM_CHANNELS))))
+    [(_, _, values, _)] = decodeAll(decoder)
+    assert np.isnan(values[2]) and np.isnan(values[9])
+    assert valuesToFields(values, 'R') == fields
+
+    # 255 is reserved for unreadable, so a full-scale reading goes out as 254
+    decoder.feed(encodeBinaryFrame(2, 0, np.full(NUM_CHANNELS, 255.0)))
+    [(_, _, values, _)] = decodeAll(decoder)
+    np.testing.assert_array_equal(values[:5], 254)
+
+
+def test_decoderRecoversEveryFrameThroughGarbageAndFalseSyncs():
+    rng = np.random.default_rng(1)
+    stream = bytearray()
+    for i in range(50):
+        # Noise between frames, including sync bytes that do not start a frame
+        stream += rng.integers(0, 256, int(rng.integers(0, 20)), dtype=np.uint8).tobytes()
+        stream += SYNC_BYTES + bytes(3)
+        stream += encodeBinaryFrame(i, i * 1000, frameValues(i))
+
+    decoder = BinaryFrameDecoder()
+    frames = []
+    for offset in range(0, len(stream), 37):  # arbitrary read sizes, splitting frames
+        decoder.feed(bytes(stream[offset:offset + 37]))
+        frames += decodeAll(decoder)
+
+    assert [frame[0] for frame in frames] == list(range(50))
+    for i, frame in enumerate(frames):
+        np.testing.assert_allclose(frame[2], frameValues(i).astype(np.float32))
+    assert decoder.crcErrors >= 50
+    assert decoder.bytesSkipped > 0
+
+
+def test_decoderRejectsCorruptedFrame():
+    frame = bytearray(encodeBinaryFrame(1, 0, frameValues(1)))
+    frame[20] ^= 0xFF
+    decoder = BinaryFrameDecoder()
+    decoder.feed(bytes(frame) + encodeBinaryFrame(2, 0, frameValues(2)))
+    assert [frame[0] for frame in decodeAll(decoder)] == [2]
+    assert decoder.crcErrors == 1
+
+
+def test_partialFrameWaitsForTheRest():
+    frame = encodeBinaryFrame(5, 0, frameValues(5))
+    decoder = BinaryFrameDecoder()
+    decoder.feed(frame[:FRAME_SIZE // 2])
+    assert decoder.nextFrame() is None
+    decoder.feed(frame[FRAME_SIZE // 2:])
+    assert decoder.nextFrame()[0] == 5
+
+
+def test_textLineParsing():
+    fields = [str(v) for v in range(NUM_CHANNELS)] + ['R']
+    line = (' , '.join(fields) + '\r\n').encode()
+    assert parseTextLine(line) == fields
+    assert parseTextLine(b'\r\n') is None
+
+
+def test_unreadableFieldsBecomeNaN():
+    fields = ['1'] * NUM_CHANNELS
+    fields[12] = 'E'
+    values = fieldsToValues(fields, np.empty(NUM_CHANNELS))
+    assert np.isnan(values[12])
+    assert np.count_nonzero(np.isnan(values)) == 1
+
+
+def test_valuesToFieldsFormatsLikeTheFirmware():
+    values = np.full(NUM_CHANNELS, 1.5)
+    values[0] = 200
+    values[7] = np.nan
+    fields = valuesToFields(values, 'R')
+    assert fields[0] == '200'
+    assert fields[5] == '1.50'
+    assert fields[7] == 'E'
+    assert fields[-1] == 'R'
@@ -0,0 +1,106 @@
+import time
+import numpy as np
+import pytest
+from AsyncAcquisition import GloveSource, TcpTransport, runAcquisition
+from GloveProtocol import NUM_CHANNELS, BinaryFrameDecoder
+from GloveSimulator import GloveSimulator, RecordingSignals, SyntheticSignals, TcpLink
+from conftest import FIXTURE
+
+
+class ConstantSignals:
+    # Raw flex readings fixed at level, every other channel 0
+    rawFlex = True
+
+    def __init__(self, level):
+        self.level = level
+
+    def block(self, times):
+        values = np.zeros((len(times), NUM_CHANNELS))
+        values[:, :5] = self.level
+        return values
+
+
+def decode(frames):
+    decoder = BinaryFrameDecoder()
+    decoder.feed(b''.join(frames))
+    decoded = []
+    frame = decoder.nextFrame()
+    while frame is not None:
+        decoded.append((frame[0], frame[1], frame[2].copy()))
+        frame = decoder.nextFrame()
+    return decoded
+
+
+def test_rateOutsideFirmwareRangeIsRejected():
+    with pytest.raises(ValueError):
+        GloveSimulator(SyntheticSignals(), sampleRate=50)
+
+
+def test_framesFallDueAtTheSampleRateOnlyWhileStreaming():
+    simulator = GloveSimulator(SyntheticSignals(), sampleRate=1000)
+    start = simulator.clockStart
+    assert len(simulator.poll(start + 1.0)) == 0
+    simulator.receive(b"ON\n", start + 1.0)
+    frames = simulator.poll(start + 1.0095)
+    assert len(frames) == 10
+    assert len(simulator.poll(start + 1.0095)) == 0
+    assert len(simulator.poll(start + 1.0200)) == 11
+    assert frames[0].decode().rstrip('\r\n').split(',')[-1] == 'R'
+    simulator.receive(b"OFF\n", start + 1.03)
+    assert len(simulator.poll(start + 2.0)) == 0
+    assert simulator.commands == ['ON', 'OFF']
+
+
+def test_commandWithoutNewlineCompletesAfterTimeout():
+    simulator = GloveSimulator(SyntheticSignals(), sampleRate=500, commandTimeout=0.05)
+    start = simulator.clockStart
+    simulator.receive(b"ON", start)
+    simulator.receive(b"B", start + 0.01)
+    assert len(simulator.poll(start + 0.05)) == 0
+    frames = decode(simulator.poll(start + 0.07))
+    assert simulator.binary
+    assert [frame[0] for frame in frames] == list(range(len(frames)))
+    np.testing.assert_allclose(np.diff([frame[1] for frame in frames]), 2000, atol=1)
+
+
+def test_calibrationMapsCapturedLevelsToTheByteRange():
+    signals = ConstantSignals(400.0)
+    simulator = GloveSimulator(signals, sampleRate=100)
+    start = simulator.clockStart
+    simulator.receive(b"CAL1\n", start)
+    signals.level = 800.0
+    simulator.receive(b"CAL2\n", start)
+    assert not simulator.streaming
+
+    simulator.receive(b"ONB\n", start)
+    signals.level = 600.0
+    [(_, _, values)] = decode(simulator.poll(start))
+    np.testing.assert_array_equal(values[:5], 127)
+    signals.level = 900.0
+    [(_, _, values)] = decode(simulator.poll(start + 0.01))
+    # 255 is reserved in binary frames for an unreadable sensor
+    np.testing.assert_array_equal(values[:5], 254)
+
+
+def test_recordingSignalsLoopTheRecording():
+    signals = RecordingSignals(FIXTURE)
+    count = len(signals.values)
+    first = signals.block(np.zeros(3)).copy()
+    signals.block(np.zeros(count - 3))
+    np.testing.assert_array_equal(signals.block(np.zeros(3)), first)
+
+
+def test_acquisitionReadsEveryFrameOverTcp():
+    link = TcpLink(GloveSimulator(SyntheticSignals(), sampleRate=1000), port=0).start()
+    frames = []
+    deadline = time.perf_counter() + 0.5
+    runAcquisition([GloveSource(TcpTransport(*link.address[:2]), binaryMode=True)], onFrame=lambda *f: frames.append(f),
+                   isRunning=lambda: time.perf_counter() < deadline)
+    time.sleep(0.1)
+    link.stop()
+
+    stats = link.simulator.stats()
+    assert stats["commands"][:2] == ['ONB', 'OFF']
+    assert stats["framesDropped"] == 0
+    assert len(frames) > 300
+    assert [frame[3] for frame in frames] == list(range(len(frames)))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from PySide6.Qt3DCore import Qt3DCore
+from PySide6.QtGui import QMatrix4x4, QVector3D
+from PySide6.QtWidgets import QApplication
+from AnimationWindow import SCENE_SCALE, AnimationWindow
+from ForwardKinematics import fingertipPositions
+from RightHand import RIGHT_HAND_SEGMENTS
+
+# setPose order of the last joint of each finger: the thumb's J1, then every other finger's J2
+LAST_JOINTS = (0, 2, 4, 6, 8)
+
+
+@pytest.fixture(scope="module")
+def window():
+    app = QApplication.instance() or QApplication([])
+    window = AnimationWindow(angleDeadband=0.0)
+    yield window
+    window.destroy()
+
+
+def palmLocalTip(window, finger):
+    # Fingertip in the palm entity's frame, by composing the joint transforms from the last joint up to the palm
+    transform = window.joint_transforms[LAST_JOINTS[finger]]
+    length = [length for length in RIGHT_HAND_SEGMENTS[finger] if length > 0][-1] * SCENE_SCALE
+    matrix = QMatrix4x4()
+    entity = transform.parent()
+    while entity is not window.entity_Palm:
+        local = [component for component in entity.components() if isinstance(component, Qt3DCore.QTransform)][0]
+        matrix = local.matrix() * matrix
+        entity = entity.parentEntity()
+    tip = matrix.map(QVector3D(0, length, 0))
+    return np.array([tip.x(), tip.y(), tip.z()])
+
+
+def test_sceneHasOneTransformPerJoint(window):
+    # Thumb J1, then J1 and J2 of the four fingers
+    assert len(window.joint_transforms) == 9
+
+
+def test_posedSceneMatchesForwardKinematics(window):
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        j1Angles = rng.uniform(0, 90, 5)
+        j2Angles = rng.uniform(0, 90, 4)
+        window.setPose(j1Angles, j2Angles)
+
+        jointAngles = np.zeros((1, 5, 2))
+        jointAngles[0, :, 0] = j1Angles
+        jointAngles[0, 1:, 1] = j2Angles
+        x, y, z = fingertipPositions(jointAngles)[0].T * SCENE_SCALE
+        # Hand frame (x across, y along the fingers, z out of the back) -> palm entity (x, z, -y)
+        expected = np.column_stack((x, z, -y))
+        tips = np.array([palmLocalTip(window, finger) for finger in range(5)])
+        np.testing.assert_allclose(tips, expected, atol=1e-3)
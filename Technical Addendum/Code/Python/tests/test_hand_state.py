@@ -0,0 +1,56 @@
+import math
+import numpy as np
+from LeftHand import LeftHand
+from RightHand import HAND_STATE_SIZE, JOINTS, RIGHT_HAND_SEGMENTS, RightHand
+
+
+def test_fingersAreViewsIntoTheStateArray():
+    hand = RightHand()
+    assert hand.state.shape == (HAND_STATE_SIZE,)
+    hand.pointer.setJ2Flex(12.0)
+    hand.setJ1Angles(1, 2, 3, 4, 5)
+    assert hand.getJ2Angles()[0] == 12.0
+    assert hand.thumb.getJ1Flex() == 1 and hand.pinky.getJ1Flex() == 5
+    assert list(hand.state[JOINTS][:4]) == [1, 0, 2, 12.0]
+    assert list(hand.thumb.getSegLens()) == list(RIGHT_HAND_SEGMENTS[0][:2])
+    assert len(hand.pinky.getSegLens()) == 3
+
+
+def test_setFromFrameSplitsFlexBetweenJoints():
+    hand = RightHand()
+    j1 = hand.getJ1AnglesView()
+    copied = hand.getJ1Angles()
+    hand.setFromFrame(np.array([40.0, 80.0, 80.0, 80.0, 80.0]))
+    assert j1 is hand.getJ1AnglesView()  # updated in place
+    assert copied == [0.0] * 5  # the compatibility getters return list copies
+    assert hand.getJ1Angles() == [40, 60, 60, 60, 60]
+    np.testing.assert_allclose(hand.getJ2AnglesView(), [20, 20, 20, 20])
+    assert isinstance(hand.getJ2Angles(), list)
+
+
+def test_orientationIsRelativeToZeroPose():
+    hand = RightHand()
+    hand.updateOrientation(0.0, 0.0, math.radians(45), dt=0.5)
+    hand.updateOrientation(0.0, 0.0, math.radians(45), dt=0.5)
+    np.testing.assert_allclose(hand.getOrientation(), [0, 0, 45], atol=1e-9)
+    hand.zeroOrientation()
+    np.testing.assert_allclose(hand.getOrientationQuaternion(), [1, 0, 0, 0], atol=1e-12)
+    hand.updateOrientation(0.0, 0.0, math.radians(-20), dt=0.5)
+    np.testing.assert_allclose(hand.getOrientation(), [0, 0, 350], atol=1e-9)
+
+
+def test_historyKeepsTheNewestSnapshots():
+    hand = RightHand(historyLength=3)
+    for i in range(5):
+        hand.setJ1Angles(i, 0, 0, 0, 0)
+        hand.snapshot(float(i))
+    timestamps, states = hand.history.snapshots()
+    assert list(timestamps) == [2.0, 3.0, 4.0]
+    assert list(states[:, JOINTS.start]) == [2.0, 3.0, 4.0]
+
+
+def test_handsDoNotShareState():
+    right, left = RightHand(), LeftHand()
+    right.setJ1Angles(9, 9, 9, 9, 9)
+    assert not any(left.getJ1Angles())
+    assert left.HAND == 'L'
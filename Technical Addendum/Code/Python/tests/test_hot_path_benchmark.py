@@ -0,0 +1,26 @@
+from HotPathBenchmark import loadFixture, timeStage
+from conftest import FIXTURE
+
+LINE = b','.join(b'%d' % (100 + i) for i in range(42)) + b'\r\n'
+
+
+def test_allocationsAreCountedPerSample():
+    def splitting(i):
+        # 42 field strings and the list holding them, all freed before the sample ends
+        LINE.split(b',')
+
+    def reusing(i, buffer=[0]):
+        buffer[0] = i
+        return buffer
+
+    allocated = timeStage("splitting", splitting, 300)
+    assert allocated["allocBlocksPerSample"] >= 42
+    assert allocated["allocBytesPerSample"] > 0
+    reused = timeStage("reusing", reusing, 300)
+    assert reused["allocBlocksPerSample"] < 0.5
+    assert reused["samplesPerSec"] > 0 and reused["p50us"] <= reused["p99us"]
+
+
+def test_fixtureSamplesRepeatTheRecording():
+    fixture = loadFixture(FIXTURE, 2000)
+    assert all(len(column) == 2000 for column in fixture)
@@ -0,0 +1,42 @@
+import json
+import numpy as np
+from Instrumentation import Instrumentation, LatencyHistogram, bucketIndex, bucketUpperBound
+
+
+def test_bucketsAreContiguousAndMonotonic():
+    rng = np.random.default_rng(0)
+    durations = list(range(2000)) + [int(ns) for ns in rng.integers(1, 10 ** 12, 5000)]
+    for ns in durations:
+        index = bucketIndex(ns)
+        assert ns <= bucketUpperBound(index)
+        assert index == 0 or ns > bucketUpperBound(index - 1)
+
+
+def test_percentilesWithinOneBucket():
+    rng = np.random.default_rng(1)
+    samples = rng.lognormal(11, 1, 20000).astype(int)
+    histogram = LatencyHistogram()
+    for ns in samples:
+        histogram.record(int(ns))
+
+    for p in (50, 90, 99):
+        exact = np.percentile(samples, p)
+        assert exact * 0.99 <= histogram.percentile(p) <= exact * 1.26
+    assert histogram.percentile(100) == samples.max()
+    assert histogram.mean() == samples.mean()
+
+
+def test_disabledInstrumentationRecordsNothing(tmp_path):
+    disabled = Instrumentation(enabled=False)
+    disabled.stop('filter', disabled.start())
+    assert disabled.summary()['filter']['count'] == 0
+
+    enabled = Instrumentation(enabled=True)
+    enabled.stop('filter', enabled.start())
+    assert enabled.summary()['filter']['count'] == 1
+    assert 'filter' in enabled.formatTable()
+    enabled.dumpJson(str(tmp_path / "latency.json"))
+    with open(tmp_path / "latency.json") as jsonFile:
+        assert json.load(jsonFile)["stages"]["filter"]["count"] == 1
+    enabled.reset()
+    assert enabled.summary()['filter']['count'] == 0
@@ -0,0 +1,44 @@
+import numpy as np
+from LatencyTracker import DEVICE_CLOCK_MODULUS, LatencyTracker
+
+
+def feed(tracker, sequences, deviceTimes, receivedAt, filteredAt):
+    tracker.onSamples(np.asarray(sequences), np.asarray(deviceTimes, dtype=float), np.asarray(receivedAt, dtype=float),
+                      filteredAt)
+
+
+def test_droppedFramesCountedAcrossBlocksAndSequenceWrap():
+    tracker = LatencyTracker()
+    sequences = [65530, 65531, 65533, 65534, 65535, 0, 1, 5, 6]  # 65532, 2, 3 and 4 missing
+    feed(tracker, sequences[:4], [np.nan] * 4, [0.0] * 4, 0.0)
+    assert tracker.formatLabel().endswith('dropped 1')
+    feed(tracker, sequences[4:], [np.nan] * 5, [0.0] * 5, 0.0)
+    assert tracker.framesDropped == 4
+    assert tracker.framesSeen == 9
+
+
+def test_textFramesOnlyReportHostStages():
+    tracker = LatencyTracker()
+    assert tracker.formatLabel().count('--') == 4
+    feed(tracker, [-1, -1], [np.nan, np.nan], [1.0, 1.002], 1.011)
+    summary = tracker.summary()
+    assert np.isclose(summary["hostToFilterMs"], 10.0)
+    assert np.isnan(summary["deviceToHostMs"])
+    assert tracker.formatLabel().endswith('dropped --')
+
+
+def test_deviceToHostIsJitterOverTheMinimumOffset():
+    tracker = LatencyTracker(smoothing=1.0)
+    deviceTimes = np.arange(10) * 1000.0 + 5e6
+    transfer = np.array([2, 2, 2, 7, 2, 2, 2, 2, 2, 4]) * 1e-3
+    receivedAt = 100.0 + deviceTimes * 1e-6 + transfer
+    feed(tracker, np.arange(10), deviceTimes, receivedAt, receivedAt[-1])
+    # Offset 100 s + 2 ms is the baseline; the block mean is 0.7 ms above it
+    assert np.isclose(tracker.deviceToHost, 0.7e-3)
+
+
+def test_deviceClockUnwrapsAcrossBlocks():
+    tracker = LatencyTracker()
+    first = tracker.unwrapDeviceTimes(np.array([DEVICE_CLOCK_MODULUS - 2000.0, DEVICE_CLOCK_MODULUS - 1000.0]))
+    second = tracker.unwrapDeviceTimes(np.array([0.0, 1000.0]))
+    np.testing.assert_allclose(np.diff(np.concatenate([first, second])), 1000.0)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from PySideGraphicalDisplay import GloveMonitorWindow, formatReading
+from ReplaySource import readRecording
+from conftest import FIXTURE
+
+
+@pytest.fixture
+def window():
+    window = GloveMonitorWindow(pumpEvents=False, labelRate=1e-3)
+    yield window
+    window.terminateDisplay()
+
+
+def feed(window, rows):
+    for timestamp, fields in rows:
+        window.updateData(fields, timestamp)
+    window.processFrames()
+
+
+def test_formatReading():
+    assert formatReading(1.234) == '1.23'
+    assert formatReading('E') == '--'
+    assert formatReading(np.nan) == '--'
+    assert formatReading(None) == '--'
+
+
+def test_selectingAGloveWithoutFramesOpensNoPipeline(window):
+    # The right hand is always shown; the left hand's pipeline waits for its first frame
+    window.changeHand('L')
+    window.changeView('Wrist')
+    assert list(window.hands) == ['R']
+
+
+def test_readoutsRefreshAtTheLabelRate(window):
+    rows = list(readRecording(FIXTURE))
+    feed(window, rows[:10])
+    first = window.timestampLabel.text()
+    assert first == 'Timestamp: %.3fs' % rows[9][0]
+
+    # Within the label interval: the animation follows, the readouts do not
+    feed(window, rows[10:20])
+    assert window.timestampLabel.text() == first
+    assert window.hands['R'].currentTimestamp == rows[19][0]
+
+    # Changing view refreshes immediately, from the latest frame
+    window.changeView('Wrist')
+    assert window.timestampLabel.text() == 'Timestamp: %.3fs' % rows[19][0]
+    assert window.dataLabel9.text().startswith('Wrist Orientation')
+
+
+def test_unchangedTextIsNotSetAgain(window):
+    calls = []
+    label = window.timestampLabel
+    original = label.setText
+
+    def setText(text):
+        calls.append(text)
+        original(text)
+
+    label.setText = setText
+    window.setLabel(label, 'Timestamp: 1.000s')
+    window.setLabel(label, 'Timestamp: 1.000s')
+    window.setLabel(label, 'Timestamp: 2.000s')
+    assert calls == ['Timestamp: 1.000s', 'Timestamp: 2.000s']
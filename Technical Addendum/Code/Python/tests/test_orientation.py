@@ -0,0 +1,56 @@
+import math
+import numpy as np
+from Orientation import (OrientationEngine, quatConjugate, quatFromRotationVector, quatMultiply, quatRotate,
+                         quatToEulerDegrees)
+
+
+def test_constantRateIntegratesToTheExpectedAngle():
+    engine = OrientationEngine(numImus=1)
+    rate = math.radians(90)
+    engine.updateBlock(np.tile([0.0, 0.0, rate], (100, 1, 1)), np.full(100, 0.01))
+    np.testing.assert_allclose(engine.eulerDegrees(0), [0, 0, 90], atol=1e-9)
+
+
+def test_rotationsComposeInBodyFrame():
+    # 90 degrees about X, then 90 degrees about the (rotated) body Y axis
+    engine = OrientationEngine(numImus=1, maxDt=1.0)
+    engine.update([[math.pi / 2, 0, 0]], 1.0)
+    engine.update([[0, math.pi / 2, 0]], 1.0)
+    expected = quatMultiply(quatFromRotationVector(np.array([math.pi / 2, 0, 0])),
+                            quatFromRotationVector(np.array([0, math.pi / 2, 0])))
+    np.testing.assert_allclose(engine.quaternions[0], expected, atol=1e-12)
+    # Body Z ends up along world X
+    np.testing.assert_allclose(quatRotate(engine.quaternions[0], [0, 0, 1]), [1, 0, 0], atol=1e-12)
+
+
+def test_perSampleBlockAndSingleImuPathsAgree():
+    rng = np.random.default_rng(0)
+    gyro = rng.normal(0, 2, (200, 3, 3))
+    dts = rng.uniform(0.005, 0.02, 200)
+    dts[50] = 0.0  # repeated timestamp: skipped
+
+    perSample = OrientationEngine(numImus=3)
+    for sample, dt in zip(gyro, dts):
+        perSample.update(sample, dt)
+    block = OrientationEngine(numImus=3)
+    block.updateBlock(gyro, dts)
+    single = OrientationEngine(numImus=3)
+    history = single.updateImuBlock(1, gyro[:, 1], dts)
+
+    np.testing.assert_allclose(block.quaternions, perSample.quaternions, atol=1e-9)
+    np.testing.assert_allclose(single.quaternions[1], perSample.quaternions[1], atol=1e-9)
+    assert history.shape == (200, 4)
+
+
+def test_longIntervalsAreClamped():
+    engine = OrientationEngine(numImus=1, maxDt=0.5)
+    engine.updateImu(0, 0.0, 0.0, 1.0, 30.0)
+    np.testing.assert_allclose(engine.eulerDegrees(0)[2], math.degrees(0.5))
+
+
+def test_quaternionHelpers():
+    q = quatFromRotationVector(np.array([0.3, -1.2, 0.7]))
+    np.testing.assert_allclose(quatMultiply(q, quatConjugate(q)), [1, 0, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(quatFromRotationVector(np.zeros(3)), [1, 0, 0, 0])
+    np.testing.assert_allclose(quatToEulerDegrees(quatFromRotationVector(np.array([0, 0, -math.pi / 2]))),
+                               [0, 0, 270])
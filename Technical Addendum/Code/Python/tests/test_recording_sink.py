@@ -0,0 +1,102 @@
+import csv
+import io
+import threading
+import numpy as np
+from GloveProtocol import CSV_HEADER, NUM_CHANNELS, valuesToFields
+from RecordingSink import CsvRecordingSink
+
+
+class FailingFile:
+    # Stands in for the open file: every write fails as a full disk would
+    def write(self, text):
+        raise OSError(28, "No space left on device")
+
+    def close(self):
+        pass
+
+
+class BlockedFile:
+    # Holds the writer thread inside write() until released
+    def __init__(self, file):
+        self.file = file
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return self.file.write(text)
+
+    def close(self):
+        self.file.close()
+
+
+def test_outputMatchesCsvWriter(tmp_path):
+    rows = [[i * 0.01, 'a,b' if i == 3 else i, 'R'] for i in range(1000)]
+    values = np.linspace(-2, 300, NUM_CHANNELS)
+    values[9] = np.nan
+
+    sink = CsvRecordingSink(str(tmp_path / "out.csv"), batchSize=64)
+    for row in rows:
+        sink.writeRow(row)
+    sink.writeValues(10.5, values, 'L')
+    sink.close()
+
+    expected = io.StringIO()
+    writer = csv.writer(expected, lineterminator='\n')
+    writer.writerow(CSV_HEADER)
+    writer.writerows(rows)
+    writer.writerow([10.5] + valuesToFields(values, 'L'))
+    with open(tmp_path / "out.csv", newline='') as file:
+        assert file.read() == expected.getvalue()
+    assert sink.stats()["rowsWritten"] == 1001
+    assert sink.stats()["rowsDropped"] == 0
+
+
+def test_closeIsIdempotentAcrossThreads(tmp_path):
+    sink = CsvRecordingSink(str(tmp_path / "out.csv"))
+    sink.writeRow([0.0, 1, 'R'])
+    closers = [threading.Thread(target=sink.close) for _ in range(4)]
+    for closer in closers:
+        closer.start()
+    for closer in closers:
+        closer.join(timeout=5)
+    sink.close()
+    assert not any(closer.is_alive() for closer in closers)
+    assert sink.file.closed
+
+    sink.writeRow([1.0, 2, 'R'])
+    sink.flushBatch()
+    assert sink.stats()["rowsWritten"] == 1
+    assert sink.stats()["rowsDropped"] == 1
+
+
+def test_writeErrorDropsRowsInsteadOfBlocking(tmp_path):
+    sink = CsvRecordingSink(str(tmp_path / "out.csv"), batchSize=1, maxQueuedBlocks=2)
+    sink.file.close()
+    sink.file = FailingFile()
+
+    # Far more blocks than the queue holds: producers must never wait on the failed writer
+    producer = threading.Thread(target=lambda: [sink.writeRow([i, i, 'R']) for i in range(200)])
+    producer.start()
+    producer.join(timeout=5)
+    assert not producer.is_alive()
+    sink.close()
+
+    stats = sink.stats()
+    assert "No space left" in stats["writeError"]
+    assert stats["rowsWritten"] == 0
+    assert stats["rowsDropped"] == 200
+
+
+def test_fullQueueDropsOrBackpressures(tmp_path):
+    for blockOnFull in (False, True):
+        sink = CsvRecordingSink(str(tmp_path / "out.csv"), batchSize=1, maxQueuedBlocks=2, blockOnFull=blockOnFull)
+        sink.file = BlockedFile(sink.file)
+        threading.Timer(0.2, sink.file.release.set).start()
+        for i in range(10):
+            sink.writeRow([i, i, 'R'])
+        sink.close()
+        stats = sink.stats()
+        if blockOnFull:
+            assert stats["rowsWritten"] == 10 and stats["rowsBackpressured"] > 0
+        else:
+            assert stats["rowsWritten"] + stats["rowsDropped"] == 10 and stats["rowsDropped"] > 0
@@ -0,0 +1,64 @@
+import csv
+import numpy as np
+from GloveProtocol import NUM_CHANNELS, BinaryFrameDecoder
+from ReplaySource import ReplaySerial, readRecording
+from conftest import FIXTURE
+
+
+def recordedRows():
+    with open(FIXTURE, newline='') as csvFile:
+        return [row for row in list(csv.reader(csvFile))[1:] if row]
+
+
+def test_silentUntilStartCommand():
+    port = ReplaySerial(FIXTURE, speed=None)
+    assert port.readline() == b''
+    port.write(b"ON\n")
+    assert port.readline() != b''
+    port.write(b"OFF\n")
+    assert port.readline() == b''
+
+
+def test_textPlaybackMatchesRecordingThenCloses():
+    rows = recordedRows()
+    port = ReplaySerial(FIXTURE, speed=None)
+    port.write(b"ON\n")
+    lines = [port.readline() for _ in range(len(rows))]
+    assert [line.decode().rstrip('\r\n').split(',') for line in lines] == [row[1:] for row in rows]
+    assert port.is_open
+    assert port.readline() == b''
+    assert not port.is_open and not port.isOpen()
+
+
+def test_binaryPlaybackWithHandOverride():
+    rows = recordedRows()[:20]
+    port = ReplaySerial(FIXTURE, speed=None, hand='L')
+    port.write(b"ONB\n")
+    decoder = BinaryFrameDecoder()
+    buffer = bytearray(50)
+    frames = []
+    while len(frames) < len(rows):
+        count = port.readinto(buffer)
+        decoder.feed(bytes(buffer[:count]))
+        frame = decoder.nextFrame()
+        while frame is not None:
+            frames.append((frame[0], frame[2].copy(), frame[3]))
+            frame = decoder.nextFrame()
+
+    assert [frame[0] for frame in frames] == list(range(len(rows)))
+    assert {frame[2] for frame in frames} == {'L'}
+    for frame, row in zip(frames, rows):
+        expected = np.array([float(field) for field in row[1:NUM_CHANNELS + 1]], dtype=np.float32)
+        expected[:5] = np.minimum(expected[:5], 254)  # 255 is reserved for an unreadable flex sensor
+        np.testing.assert_allclose(frame[1], expected)
+
+
+def test_loopContinuesTheTimeline():
+    count = len(recordedRows())
+    port = ReplaySerial(FIXTURE, speed=None, loop=True)
+    port.write(b"ON\n")
+    timestamps = [port.nextRow()[0] for _ in range(count + 5)]
+    assert port.is_open
+    assert all(np.diff(timestamps) > 0)
+    recorded = [timestamp for timestamp, _ in readRecording(FIXTURE)]
+    np.testing.assert_allclose(np.diff(timestamps[count:]), np.diff(recorded[:5]))
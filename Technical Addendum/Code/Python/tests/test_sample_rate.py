@@ -0,0 +1,89 @@
+import numpy as np
+from FilterBank import RATE_BUCKET_STEP, FilterBank, cachedLowPass, rateBucket
+from SampleRateEstimator import SampleRateEstimator
+
+
+def settle(bank, levels, count=2000):
+    return bank.updateBlock(np.tile(levels, (count, 1)))[-1]
+
+
+def test_rateBucketsAreRelativelyEvenWidth():
+    for rate in (10.0, 100.0, 1000.0, 5000.0):
+        index, centre = rateBucket(rate)
+        assert abs(centre / rate - 1) <= RATE_BUCKET_STEP / 2 + 1e-9
+        assert rateBucket(rate * (1 + RATE_BUCKET_STEP))[0] == index + 1
+    assert rateBucket(1000.0) == rateBucket(1010.0)
+
+
+def test_designsAreCachedPerBucket():
+    cachedLowPass.cache_clear()
+    bank = FilterBank(3, 5, 100)
+    bank.setSampleRate(1000.0)
+    bank.setSampleRate(100.0)
+    bank.setSampleRate(1012.0)
+    info = cachedLowPass.cache_info()
+    assert (info.misses, info.hits) == (2, 1)
+    b, a, zi = cachedLowPass(5, rateBucket(1000.0)[0], 2)
+    assert not (b.flags.writeable or a.flags.writeable or zi.flags.writeable)
+
+
+def test_retuneKeepsSettledChannelsSettled():
+    levels = np.array([0.0, 1.0, -3.5, 250.0])
+    bank = FilterBank(4, 5, 100)
+    np.testing.assert_allclose(settle(bank, levels), levels, atol=1e-9)
+
+    bank.setSampleRate(1000.0)
+    assert bank.sample_rate == rateBucket(1000.0)[1]
+    # No step or ringing: every output right after the swap stays at the level
+    np.testing.assert_allclose(bank.updateBlock(np.tile(levels, (500, 1))), np.tile(levels, (500, 1)), atol=1e-9)
+
+    # A bank rebuilt at the new rate instead restarts from the unit step
+    rebuilt = FilterBank(4, 5, 1000.0)
+    assert abs(rebuilt.update(levels)[3] - 250.0) > 1.0
+
+
+def test_retunedBankTracksTheNewRate():
+    # After a retune the bank responds like a bank designed at the new rate
+    bank = FilterBank(1, 5, 100)
+    settle(bank, [0.0])
+    bank.setSampleRate(1000.0)
+    fresh = FilterBank(1, 5, rateBucket(1000.0)[1])
+    settle(fresh, [0.0])
+    step = np.zeros((300, 1))
+    step[100:] = 1.0
+    np.testing.assert_allclose(bank.updateBlock(step), fresh.updateBlock(step), atol=1e-9)
+
+
+def test_estimatorCountsFramesSharingAReceiveTime():
+    # 1 kHz binary frames read ten at a time: nine zero intervals, then the read's 10 ms
+    estimator = SampleRateEstimator(initialRate=100.0)
+    reads = np.tile(np.r_[np.zeros(9), 0.01], (300, 1))
+    rates = [estimator.update(intervals) for intervals in reads]
+    assert rates[10] == 100.0  # not reported before the average spans enough time
+    np.testing.assert_allclose(rates[-1], 1000.0, rtol=0.01)
+
+
+def test_estimatorIgnoresPauses():
+    estimator = SampleRateEstimator(initialRate=50.0)
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        estimator.update(rng.uniform(0.008, 0.012, 10))
+    before = estimator.rate
+    estimator.update([3.0])  # the glove was paused
+    for _ in range(5):
+        estimator.update(rng.uniform(0.008, 0.012, 10))
+    np.testing.assert_allclose(before, 100.0, rtol=0.03)
+    np.testing.assert_allclose(estimator.rate, 100.0, rtol=0.03)
+
+
+def test_pipelineRetunesOnlyPastABucket():
+    from PySideGraphicalDisplay import HandPipeline
+    pipeline = HandPipeline('R', sample_rate=100)
+    bank = pipeline.filterBank
+    pipeline.updateSampleRate(np.full(200, 1 / 102.0))
+    assert pipeline.filterBank.sample_rate == 100
+    for _ in range(10):  # 5 s at 1 kHz, several of the estimator's time constants
+        pipeline.updateSampleRate(np.full(500, 0.001))
+    assert pipeline.filterBank is bank
+    assert abs(bank.sample_rate / 1000.0 - 1) < RATE_BUCKET_STEP
+    pipeline.animationView.destroy()
@@ -0,0 +1,47 @@
+import math
+import numpy as np
+from Orientation import OrientationEngine, quatRotate
+from SensorFusion import MadgwickFusion
+
+
+def test_tiltConvergesToGravityDespiteGyroBias():
+    # Sensor at rest, tilted 30 degrees about X, with a gyro bias on X and Y
+    tilt = math.radians(30)
+    acc = np.array([0.0, math.sin(tilt), math.cos(tilt)]) * 9.81
+    samples = 3000
+    fusion = MadgwickFusion(numImus=2, beta=0.5)
+    gyro = np.tile([0.02, -0.02, 0.0], (samples, 2, 1))
+    fusion.updateFusedBlock(gyro, np.tile(acc, (samples, 2, 1)), np.full(samples, 0.01))
+
+    # The measured gravity direction, taken to the world frame, points up
+    for q in fusion.quaternions:
+        np.testing.assert_allclose(quatRotate(q, acc / 9.81), [0, 0, 1], atol=0.02)
+
+
+def test_unusableAccelerometerFallsBackToGyro():
+    rng = np.random.default_rng(0)
+    gyro = rng.normal(0, 1, (100, 3, 3))
+    acc = np.full((100, 3, 3), np.nan)
+    acc[:, 2] = 0.0
+    dts = np.full(100, 0.01)
+
+    fusion = MadgwickFusion(numImus=3)
+    history = np.empty((100, 3, 4))
+    fusion.updateFusedBlock(gyro, acc, dts, history)
+    gyroOnly = OrientationEngine(numImus=3)
+    gyroOnly.updateBlock(gyro, dts)
+
+    np.testing.assert_allclose(fusion.quaternions, gyroOnly.quaternions, atol=1e-3)
+    np.testing.assert_array_equal(history[-1], fusion.quaternions)
+
+
+def test_singleSampleMatchesBlock():
+    rng = np.random.default_rng(1)
+    gyro = rng.normal(0, 1, (20, 6, 3))
+    acc = rng.normal(0, 1, (20, 6, 3)) + [0, 0, 9.81]
+    block = MadgwickFusion()
+    block.updateFusedBlock(gyro, acc, np.full(20, 0.01))
+    single = MadgwickFusion()
+    for i in range(20):
+        single.updateFused(gyro[i], acc[i], 0.01)
+    np.testing.assert_allclose(single.quaternions, block.quaternions)
@@ -0,0 +1,62 @@
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from StripChart import ChannelHistory, StripChart, decimateMinMax, polylineBuffer
+
+
+def test_decimationKeepsEverySpike():
+    values = np.zeros((10000, 2))
+    values[1234, 0] = 50.0
+    values[8765, 1] = -7.0
+    values[4000:4100, 1] = np.nan
+    mins, maxs, firstSample = decimateMinMax(values, 300)
+    assert len(mins) == len(maxs) == len(firstSample) == 300
+    assert maxs[:, 0].max() == 50.0
+    assert np.nanmin(mins[:, 1]) == -7.0
+    # NaN is ignored beside readings; only columns with no reading at all stay NaN (drawn as gaps)
+    unreadable = np.isnan(mins[:, 1])
+    assert unreadable.any() and not np.isnan(mins[:, 0]).any()
+    np.testing.assert_array_equal(np.isnan(maxs[:, 1]), unreadable)
+    assert (firstSample[unreadable] >= 4000).all() and (firstSample[unreadable] < 4100).all()
+    assert firstSample[0] == 0 and (np.diff(firstSample) > 0).all()
+
+    few = np.arange(6.0).reshape(3, 2)
+    mins, maxs, firstSample = decimateMinMax(few, 300)
+    assert mins is few and list(firstSample) == [0, 1, 2]
+
+
+def test_historyWindowAcrossTheRingWrap():
+    history = ChannelHistory(capacity=100, num_channels=3)
+    for block in range(5):
+        timestamps = (block * 40 + np.arange(40)) * 0.01
+        history.extend(np.column_stack([timestamps, -timestamps, timestamps * 2]), timestamps)
+
+    timestamps, values = history.window(0.5, [2, 0])
+    np.testing.assert_allclose(timestamps, np.arange(149, 200) * 0.01)
+    np.testing.assert_allclose(values, np.column_stack([timestamps * 2, timestamps]))
+    # More than the ring holds: only the newest capacity samples
+    timestamps, _ = history.window(100.0, [0])
+    assert len(timestamps) == 100 and timestamps[0] == 1.0
+
+    oversized = np.arange(250.0)
+    history.extend(np.tile(oversized[:, None], (1, 3)), oversized)
+    assert history.window(1000.0, [0])[1][0, 0] == 150.0
+
+
+def test_polylineBufferWritesThePolygon():
+    polyline, points = polylineBuffer(3)
+    points[:] = [[1, 2], [3, 4], [5, 6]]
+    assert [(point.x(), point.y()) for point in polyline] == [(1, 2), (3, 4), (5, 6)]
+
+
+def test_chartPaintsOnlyWhenNewSamplesArrive():
+    app = QApplication.instance() or QApplication([])
+    history = ChannelHistory(capacity=5000, num_channels=41)
+    timestamps = np.arange(5000) * 0.001
+    history.extend(np.sin(np.outer(timestamps, np.arange(1, 42))), timestamps)
+    chart = StripChart(history, channels=[0, 5, 38])
+    chart.resize(400, 300)
+    chart.grab()
+    assert chart.paints == 1
+    chart.refresh()
+    app.processEvents()
+    assert chart.paints == 1